@@ -1,12 +1,21 @@
+from typing import List, Optional, Tuple
+import pandas as pd
 from cachetools import TTLCache
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Request
+from fastapi import Depends, Request
 from app.domain.contracts.infrastructures.i_data_frame_manager import IDataFrameManager
 from app.domain.contracts.infrastructures.i_data_loader import IDataLoader
 from app.domain.contracts.services.I_user_service import IUserService
 from app.domain.contracts.services.i_sale_service import ISaleService
 from app.infrastructure.data.data_loader import DataLoader
 from app.infrastructure.data.data_frame_manager import DataFrameManager
+from app.infrastructure.data.deferred_data_frame_manager import DeferredDataFrameManager
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.data.parquet_dataset_manager import ParquetDatasetManager
+from app.infrastructure.data.shared_dataset import SharedDatasetStore
+from app.infrastructure.executors import run_in_executor
+from app.infrastructure.result_cache import ResultCache
+from app.infrastructure.token import validate_admin_token
 from app.services.user_service import UserService
 from app.services.sale_service import SaleService
 from app.core.config import settings
@@ -25,12 +34,42 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
+def create_data_manager() -> IDataFrameManager:
+    if settings.DATA_BACKEND == "lazy":
+        return ParquetDatasetManager(settings.DATA_DIRECTORY)
+    _cache = TTLCache(maxsize=settings.MAX_SIZE_CACHE, ttl=settings.TTL_CACHE)
+    data_loader: IDataLoader = DataLoader(_cache)
+    return DataFrameManager(data_loader, settings.DATA_DIRECTORY)
+
+
+def read_new_files(paths: List[str], columns: Optional[List[str]] = None) \
+        -> Tuple[pd.DataFrame, Optional[DimensionTables]]:
+    """
+    Lee archivos Parquet nuevos sin crear el gestor de datos, que cargaría el directorio completo.
+
+    :param paths: Rutas de los archivos.
+    :param columns: Columnas a devolver. Por defecto todas.
+    :return: Filas de los archivos y sus tablas de dimensión, si las hay.
+    """
+    if settings.DATA_BACKEND == "lazy":
+        return ParquetDatasetManager.read_files(paths, columns)
+    frame, dimensions = DataLoader(TTLCache(maxsize=1, ttl=settings.TTL_CACHE)).read_files(paths)
+    return (frame if columns is None else frame[columns]), dimensions
+
+
 class SaleServiceSingleton(metaclass=SingletonMeta):
     def __init__(self):
-        _cache = TTLCache(maxsize=settings.MAX_SIZE_CACHE, ttl=settings.TTL_CACHE)
-        data_loader: IDataLoader = DataLoader(_cache)
-        data_manager: IDataFrameManager = DataFrameManager(data_loader, settings.DATA_DIRECTORY)
-        self._sale_service: ISaleService = SaleService(data_manager)
+        result_cache = ResultCache(settings.RESULT_CACHE_MAX_BYTES) if settings.RESULT_CACHE_MAX_BYTES > 0 else None
+        # El gestor real se crea en la primera consulta, es decir, en la carga en segundo plano del arranque.
+        # Con el dataset compartido, solo el proceso que publique la instantánea llega a crearlo
+        data_manager: IDataFrameManager = DeferredDataFrameManager(create_data_manager,
+                                                                   lazy=settings.DATA_BACKEND == "lazy",
+                                                                   reader=read_new_files)
+        if settings.SHARED_DATASET_DIR:
+            shared_store = SharedDatasetStore(settings.SHARED_DATASET_DIR, settings.DATA_DIRECTORY)
+            self._sale_service: ISaleService = SaleService(data_manager, shared_store, result_cache)
+        else:
+            self._sale_service: ISaleService = SaleService(data_manager, result_cache=result_cache)
 
     def get_service(self) -> ISaleService:
         return self._sale_service
@@ -56,3 +95,7 @@ def get_sale_service_request(request: Request) -> SaleService:
 
 def get_user_service_request(request: Request) -> UserService:
     return request.state.user_service
+
+
+async def get_admin_user(token: str = Depends(oauth2_scheme)):
+    return await run_in_executor("firebase", validate_admin_token, token)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from starlette.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.infrastructure.executors import run_in_executor
+from app.infrastructure.profiler import collapsed, sample_stacks
+
+router = APIRouter()
+
+
+@router.get("/admin/profile", response_class=PlainTextResponse)
+async def profile(seconds: float = Query(10, gt=0), interval_ms: float = Query(10, ge=1, le=1000),
+                  path_prefix: Optional[str] = Query(None)):
+    """
+    Muestrea las pilas de los hilos de la aplicación durante un tiempo acotado y devuelve un informe de
+    pilas colapsadas, compatible con flamegraph.pl y speedscope. Solo se admite un muestreo a la vez.
+
+    :param seconds: Duración del muestreo, limitada por PROFILER_MAX_SECONDS.
+    :param interval_ms: Milisegundos entre muestras.
+    :param path_prefix: Muestrea solo los hilos que atienden peticiones cuya ruta empiece por este prefijo,
+        por ejemplo /api/v1/sales/store.
+    :return: Una línea "marco;marco;... muestras" por pila, de la más a la menos frecuente.
+    """
+    stacks = await run_in_executor("profiler", sample_stacks, min(seconds, settings.PROFILER_MAX_SECONDS),
+                                   interval_ms / 1000, path_prefix)
+    return PlainTextResponse(collapsed(stacks), headers={"X-Profile-Samples": str(sum(stacks.values()))})
@@ -1,4 +1,9 @@
 from fastapi import APIRouter
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.infrastructure.data.load_progress import load_progress
+from app.infrastructure.executors import executor_stats
 
 router = APIRouter()
 
@@ -6,3 +11,51 @@ router = APIRouter()
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/live")
+def liveness():
+    """
+    Indica si el proceso está vivo. Falla si la carga del dataset falló, para que el orquestador reinicie
+    la réplica en lugar de mantenerla sin datos.
+
+    :return: 200 mientras el proceso sea útil, 503 si la carga falló.
+    """
+    if load_progress.state == "failed":
+        return JSONResponse(status_code=503, content={"status": "failed", "error": load_progress.error})
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+def readiness():
+    """
+    Indica si la réplica puede recibir tráfico, con el avance de la carga del dataset (fase, archivos,
+    filas, bytes y tiempo restante estimado).
+
+    :return: 200 con el avance si el dataset está listo; 503 con el avance y Retry-After si no.
+    """
+    progress = load_progress.snapshot()
+    if load_progress.ready:
+        return progress
+    return JSONResponse(status_code=503, content=progress, headers={"Retry-After": str(load_progress.retry_after())})
+
+
+@router.get("/health/executors")
+def get_executor_stats():
+    """
+    Métricas de los ejecutores: tareas en cola, en ejecución, completadas y rechazadas.
+
+    :return: Métricas por ejecutor.
+    """
+    return executor_stats()
+
+
+@router.get("/health/cache")
+def get_cache_stats():
+    """
+    Contadores de la caché de resultados de ventas.
+
+    :return: Aciertos, fallos, expulsiones y uso de memoria, o null si la caché está deshabilitada.
+    """
+    sale_service = settings.ml_models.get("sale_service")
+    return sale_service.cache_stats() if sale_service is not None else None
@@ -0,0 +1,70 @@
+from typing import List
+
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.infrastructure.executors import executor_stats
+from app.infrastructure.logging_config import log_stats
+from app.infrastructure.metrics import render_values, request_duration, request_phase_duration
+from app.infrastructure.token import user_cache
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Métricas de los ejecutores que crecen siempre (counter) frente a las que suben y bajan (gauge)
+EXECUTOR_COUNTERS = ("completed", "rejected")
+EXECUTOR_GAUGES = ("queued", "running", "max_workers", "max_queue")
+CACHE_COUNTERS = ("hits", "misses", "coalesced", "evictions")
+CACHE_GAUGES = ("entries", "bytes", "max_bytes")
+
+
+def _executor_lines() -> List[str]:
+    stats = executor_stats()
+    lines = []
+    for metric in EXECUTOR_COUNTERS:
+        lines += render_values(f"sales_api_executor_{metric}_total", f"Tareas {metric} por ejecutor.", "counter",
+                               {(("executor", name),): values[metric] for name, values in stats.items()})
+    for metric in EXECUTOR_GAUGES:
+        lines += render_values(f"sales_api_executor_{metric}", f"Valor actual de {metric} por ejecutor.", "gauge",
+                               {(("executor", name),): values[metric] for name, values in stats.items()})
+    return lines
+
+
+def _cache_lines(cache: str, stats: dict) -> List[str]:
+    lines = []
+    for metric, value in stats.items():
+        kind = "counter" if metric in CACHE_COUNTERS else "gauge"
+        name = f"sales_api_{cache}_cache_{metric}" + ("_total" if kind == "counter" else "")
+        lines += render_values(name, f"{metric} de la caché {cache}.", kind, {(): value})
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Métricas en formato de texto de Prometheus: latencia por ruta y fase, ejecutores, cachés, logs y dataset.
+
+    :return: Exposición de métricas.
+    """
+    lines = request_duration.render() + request_phase_duration.render() + _executor_lines()
+    lines += _cache_lines("user", user_cache.stats())
+    for metric, value in log_stats().items():
+        lines += render_values(f"sales_api_log_records_{metric}_total", f"Registros de log {metric}.", "counter",
+                               {(): value})
+    sale_service = settings.ml_models.get("sale_service")
+    if sale_service is not None:
+        cache = sale_service.cache_stats()
+        if cache is not None:
+            lines += _cache_lines("result", cache)
+        dataset = sale_service.dataset_stats()
+        if dataset is not None:
+            lines += render_values("sales_api_dataset_version", "Versión de la instantánea publicada.", "gauge",
+                                   {(): dataset["version"]})
+            lines += render_values("sales_api_dataset_rows", "Filas de la instantánea publicada.", "gauge",
+                                   {(): dataset["rows"]})
+            if dataset["load_seconds"] is not None:
+                lines += render_values("sales_api_dataset_load_seconds",
+                                       "Duración de la última carga o ingesta del dataset.", "gauge",
+                                       {(): dataset["load_seconds"]})
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_MEDIA_TYPE)
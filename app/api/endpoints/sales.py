@@ -1,24 +1,37 @@
-from fastapi import APIRouter, Depends, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional
 
 from app.api.dependencies import get_sale_service_request
 from app.domain.contracts.services.i_sale_service import ISaleService
+from app.domain.inputs.cube_input import CubeInput
+from app.domain.inputs.employee_batch_input import EmployeeBatchInput
+from app.domain.inputs.product_batch_input import ProductBatchInput
+from app.domain.inputs.store_batch_input import StoreBatchInput
 from app.domain.inputs.product_input import ProductInput
 from app.domain.inputs.store_input import StoreInput
 from app.domain.inputs.employee_input import EmployeeInput
+from app.domain.outputs.cube_output import CubeOutput
 from app.domain.outputs.employee_sales_output import EmployeeSalesOutput
 from app.domain.outputs.product_sales_output import ProductSalesOutput
 from app.domain.outputs.sale_output import SaleOutput
+from app.domain.outputs.sales_batch_output import SalesBatchOutput
+from app.domain.outputs.sales_summary_output import SalesSummaryOutput
 from app.domain.outputs.store_sales_output import StoreSalesOutput
+from app.domain.outputs.top_sales_output import TopSalesOutput
+from app.infrastructure.executors import iterate_in_executor, run_in_executor
+from app.infrastructure.serialization import TimedORJSONResponse, to_ndjson
 
 router = APIRouter()
 
 
 @router.post("/sales/employee", response_model=List[SaleOutput])
-def get_sales_by_employee(
+async def get_sales_by_employee(
         employee: EmployeeInput,
         page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
         page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página. Valor por defecto: 10"),
+        cursor: Optional[str] = Query(None, description="Cursor de la página anterior (cabecera X-Next-Cursor)"),
         sale_service: ISaleService = Depends(get_sale_service_request)
 ):
     """
@@ -27,18 +40,26 @@ def get_sales_by_employee(
     :param employee: Información del empleado y las fechas de inicio y fin.
     :param page: Número de la página. Valor por defecto: 1.
     :param page_size: Tamaño de la página. Valor por defecto: 10.
+    :param cursor: Cursor opaco para continuar desde la página anterior; si se envía, se ignora page.
     :param sale_service: Servicio de ventas inyectado por dependencia.
     :return: Lista de ventas del empleado en el periodo especificado.
     """
-    return sale_service.get_sales_by_employee(employee.KeyEmployee, employee.StartDate.date(), employee.EndDate.date(),
-                                              page, page_size)
+    try:
+        sales, next_cursor = await run_in_executor("pandas", sale_service.get_sales_page, "KeyEmployee", employee.KeyEmployee,
+                                                   employee.StartDate.date(), employee.EndDate.date(), page, page_size,
+                                                   cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    # Las filas ya cumplen el esquema de SaleOutput desde la carga; se codifican con orjson sin validarlas de nuevo
+    return TimedORJSONResponse(sales, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
 
 @router.post("/sales/product", response_model=List[SaleOutput])
-def get_sales_by_product(
+async def get_sales_by_product(
         product: ProductInput,
         page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
         page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página. Valor por defecto: 10"),
+        cursor: Optional[str] = Query(None, description="Cursor de la página anterior (cabecera X-Next-Cursor)"),
         sale_service: ISaleService = Depends(get_sale_service_request)
 ):
     """
@@ -47,18 +68,25 @@ def get_sales_by_product(
     :param product: Información del producto y las fechas de inicio y fin.
     :param page: Número de la página. Valor por defecto: 1.
     :param page_size: Tamaño de la página. Valor por defecto: 10.
+    :param cursor: Cursor opaco para continuar desde la página anterior; si se envía, se ignora page.
     :param sale_service: Servicio de ventas inyectado por dependencia.
     :return: Lista de ventas del producto en el periodo especificado.
     """
-    return sale_service.get_sales_by_product(product.KeyProduct, product.StartDate.date(), product.EndDate.date(), page,
-                                             page_size)
+    try:
+        sales, next_cursor = await run_in_executor("pandas", sale_service.get_sales_page, "KeyProduct", product.KeyProduct,
+                                                   product.StartDate.date(), product.EndDate.date(), page, page_size,
+                                                   cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(sales, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
 
 @router.post("/sales/store", response_model=List[SaleOutput])
-def get_sales_by_store(
+async def get_sales_by_store(
         store: StoreInput,
         page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
         page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página. Valor por defecto: 10"),
+        cursor: Optional[str] = Query(None, description="Cursor de la página anterior (cabecera X-Next-Cursor)"),
         sale_service: ISaleService = Depends(get_sale_service_request)
 ):
     """
@@ -67,15 +95,204 @@ def get_sales_by_store(
     :param store: Información de la tienda y las fechas de inicio y fin.
     :param page: Número de la página. Valor por defecto: 1.
     :param page_size: Tamaño de la página. Valor por defecto: 10.
+    :param cursor: Cursor opaco para continuar desde la página anterior; si se envía, se ignora page.
     :param sale_service: Servicio de ventas inyectado por dependencia.
     :return: Lista de ventas de la tienda en el periodo especificado.
     """
-    return sale_service.get_sales_by_store(store.KeyStore, store.StartDate.date(), store.EndDate.date(), page,
-                                           page_size)
+    try:
+        sales, next_cursor = await run_in_executor("pandas", sale_service.get_sales_page, "KeyStore", store.KeyStore,
+                                                   store.StartDate.date(), store.EndDate.date(), page, page_size,
+                                                   cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(sales, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+
+@router.post("/sales/employee/batch", response_model=List[SalesBatchOutput])
+async def get_sales_by_employee_batch(
+        batch: EmployeeBatchInput,
+        page: int = Query(1, ge=1, description="Número de la página de cada clave. Valor por defecto: 1"),
+        page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página por clave. Valor por defecto: 10"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar en una sola petición las ventas de varios empleados, paginadas por clave.
+
+    :param batch: Lista de claves, cada una con fechas de inicio y fin y cursor opcionales.
+    :param page: Número de la página de cada clave sin cursor. Valor por defecto: 1.
+    :param page_size: Tamaño de la página de cada clave. Valor por defecto: 10.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Por cada clave, en el orden recibido, sus ventas y el cursor de su página siguiente.
+    """
+    items = [(item.KeyEmployee, item.StartDate.date() if item.StartDate else None,
+              item.EndDate.date() if item.EndDate else None, item.cursor) for item in batch.items]
+    try:
+        results = await run_in_executor("pandas", sale_service.get_sales_pages, "KeyEmployee", items, page, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(results)
+
+
+@router.post("/sales/product/batch", response_model=List[SalesBatchOutput])
+async def get_sales_by_product_batch(
+        batch: ProductBatchInput,
+        page: int = Query(1, ge=1, description="Número de la página de cada clave. Valor por defecto: 1"),
+        page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página por clave. Valor por defecto: 10"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar en una sola petición las ventas de varios productos, paginadas por clave.
+
+    :param batch: Lista de claves, cada una con fechas de inicio y fin y cursor opcionales.
+    :param page: Número de la página de cada clave sin cursor. Valor por defecto: 1.
+    :param page_size: Tamaño de la página de cada clave. Valor por defecto: 10.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Por cada clave, en el orden recibido, sus ventas y el cursor de su página siguiente.
+    """
+    items = [(item.KeyProduct, item.StartDate.date() if item.StartDate else None,
+              item.EndDate.date() if item.EndDate else None, item.cursor) for item in batch.items]
+    try:
+        results = await run_in_executor("pandas", sale_service.get_sales_pages, "KeyProduct", items, page, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(results)
+
+
+@router.post("/sales/store/batch", response_model=List[SalesBatchOutput])
+async def get_sales_by_store_batch(
+        batch: StoreBatchInput,
+        page: int = Query(1, ge=1, description="Número de la página de cada clave. Valor por defecto: 1"),
+        page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página por clave. Valor por defecto: 10"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar en una sola petición las ventas de varios tiendas, paginadas por clave.
+
+    :param batch: Lista de claves, cada una con fechas de inicio y fin y cursor opcionales.
+    :param page: Número de la página de cada clave sin cursor. Valor por defecto: 1.
+    :param page_size: Tamaño de la página de cada clave. Valor por defecto: 10.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Por cada clave, en el orden recibido, sus ventas y el cursor de su página siguiente.
+    """
+    items = [(item.KeyStore, item.StartDate.date() if item.StartDate else None,
+              item.EndDate.date() if item.EndDate else None, item.cursor) for item in batch.items]
+    try:
+        results = await run_in_executor("pandas", sale_service.get_sales_pages, "KeyStore", items, page, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(results)
+
+
+@router.post("/sales/employee/stream", response_class=StreamingResponse)
+async def stream_sales_by_employee(
+        employee: EmployeeInput,
+        chunk_size: int = Query(1000, ge=1, le=10000, description="Ventas por bloque. Valor por defecto: 1000"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para exportar todas las ventas de un empleado en un periodo como NDJSON.
+
+    :param employee: Información del empleado y las fechas de inicio y fin.
+    :param chunk_size: Número de ventas por bloque. Valor por defecto: 1000.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Respuesta en streaming con una venta por línea.
+    """
+    chunks = sale_service.stream_sales_by_employee(employee.KeyEmployee, employee.StartDate.date(),
+                                                   employee.EndDate.date(), chunk_size)
+    return StreamingResponse(iterate_in_executor("pandas", to_ndjson(chunks)), media_type="application/x-ndjson")
+
+
+@router.post("/sales/product/stream", response_class=StreamingResponse)
+async def stream_sales_by_product(
+        product: ProductInput,
+        chunk_size: int = Query(1000, ge=1, le=10000, description="Ventas por bloque. Valor por defecto: 1000"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para exportar todas las ventas de un producto en un periodo como NDJSON.
+
+    :param product: Información del producto y las fechas de inicio y fin.
+    :param chunk_size: Número de ventas por bloque. Valor por defecto: 1000.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Respuesta en streaming con una venta por línea.
+    """
+    chunks = sale_service.stream_sales_by_product(product.KeyProduct, product.StartDate.date(),
+                                                  product.EndDate.date(), chunk_size)
+    return StreamingResponse(iterate_in_executor("pandas", to_ndjson(chunks)), media_type="application/x-ndjson")
+
+
+@router.post("/sales/store/stream", response_class=StreamingResponse)
+async def stream_sales_by_store(
+        store: StoreInput,
+        chunk_size: int = Query(1000, ge=1, le=10000, description="Ventas por bloque. Valor por defecto: 1000"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para exportar todas las ventas de una tienda en un periodo como NDJSON.
+
+    :param store: Información de la tienda y las fechas de inicio y fin.
+    :param chunk_size: Número de ventas por bloque. Valor por defecto: 1000.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Respuesta en streaming con una venta por línea.
+    """
+    chunks = sale_service.stream_sales_by_store(store.KeyStore, store.StartDate.date(), store.EndDate.date(),
+                                                chunk_size)
+    return StreamingResponse(iterate_in_executor("pandas", to_ndjson(chunks)), media_type="application/x-ndjson")
+
+
+@router.post("/sales/employee/summary", response_model=SalesSummaryOutput)
+async def get_sales_summary_by_employee(
+        employee: EmployeeInput,
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar la venta total, promedio y número de ventas de un empleado en un periodo.
+
+    :param employee: Información del empleado y las fechas de inicio y fin.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Venta total, promedio (null si no hay ventas) y número de ventas.
+    """
+    summary = await run_in_executor("pandas", sale_service.get_sales_summary, "KeyEmployee", employee.KeyEmployee,
+                                    employee.StartDate.date(), employee.EndDate.date())
+    return TimedORJSONResponse(summary)
+
+
+@router.post("/sales/product/summary", response_model=SalesSummaryOutput)
+async def get_sales_summary_by_product(
+        product: ProductInput,
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar la venta total, promedio y número de ventas de un producto en un periodo.
+
+    :param product: Información del producto y las fechas de inicio y fin.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Venta total, promedio (null si no hay ventas) y número de ventas.
+    """
+    summary = await run_in_executor("pandas", sale_service.get_sales_summary, "KeyProduct", product.KeyProduct,
+                                    product.StartDate.date(), product.EndDate.date())
+    return TimedORJSONResponse(summary)
+
+
+@router.post("/sales/store/summary", response_model=SalesSummaryOutput)
+async def get_sales_summary_by_store(
+        store: StoreInput,
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar la venta total, promedio y número de ventas de una tienda en un periodo.
+
+    :param store: Información de la tienda y las fechas de inicio y fin.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Venta total, promedio (null si no hay ventas) y número de ventas.
+    """
+    summary = await run_in_executor("pandas", sale_service.get_sales_summary, "KeyStore", store.KeyStore,
+                                    store.StartDate.date(), store.EndDate.date())
+    return TimedORJSONResponse(summary)
 
 
 @router.get("/sales/store/total_avg", response_model=List[StoreSalesOutput])
-def get_total_avg_sales_by_store(
+async def get_total_avg_sales_by_store(
         page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
         page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página. Valor por defecto: 10"),
         sale_service: ISaleService = Depends(get_sale_service_request)
@@ -88,11 +305,11 @@ def get_total_avg_sales_by_store(
     :param sale_service: Servicio de ventas inyectado por dependencia.
     :return: Lista de ventas totales y promedio por tienda.
     """
-    return sale_service.get_total_avg_sales_by_store(page, page_size)
+    return await run_in_executor("pandas", sale_service.get_total_avg_sales_by_store, page, page_size)
 
 
 @router.get("/sales/product/total_avg", response_model=List[ProductSalesOutput])
-def get_total_avg_sales_by_product(
+async def get_total_avg_sales_by_product(
         page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
         page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página. Valor por defecto: 10"),
         sale_service: ISaleService = Depends(get_sale_service_request)
@@ -105,11 +322,11 @@ def get_total_avg_sales_by_product(
     :param sale_service: Servicio de ventas inyectado por dependencia.
     :return: Lista de ventas totales y promedio por producto.
     """
-    return sale_service.get_total_avg_sales_by_product(page, page_size)
+    return await run_in_executor("pandas", sale_service.get_total_avg_sales_by_product, page, page_size)
 
 
 @router.get("/sales/employee/total_avg", response_model=List[EmployeeSalesOutput])
-def get_total_avg_sales_by_employee(
+async def get_total_avg_sales_by_employee(
         page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
         page_size: int = Query(10, ge=1, le=100, description="Tamaño de la página. Valor por defecto: 10"),
         sale_service: ISaleService = Depends(get_sale_service_request)
@@ -122,4 +339,132 @@ def get_total_avg_sales_by_employee(
     :param sale_service: Servicio de ventas inyectado por dependencia.
     :return: Lista de ventas totales y promedio por empleado.
     """
-    return sale_service.get_total_avg_sales_by_employee(page, page_size)
+    return await run_in_executor("pandas", sale_service.get_total_avg_sales_by_employee, page, page_size)
+
+
+@router.post("/sales/cube", response_model=CubeOutput)
+async def get_sales_cube(
+        cube: CubeInput,
+        page: int = Query(1, ge=1, description="Número de la página. Valor por defecto: 1"),
+        page_size: int = Query(100, ge=1, le=1000, description="Tamaño de la página. Valor por defecto: 100"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para agregar las ventas por varias dimensiones (por ejemplo tienda, producto y mes).
+
+    :param cube: Dimensiones (columnas Key* o KeyDate:day|month|year), medidas, funciones y periodo opcional.
+    :param page: Número de la página. Valor por defecto: 1.
+    :param page_size: Tamaño de la página. Valor por defecto: 100.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Número total de grupos y los grupos de la página con una columna por medida y función.
+    """
+    try:
+        rows, total_rows = await run_in_executor("pandas", sale_service.get_sales_cube, cube.dimensions,
+                                                 cube.measures, cube.functions,
+                                                 cube.StartDate.date() if cube.StartDate else None,
+                                                 cube.EndDate.date() if cube.EndDate else None, page, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse({"total_rows": total_rows, "rows": rows})
+
+
+@router.get("/sales/store/top", response_model=List[TopSalesOutput])
+async def get_top_sales_by_store(
+        n: int = Query(20, ge=1, le=1000, description="Número de tiendas a devolver. Valor por defecto: 20"),
+        measure: str = Query("Amount", description="Amount, Qty o margin (Amount - CostAmount)"),
+        order: str = Query("desc", pattern="^(asc|desc)$", description="desc para los mayores, asc para los menores"),
+        StartDate: Optional[datetime] = Query(None, description="Fecha de inicio, opcional"),
+        EndDate: Optional[datetime] = Query(None, description="Fecha de fin, opcional"),
+        filter_column: Optional[str] = Query(None, description="Columna Key* o KeyDate:day|month|year por la que "
+                                                                "filtrar, opcional"),
+        filter_key: Optional[str] = Query(None, description="Valor de la columna de filtro"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar las tiendas con mayor (o menor) total de una medida.
+
+    :param n: Número de tiendas a devolver. Valor por defecto: 20.
+    :param measure: Medida por la que ordenar. Valor por defecto: Amount.
+    :param order: desc (mayores) o asc (menores). Valor por defecto: desc.
+    :param StartDate: Fecha de inicio, opcional.
+    :param EndDate: Fecha de fin, opcional.
+    :param filter_column: Columna Key* o KeyDate:day|month|year por la que filtrar, opcional.
+    :param filter_key: Valor de la columna de filtro.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Lista de claves con su total y número de ventas, ordenada por total.
+    """
+    try:
+        top = await run_in_executor("pandas", sale_service.get_top_sales, "KeyStore", measure, n, order == "asc",
+                                    StartDate.date() if StartDate else None, EndDate.date() if EndDate else None,
+                                    filter_column, filter_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(top)
+
+
+@router.get("/sales/product/top", response_model=List[TopSalesOutput])
+async def get_top_sales_by_product(
+        n: int = Query(20, ge=1, le=1000, description="Número de productos a devolver. Valor por defecto: 20"),
+        measure: str = Query("Amount", description="Amount, Qty o margin (Amount - CostAmount)"),
+        order: str = Query("desc", pattern="^(asc|desc)$", description="desc para los mayores, asc para los menores"),
+        StartDate: Optional[datetime] = Query(None, description="Fecha de inicio, opcional"),
+        EndDate: Optional[datetime] = Query(None, description="Fecha de fin, opcional"),
+        filter_column: Optional[str] = Query(None, description="Columna Key* o KeyDate:day|month|year por la que "
+                                                                "filtrar, opcional"),
+        filter_key: Optional[str] = Query(None, description="Valor de la columna de filtro"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar las productos con mayor (o menor) total de una medida.
+
+    :param n: Número de productos a devolver. Valor por defecto: 20.
+    :param measure: Medida por la que ordenar. Valor por defecto: Amount.
+    :param order: desc (mayores) o asc (menores). Valor por defecto: desc.
+    :param StartDate: Fecha de inicio, opcional.
+    :param EndDate: Fecha de fin, opcional.
+    :param filter_column: Columna Key* o KeyDate:day|month|year por la que filtrar, opcional.
+    :param filter_key: Valor de la columna de filtro.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Lista de claves con su total y número de ventas, ordenada por total.
+    """
+    try:
+        top = await run_in_executor("pandas", sale_service.get_top_sales, "KeyProduct", measure, n, order == "asc",
+                                    StartDate.date() if StartDate else None, EndDate.date() if EndDate else None,
+                                    filter_column, filter_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(top)
+
+
+@router.get("/sales/employee/top", response_model=List[TopSalesOutput])
+async def get_top_sales_by_employee(
+        n: int = Query(20, ge=1, le=1000, description="Número de empleados a devolver. Valor por defecto: 20"),
+        measure: str = Query("Amount", description="Amount, Qty o margin (Amount - CostAmount)"),
+        order: str = Query("desc", pattern="^(asc|desc)$", description="desc para los mayores, asc para los menores"),
+        StartDate: Optional[datetime] = Query(None, description="Fecha de inicio, opcional"),
+        EndDate: Optional[datetime] = Query(None, description="Fecha de fin, opcional"),
+        filter_column: Optional[str] = Query(None, description="Columna Key* o KeyDate:day|month|year por la que "
+                                                                "filtrar, opcional"),
+        filter_key: Optional[str] = Query(None, description="Valor de la columna de filtro"),
+        sale_service: ISaleService = Depends(get_sale_service_request)
+):
+    """
+    Endpoint para consultar las empleados con mayor (o menor) total de una medida.
+
+    :param n: Número de empleados a devolver. Valor por defecto: 20.
+    :param measure: Medida por la que ordenar. Valor por defecto: Amount.
+    :param order: desc (mayores) o asc (menores). Valor por defecto: desc.
+    :param StartDate: Fecha de inicio, opcional.
+    :param EndDate: Fecha de fin, opcional.
+    :param filter_column: Columna Key* o KeyDate:day|month|year por la que filtrar, opcional.
+    :param filter_key: Valor de la columna de filtro.
+    :param sale_service: Servicio de ventas inyectado por dependencia.
+    :return: Lista de claves con su total y número de ventas, ordenada por total.
+    """
+    try:
+        top = await run_in_executor("pandas", sale_service.get_top_sales, "KeyEmployee", measure, n, order == "asc",
+                                    StartDate.date() if StartDate else None, EndDate.date() if EndDate else None,
+                                    filter_column, filter_key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return TimedORJSONResponse(top)
@@ -27,7 +27,35 @@ class Settings:
         self.MAX_SIZE_CACHE: int = int(os.getenv("MAX_SIZE_CACHE"))
         self.TTL_CACHE: int = int(os.getenv("TTL_CACHE"))
         self.URL_DATA_EXAMPLE = (os.getenv("URL_DATA_EXAMPLE"))
+        self.URL_DATA_SHA256: str = os.getenv("URL_DATA_SHA256", "")
         self.ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+        self.DATA_BACKEND: str = os.getenv("DATA_BACKEND", "memory")
+        self.LOADER_MODE: str = os.getenv("LOADER_MODE", "parallel")
+        self.LOADER_MAX_WORKERS: int = int(os.getenv("LOADER_MAX_WORKERS", os.cpu_count() or 1))
+        self.LOADER_REJECT_ABOVE_MB: int = int(os.getenv("LOADER_REJECT_ABOVE_MB", 0))
+        self.SNAPSHOT_DIRECTORY: str = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), '../../', os.getenv("SNAPSHOT_DIRECTORY"))) \
+            if os.getenv("SNAPSHOT_DIRECTORY") else ""
+        self.DATA_WATCH_INTERVAL: float = float(os.getenv("DATA_WATCH_INTERVAL", 30))
+        self.SHARED_DATASET_DIR: str = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), '../../', os.getenv("SHARED_DATASET_DIR"))) \
+            if os.getenv("SHARED_DATASET_DIR") else ""
+        self.RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        self.CUBE_CACHE_MAX_BYTES: int = int(os.getenv("CUBE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        self.USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+        self.USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", 300))
+        self.USER_CACHE_NEGATIVE_TTL: int = int(os.getenv("USER_CACHE_NEGATIVE_TTL", 30))
+        self.EXECUTOR_PANDAS_WORKERS: int = int(os.getenv("EXECUTOR_PANDAS_WORKERS", os.cpu_count() or 1))
+        self.EXECUTOR_PANDAS_QUEUE: int = int(os.getenv("EXECUTOR_PANDAS_QUEUE", 64))
+        self.EXECUTOR_FIREBASE_WORKERS: int = int(os.getenv("EXECUTOR_FIREBASE_WORKERS", 8))
+        self.EXECUTOR_FIREBASE_QUEUE: int = int(os.getenv("EXECUTOR_FIREBASE_QUEUE", 64))
+        self.ADMIN_USERS: frozenset = frozenset(
+            user.strip() for user in os.getenv("ADMIN_USERS", "").split(",") if user.strip())
+        self.PROFILER_MAX_SECONDS: float = float(os.getenv("PROFILER_MAX_SECONDS", 60))
+        self.LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+        self.LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+        self.LOG_RATE_LIMIT_WINDOW: float = float(os.getenv("LOG_RATE_LIMIT_WINDOW", 10))
+        self.LOG_RATE_LIMIT_MAX: int = int(os.getenv("LOG_RATE_LIMIT_MAX", 100))
         self.ml_models = {}
         self.SERVICE_ACCOUNT_KEY = os.path.abspath(
             os.path.join(os.path.dirname(__file__), '../../', os.getenv("SERVICE_ACCOUNT_KEY")))
@@ -1,12 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import Type, List, TypeVar, Generic
+from datetime import date
+from typing import Type, List, TypeVar, Generic, Optional, Tuple, TYPE_CHECKING
+import pandas as pd
 from app.domain.base import BaseModel
 
+if TYPE_CHECKING:
+    from app.infrastructure.data.dimension_tables import DimensionTables
+
 T = TypeVar('T', bound=BaseModel)
 
 
 class IDataFrameManager(ABC, Generic[T]):
+    # True si los datos permanecen en disco y las consultas por clave deben resolverse con scan
+    lazy: bool = False
 
     @abstractmethod
     def query(self, model: Type[T]) -> List[T]:
         pass
+
+    @abstractmethod
+    def query_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def scan(self, key_column: str, key: str, start_date: date, end_date: date,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        pass
+
+    def scan_many(self, key_column: str, keys: List[str], start_date: date, end_date: date,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # Escaneo de varias claves a la vez; por defecto, un escaneo por clave
+        frames = [self.scan(key_column, key, start_date, end_date, columns) for key in keys]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    @abstractmethod
+    def query_dimensions(self) -> Optional['DimensionTables']:
+        pass
+
+    def source_files(self) -> Optional[List[str]]:
+        # Archivos Parquet leídos en la carga inicial, o None si el gestor no los conoce
+        return None
+
+    def release(self):
+        # Libera los datos cargados cuando ya no se consultan (por ejemplo, tras publicar la instantánea)
+        pass
+
+    @abstractmethod
+    def ingest(self, paths: List[str], columns: Optional[List[str]] = None) \
+            -> Tuple[pd.DataFrame, Optional['DimensionTables']]:
+        pass
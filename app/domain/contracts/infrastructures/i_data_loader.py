@@ -1,12 +1,31 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple, TYPE_CHECKING
 import pandas as pd
 
+if TYPE_CHECKING:
+    from app.infrastructure.data.dimension_tables import DimensionTables
+
 
 class IDataLoader(ABC):
 
     def __init__(self):
         self._load_thread = None
+        self._dimensions: Optional['DimensionTables'] = None
+        self._files: Optional[List[str]] = None
 
     @abstractmethod
     def load_parquet_files(self, directory: str) -> pd.DataFrame:
         pass
+
+    @abstractmethod
+    def read_files(self, paths: List[str]) -> Tuple[pd.DataFrame, Optional['DimensionTables']]:
+        pass
+
+    def release(self):
+        self._dimensions = None
+
+    def get_files(self) -> Optional[List[str]]:
+        return self._files
+
+    def get_dimensions(self) -> Optional['DimensionTables']:
+        return self._dimensions
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from app.domain.entities.sales.sale import Sale
 from app.domain.outputs.employee_sales_output import EmployeeSalesOutput
 from app.domain.outputs.product_sales_output import ProductSalesOutput
@@ -9,6 +9,10 @@ from app.domain.outputs.store_sales_output import StoreSalesOutput
 
 class ISaleService(ABC):
 
+    @abstractmethod
+    def ingest_files(self, paths: List[str]):
+        pass
+
     @abstractmethod
     def get_sales_by_employee(self, key_employee: str, start_date: date, end_date: date) -> List[Sale]:
         pass
@@ -21,6 +25,34 @@ class ISaleService(ABC):
     def get_sales_by_store(self, key_store: str, start_date: date, end_date: date) -> List[Sale]:
         pass
 
+    @abstractmethod
+    def get_sales_page(self, key_column: str, key: str, start_date: date, end_date: date, page: int,
+                       page_size: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        pass
+
+    @abstractmethod
+    def stream_sales_by_employee(self, key_employee: str, start_date: date, end_date: date,
+                                 chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def stream_sales_by_product(self, key_product: str, start_date: date, end_date: date,
+                                chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def stream_sales_by_store(self, key_store: str, start_date: date, end_date: date,
+                              chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        pass
+
+    @abstractmethod
+    def dataset_stats(self) -> Optional[Dict[str, Any]]:
+        pass
+
     @abstractmethod
     def get_total_avg_sales_by_store(self) -> List[StoreSalesOutput]:
         pass
@@ -32,3 +64,24 @@ class ISaleService(ABC):
     @abstractmethod
     def get_total_avg_sales_by_employee(self) -> List[EmployeeSalesOutput]:
         pass
+
+    @abstractmethod
+    def get_sales_pages(self, key_column: str, items: List[Tuple[str, Optional[date], Optional[date], Optional[str]]],
+                        page: int, page_size: int) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def get_sales_summary(self, key_column: str, key: str, start_date: date, end_date: date) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def get_sales_cube(self, dimensions: List[str], measures: List[str], functions: List[str],
+                       start_date: Optional[date], end_date: Optional[date], page: int,
+                       page_size: int) -> Tuple[List[Dict[str, Any]], int]:
+        pass
+
+    @abstractmethod
+    def get_top_sales(self, column: str, measure: str, n: int, ascending: bool, start_date: Optional[date],
+                      end_date: Optional[date], filter_column: Optional[str],
+                      filter_key: Optional[str]) -> List[Dict[str, Any]]:
+        pass
@@ -0,0 +1,11 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class CubeInput(BaseModel):
+    dimensions: List[str]
+    measures: List[str] = ['Amount']
+    functions: List[str] = ['sum']
+    StartDate: Optional[datetime] = None
+    EndDate: Optional[datetime] = None
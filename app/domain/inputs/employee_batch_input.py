@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class EmployeeBatchItem(BaseModel):
+    KeyEmployee: str
+    StartDate: Optional[datetime] = None
+    EndDate: Optional[datetime] = None
+    cursor: Optional[str] = None
+
+
+class EmployeeBatchInput(BaseModel):
+    items: List[EmployeeBatchItem] = Field(..., min_length=1, max_length=500)
@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class ProductBatchItem(BaseModel):
+    KeyProduct: str
+    StartDate: Optional[datetime] = None
+    EndDate: Optional[datetime] = None
+    cursor: Optional[str] = None
+
+
+class ProductBatchInput(BaseModel):
+    items: List[ProductBatchItem] = Field(..., min_length=1, max_length=500)
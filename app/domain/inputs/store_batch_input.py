@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class StoreBatchItem(BaseModel):
+    KeyStore: str
+    StartDate: Optional[datetime] = None
+    EndDate: Optional[datetime] = None
+    cursor: Optional[str] = None
+
+
+class StoreBatchInput(BaseModel):
+    items: List[StoreBatchItem] = Field(..., min_length=1, max_length=500)
@@ -0,0 +1,7 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel
+
+
+class CubeOutput(BaseModel):
+    total_rows: int
+    rows: List[Dict[str, Any]]
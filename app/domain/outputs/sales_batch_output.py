@@ -0,0 +1,10 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.domain.outputs.sale_output import SaleOutput
+
+
+class SalesBatchOutput(BaseModel):
+    key: str
+    sales: List[SaleOutput]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,8 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SalesSummaryOutput(BaseModel):
+    total_sales: float
+    avg_sales: Optional[float]
+    count: int
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class TopSalesOutput(BaseModel):
+    key: str
+    value: float
+    count: int
@@ -0,0 +1,106 @@
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+
+MEASURES = ('Amount', 'Qty', 'CostAmount', 'DiscAmount')
+
+
+class AggregateTable:
+    """
+    Tabla materializada de suma, conteo y promedio por clave para varias medidas.
+
+    Las claves se mantienen ordenadas, igual que el resultado de un ``groupby``, de modo que una página
+    es un slice de arreglos ya calculados. Las instancias no se modifican: ``update`` devuelve una tabla
+    nueva con los datos añadidos.
+
+    :param column: Columna clave agregada.
+    :param keys: Claves únicas ordenadas.
+    :param sums: Suma por clave para cada medida.
+    :param counts: Número de valores no nulos por clave para cada medida.
+    """
+
+    def __init__(self, column: str, keys: np.ndarray, sums: Dict[str, np.ndarray], counts: Dict[str, np.ndarray]):
+        self.column = column
+        self.keys = keys
+        self.sums = sums
+        self.counts = counts
+        self.means = {
+            measure: np.divide(sums[measure], counts[measure], out=np.full(len(keys), np.nan),
+                               where=counts[measure] > 0)
+            for measure in sums
+        }
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame, column: str, measures: Iterable[str] = MEASURES) -> 'AggregateTable':
+        """
+        Calcula la tabla agregando el DataFrame por la columna clave.
+
+        :param frame: DataFrame de ventas.
+        :param column: Columna clave.
+        :param measures: Medidas a agregar; se ignoran las que no estén en el DataFrame.
+        :return: Tabla agregada.
+        """
+        codes, keys = pd.factorize(frame[column], sort=True)
+        valid = codes >= 0
+        sums, counts = {}, {}
+        for measure in measures:
+            if measure not in frame:
+                continue
+            values = frame[measure].to_numpy(dtype=np.float64)
+            present = valid & ~np.isnan(values)
+            sums[measure] = np.bincount(codes[present], weights=values[present], minlength=len(keys))
+            counts[measure] = np.bincount(codes[present], minlength=len(keys))
+        return cls(column, np.asarray(keys, dtype=object), sums, counts)
+
+    def update(self, frame: pd.DataFrame) -> 'AggregateTable':
+        """
+        Devuelve una tabla nueva que incluye las filas recibidas sin recalcular las existentes.
+
+        :param frame: DataFrame con las ventas nuevas.
+        :return: Tabla agregada actualizada.
+        """
+        delta = AggregateTable.build(frame, self.column, self.sums.keys())
+        keys = np.union1d(self.keys, delta.keys).astype(object)
+        current = np.searchsorted(keys, self.keys)
+        added = np.searchsorted(keys, delta.keys)
+        sums, counts = {}, {}
+        for measure in self.sums:
+            sums[measure] = np.zeros(len(keys))
+            counts[measure] = np.zeros(len(keys), dtype=np.int64)
+            sums[measure][current] += self.sums[measure]
+            counts[measure][current] += self.counts[measure]
+            sums[measure][added] += delta.sums[measure]
+            counts[measure][added] += delta.counts[measure]
+        return AggregateTable(self.column, keys, sums, counts)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def report(self, measure: str = 'Amount', rows: slice = slice(None)) -> pd.DataFrame:
+        """
+        Devuelve suma, conteo y promedio de una medida.
+
+        :param measure: Medida (Amount, Qty, CostAmount o DiscAmount).
+        :param rows: Rango de claves a devolver. Por defecto todas.
+        :return: DataFrame con las columnas clave, sum, count y mean.
+        """
+        return pd.DataFrame({
+            self.column: self.keys[rows],
+            'sum': self.sums[measure][rows],
+            'count': self.counts[measure][rows],
+            'mean': self.means[measure][rows],
+        })
+
+    def page(self, measure: str = 'Amount', rows: slice = slice(None)) -> pd.DataFrame:
+        """
+        Devuelve la venta total y promedio de una medida con el formato de las salidas *SalesOutput.
+
+        :param measure: Medida a reportar. Valor por defecto: Amount.
+        :param rows: Rango de claves a devolver.
+        :return: DataFrame con las columnas clave, total_sales y avg_sales.
+        """
+        return pd.DataFrame({
+            self.column: self.keys[rows],
+            'total_sales': self.sums[measure][rows],
+            'avg_sales': self.means[measure][rows],
+        })
@@ -0,0 +1,144 @@
+import glob
+import hashlib
+import os
+import shutil
+from typing import List, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+
+from app.infrastructure.data.dimension_tables import DIMENSION_KEYS, DimensionTables
+
+SNAPSHOT_PREFIX = 'sales-'
+FRAME_FILE = 'frame.arrow'
+
+
+def source_fingerprint(paths: List[str]) -> str:
+    """
+    Calcula una huella de los archivos de origen a partir de su nombre, tamaño y fecha de modificación.
+
+    :param paths: Rutas de los archivos Parquet.
+    :return: Huella hexadecimal.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def snapshot_path(snapshot_directory: str, paths: List[str]) -> str:
+    """
+    Ruta de la instantánea Arrow que corresponde a un conjunto de archivos de origen.
+
+    :param snapshot_directory: Directorio de instantáneas.
+    :param paths: Rutas de los archivos Parquet.
+    :return: Ruta del directorio de la instantánea.
+    """
+    return os.path.join(snapshot_directory, f"{SNAPSHOT_PREFIX}{source_fingerprint(paths)}")
+
+
+def write_table(table: pa.Table, path: str):
+    """
+    Escribe la tabla en formato Arrow IPC sin comprimir para poder mapearla en memoria.
+
+    :param table: Tabla a guardar.
+    :param path: Ruta de destino.
+    """
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def write_dimension_table(keys: pd.Index, values, path: str):
+    """
+    Escribe una tabla de dimensión (claves y valores anidados alineados) como Arrow IPC.
+
+    :param keys: Índice de claves.
+    :param values: Valores de la columna anidada.
+    :param path: Ruta de destino.
+    """
+    write_table(pa.table({'key': pa.array(keys), 'value': pa.array(values)}), path)
+
+
+def read_dimension_table(path: str, key_column: str) -> Tuple[str, pd.Index, pa.Array]:
+    """
+    Abre una tabla de dimensión escrita con ``write_dimension_table``; los valores quedan en Arrow.
+
+    :param path: Ruta del archivo.
+    :param key_column: Columna clave de la dimensión.
+    :return: Entrada de ``DimensionTables.tables``.
+    """
+    table = read_snapshot(path)
+    return key_column, pd.Index(table.column('key').to_pandas()), table.column('value').combine_chunks()
+
+
+def write_snapshot(frame: pd.DataFrame, dimensions: Optional[DimensionTables], path: str):
+    """
+    Guarda los datos ya preparados: el DataFrame de hechos, con el esquema aplicado y las claves como
+    categóricas, y cada tabla de dimensión en su propio archivo.
+
+    Se escribe en un directorio temporal que se renombra al terminar, y se eliminan las instantáneas
+    anteriores del mismo directorio.
+
+    :param frame: DataFrame de hechos.
+    :param dimensions: Tablas de dimensión, opcional.
+    :param path: Ruta del directorio de la instantánea.
+    """
+    directory = os.path.dirname(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    write_table(pa.Table.from_pandas(frame, preserve_index=False), os.path.join(tmp_path, FRAME_FILE))
+    for column, (_, keys, values) in (dimensions.tables.items() if dimensions is not None else ()):
+        write_dimension_table(keys, values, os.path.join(tmp_path, f"dimension-{column}.arrow"))
+    # Otro proceso pudo publicar la misma instantánea mientras tanto; os.replace no sustituye directorios no vacíos
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    for stale in glob.glob(os.path.join(directory, f"{SNAPSHOT_PREFIX}*")):
+        if stale == path or stale.endswith('.tmp'):
+            continue
+        if os.path.isdir(stale):
+            shutil.rmtree(stale, ignore_errors=True)
+        else:
+            os.remove(stale)
+
+
+def load_snapshot(path: str) -> Tuple[pd.DataFrame, DimensionTables]:
+    """
+    Abre una instantánea escrita con ``write_snapshot`` sin volver a preparar los datos.
+
+    :param path: Ruta del directorio de la instantánea.
+    :return: DataFrame de hechos y tablas de dimensión, respaldados por los archivos mapeados.
+    """
+    # El texto queda en Arrow, respaldado por el archivo mapeado y compartido entre procesos
+    frame = read_snapshot(os.path.join(path, FRAME_FILE)).to_pandas(split_blocks=True,
+                                                                    types_mapper=arrow_string_dtype)
+    tables = {}
+    for column, key_column in DIMENSION_KEYS.items():
+        file = os.path.join(path, f"dimension-{column}.arrow")
+        if os.path.exists(file):
+            tables[column] = read_dimension_table(file, key_column)
+    return frame, DimensionTables(tables)
+
+
+def arrow_string_dtype(data_type: pa.DataType) -> Optional[pd.ArrowDtype]:
+    """
+    ``types_mapper`` para ``to_pandas``: deja el texto en Arrow para que pandas lo lea del archivo mapeado
+    sin copiarlo a objetos de Python.
+
+    :param data_type: Tipo Arrow de la columna.
+    :return: Tipo pandas respaldado por Arrow para columnas de texto, o None para la conversión habitual.
+    """
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return pd.ArrowDtype(data_type)
+    return None
+
+
+def read_snapshot(path: str) -> pa.Table:
+    """
+    Abre una instantánea mapeándola en memoria; los buffers se comparten entre procesos a través de
+    la caché de páginas del sistema operativo.
+
+    :param path: Ruta de la instantánea.
+    :return: Tabla respaldada por el archivo mapeado.
+    """
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
@@ -1,7 +1,10 @@
-from typing import Type, List, TypeVar, Optional
+from datetime import date
+from typing import Type, List, TypeVar, Optional, Tuple
+import pandas as pd
 from app.domain.contracts.infrastructures.i_data_frame_manager import IDataFrameManager
 from app.domain.contracts.infrastructures.i_data_loader import IDataLoader
 from app.domain.base import BaseModel
+from app.infrastructure.data.dimension_tables import DimensionTables
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -24,4 +27,39 @@ class DataFrameManager(IDataFrameManager[T]):
         self.__initialized = True
 
     def query(self, model: Type[T]) -> List[T]:
-        return model.from_dataframe(self.dataframe)
+        dimensions = self.query_dimensions()
+        df = dimensions.rehydrate(self.dataframe) if dimensions is not None else self.dataframe
+        return model.from_dataframe(df)
+
+    def query_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # Vista columnar de los datos cargados, sin materializar un objeto por fila
+        if columns is None:
+            return self.dataframe
+        return self.dataframe[columns]
+
+    def scan(self, key_column: str, key: str, start_date: date, end_date: date,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        df = self.dataframe
+        key_dates = pd.to_datetime(df['KeyDate'])
+        mask = ((df[key_column] == key) & (key_dates >= pd.Timestamp(start_date))
+                & (key_dates < pd.Timestamp(end_date) + pd.Timedelta(days=1)))
+        return df.loc[mask, columns if columns is not None else df.columns]
+
+    def query_dimensions(self) -> Optional[DimensionTables]:
+        return self.data_loader.get_dimensions()
+
+    def release(self):
+        # La instancia única también deja de retener los datos para que el recolector pueda liberarlos
+        self.dataframe = pd.DataFrame()
+        self.data_loader.release()
+        if DataFrameManager._instance is self:
+            DataFrameManager._instance = None
+
+    def source_files(self) -> Optional[List[str]]:
+        return self.data_loader.get_files()
+
+    def ingest(self, paths: List[str], columns: Optional[List[str]] = None) \
+            -> Tuple[pd.DataFrame, Optional[DimensionTables]]:
+        # Las filas nuevas se devuelven sin añadirlas a self.dataframe; la instantánea del servicio las incorpora
+        frame, dimensions = self.data_loader.read_files(paths)
+        return (frame if columns is None else frame[columns]), dimensions
@@ -1,29 +1,44 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from cachetools import TTLCache
 from threading import Thread, Lock, Event
 from tqdm import tqdm
-import requests
-from zipfile import ZipFile
 from app.domain.contracts.infrastructures.i_data_loader import IDataLoader
 from app.core.config import settings
 from app.infrastructure.cached_property import cached_property
+from app.infrastructure.data.arrow_snapshot import load_snapshot, snapshot_path, write_snapshot
+from app.infrastructure.data.dataset_bootstrap import DatasetBootstrap
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.data.load_progress import LoadProgress, load_progress
+from app.infrastructure.data.sales_schema import enforce_sale_schema
 from app.infrastructure.logging_config import logger
 
 
 class DataLoader(IDataLoader):
-    def __init__(self, cache: TTLCache):
+    def __init__(self, cache: TTLCache, mode: Optional[str] = None, max_workers: Optional[int] = None,
+                 reject_above_mb: Optional[float] = None, snapshot_directory: Optional[str] = None):
         super().__init__()
         self._cache = cache
         self._dataframe = pd.DataFrame()
         self._load_thread = None
+        self._load_error: Optional[BaseException] = None
         self._lock = Lock()
         self._load_complete = Event()
+        self._mode = mode or settings.LOADER_MODE
+        self._max_workers = max(1, max_workers or settings.LOADER_MAX_WORKERS)
+        self._reject_above_mb = settings.LOADER_REJECT_ABOVE_MB if reject_above_mb is None else reject_above_mb
+        self._snapshot_directory = settings.SNAPSHOT_DIRECTORY if snapshot_directory is None else snapshot_directory
 
     @cached_property
     def load_parquet_files(self, directory: str) -> pd.DataFrame:
         if not os.path.exists(directory):
+            load_progress.set_phase('downloading')
             self._download_and_extract_zip(directory)
+            load_progress.set_phase('reading')
 
         files = [f for f in os.listdir(directory) if f.endswith('.parquet')]
         if not files:
@@ -32,40 +47,115 @@ class DataLoader(IDataLoader):
 
         self._load_complete.clear()
         if self._load_thread is None or not self._load_thread.is_alive():
+            self._load_error = None
             self._load_thread = Thread(target=self._load_files_in_background, args=(files, directory))
             self._load_thread.start()
 
         self._load_complete.wait()  # Esperar a que se complete la carga
+        if self._load_error is not None:
+            raise self._load_error
         return self._dataframe
 
     def _download_and_extract_zip(self, directory: str):
-        os.makedirs(directory)
-        response = requests.get(settings.URL_DATA_EXAMPLE, stream=True)
-        zip_path = f"{directory}.zip"
-        total_size = int(response.headers.get('content-length', 0))
-
-        with open(zip_path, 'wb') as file, tqdm(
-                desc="Descargando archivo",
-                total=total_size,
-                unit='B',
-                unit_scale=True,
-                unit_divisor=1024,
-        ) as bar:
-            for data in response.iter_content(chunk_size=1024):
-                file.write(data)
-                bar.update(len(data))
-
-        with ZipFile(zip_path, 'r') as zip_ref:
-            zip_info_list = zip_ref.infolist()
-            for member in tqdm(zip_info_list, desc="Descomprimiendo archivo"):
-                zip_ref.extract(member, directory)
+        DatasetBootstrap(settings.URL_DATA_EXAMPLE, settings.URL_DATA_SHA256).run(directory)
 
     def _load_files_in_background(self, files, directory):
-        for file in tqdm(files, desc="Cargando archivos"):
-            df = pd.read_parquet(os.path.join(directory, file))
+        try:
+            paths = [os.path.join(directory, file) for file in files]
+            snapshot = snapshot_path(self._snapshot_directory, paths) if self._snapshot_directory else None
+            if snapshot and os.path.exists(snapshot):
+                logger.info(f"Cargando instantánea Arrow {snapshot}")
+                # Los datos ya se guardaron preparados: no se vuelven a convertir ni a separar
+                fact, dimensions = load_snapshot(snapshot)
+            else:
+                self._reject_oversized_input(paths)
+                if self._mode == 'parallel':
+                    table = self._read_tables_in_parallel(paths, load_progress)
+                    df = table.to_pandas(split_blocks=True, self_destruct=True)
+                    del table
+                else:
+                    df = pd.DataFrame()
+                    load_progress.add_files(paths)
+                    for path in tqdm(paths, desc="Cargando archivos"):
+                        frame = pd.read_parquet(path)
+                        load_progress.file_done(os.path.getsize(path), len(frame))
+                        df = pd.concat([df, frame], ignore_index=True)
+                # Se aplica el esquema, las columnas anidadas se separan en tablas de dimensión y las claves
+                # pasan a categóricas; la instantánea guarda este resultado para el siguiente arranque
+                fact, dimensions = DimensionTables.split(enforce_sale_schema(df))
+                del df
+                if snapshot:
+                    write_snapshot(fact, dimensions, snapshot)
             with self._lock:
-                self._dataframe = pd.concat([self._dataframe, df], ignore_index=True)
-        self._load_complete.set()  # Indicar que la carga se ha completado
+                self._dataframe, self._dimensions, self._files = fact, dimensions, paths
+        except Exception as e:
+            logger.error(f"Error cargando archivos Parquet desde {directory}: {e}")
+            self._load_error = e
+        finally:
+            self._load_complete.set()  # Indicar que la carga se ha completado
+
+    def release(self):
+        """Suelta el DataFrame cargado y la caché que lo retiene; los archivos leídos se conservan."""
+        with self._lock:
+            super().release()
+            self._dataframe = pd.DataFrame()
+            self._cache.clear()
+
+    def read_files(self, paths: List[str]) -> Tuple[pd.DataFrame, Optional[DimensionTables]]:
+        """
+        Lee archivos Parquet sueltos (por ejemplo, los que llegan después de la carga inicial) sin
+        modificar los datos ya cargados.
+
+        :param paths: Rutas de los archivos.
+        :return: DataFrame de hechos de esos archivos y sus tablas de dimensión.
+        """
+        self._reject_oversized_input(paths)
+        table = self._read_tables_in_parallel(paths)
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+        return DimensionTables.split(df)
+
+    def _read_tables_in_parallel(self, paths: List[str], progress: Optional[LoadProgress] = None) -> pa.Table:
+        """
+        Lee todos los archivos como tablas Arrow en un pool de hilos y los concatena una sola vez.
+
+        pyarrow libera el GIL durante la lectura, por lo que los hilos aprovechan varios núcleos.
+        La concatenación de tablas Arrow no copia datos; la única copia es la conversión final a pandas.
+
+        :param paths: Rutas de los archivos.
+        :param progress: Avance de la carga inicial donde registrar cada archivo leído.
+        """
+        if progress is not None:
+            progress.add_files(paths)
+        tables = []
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(paths))) as executor:
+            for path, table in zip(paths, tqdm(executor.map(pq.read_table, paths), total=len(paths),
+                                               desc="Cargando archivos")):
+                if progress is not None:
+                    progress.file_done(os.path.getsize(path), table.num_rows)
+                tables.append(table)
+        return pa.concat_tables(tables, promote_options='default')
+
+    def _reject_oversized_input(self, paths: List[str]):
+        """
+        Rechaza la lectura, antes de empezarla, si el tamaño sin comprimir que declaran los metadatos de los
+        archivos supera LOADER_REJECT_ABOVE_MB.
+
+        Es un umbral de rechazo y no un límite de memoria: la carga no se reparte en bloques para caber en él, y
+        una lectura aceptada puede ocupar más (conversión a pandas, columnas anidadas como objetos).
+
+        :param paths: Rutas de los archivos a leer.
+        :raises MemoryError: Si el tamaño estimado supera el umbral.
+        """
+        if not self._reject_above_mb:
+            return
+        estimated = 0
+        for path in paths:
+            metadata = pq.ParquetFile(path).metadata
+            estimated += sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+        if estimated > self._reject_above_mb * 1024 * 1024:
+            raise MemoryError(f"Los archivos Parquet ocupan ~{estimated // (1024 * 1024)} MB sin comprimir, "
+                              f"por encima del umbral de rechazo de {self._reject_above_mb} MB")
 
     def get_current_dataframe(self) -> pd.DataFrame:
         with self._lock:
@@ -0,0 +1,325 @@
+import fcntl
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import requests
+from tqdm import tqdm
+
+from app.infrastructure.logging_config import logger
+
+LOCAL_HEADER = 0x04034b50
+CENTRAL_HEADER = 0x02014b50
+END_OF_CENTRAL_DIRECTORY = 0x06054b50
+DATA_DESCRIPTOR = 0x08074b50
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_ZIP64_EXTRA = 0x0001
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+STORED, DEFLATED = 0, 8
+# Bloques grandes: menos llamadas al sistema y menos iteraciones en Python por MB descargado
+CHUNK_SIZE = 1024 * 1024
+
+
+class StreamingZipExtractor:
+    """
+    Extrae los miembros de un zip a medida que llegan sus bytes, sin esperar al directorio central del
+    final del archivo.
+
+    Recorre las cabeceras locales de cada miembro; los miembros comprimidos con deflate se detectan por el
+    final del flujo comprimido, así que también se admiten zips con descriptor de datos. Solo se escriben
+    los miembros con alguna de las extensiones indicadas, con su nombre base (sin directorios), y se
+    verifica el CRC32 de cada uno. Dos miembros con el mismo nombre base en carpetas distintas se
+    sobrescribirían, así que se rechazan. Un miembro sin comprimir cuyo tamaño solo figura en el descriptor no
+    puede delimitarse en streaming: la extracción se detiene y ``streaming`` pasa a False para que el zip
+    se extraiga completo al final.
+
+    :param directory: Directorio donde escribir los miembros.
+    :param suffixes: Extensiones de los miembros que se extraen.
+    """
+
+    def __init__(self, directory: str, suffixes: Tuple[str, ...] = ('.parquet',)):
+        self.directory = directory
+        self.suffixes = suffixes
+        self.extracted: List[str] = []
+        self.streaming = True
+        self._buffer = bytearray()
+        self._state = 'header'
+        self._flags = 0
+        self._method = STORED
+        self._remaining = 0
+        self._expected_crc = 0
+        self._crc = 0
+        self._zip64 = False
+        self._file: Optional[BinaryIO] = None
+        self._decompressor = None
+
+    def feed(self, data: bytes):
+        """
+        Procesa el siguiente bloque de bytes del zip.
+
+        :param data: Bytes en el orden del archivo.
+        :raises ValueError: Si el zip está corrupto o usa un método de compresión no soportado.
+        """
+        if self._state in ('done', 'unsupported'):
+            return
+        self._buffer += data
+        while self._step():
+            pass
+
+    def close(self) -> List[str]:
+        """
+        Termina la extracción comprobando que el zip estaba completo.
+
+        :return: Rutas de los archivos extraídos.
+        :raises ValueError: Si el zip terminó a mitad de un miembro.
+        """
+        if self._file is not None:
+            self._file.close()
+        if self._state not in ('done', 'unsupported'):
+            raise ValueError("El zip está incompleto")
+        return self.extracted
+
+    def _step(self) -> bool:
+        if self._state == 'header':
+            return self._read_header()
+        if self._state == 'data':
+            return self._read_data()
+        if self._state == 'descriptor':
+            return self._read_descriptor()
+        return False
+
+    def _read_header(self) -> bool:
+        if len(self._buffer) < 4:
+            return False
+        signature = struct.unpack_from('<I', self._buffer)[0]
+        if signature in (CENTRAL_HEADER, END_OF_CENTRAL_DIRECTORY):
+            # Tras el último miembro solo queda el directorio central, que no hace falta
+            self._state = 'done'
+            self._buffer.clear()
+            return False
+        if signature != LOCAL_HEADER:
+            raise ValueError("Cabecera de miembro zip no válida")
+        if len(self._buffer) < _LOCAL_HEADER.size:
+            return False
+        (_, _, flags, method, _, _, crc, compressed_size, _, name_length,
+         extra_length) = _LOCAL_HEADER.unpack_from(self._buffer)
+        end = _LOCAL_HEADER.size + name_length + extra_length
+        if len(self._buffer) < end:
+            return False
+        raw_name = bytes(self._buffer[_LOCAL_HEADER.size:_LOCAL_HEADER.size + name_length])
+        extra = bytes(self._buffer[_LOCAL_HEADER.size + name_length:end])
+        del self._buffer[:end]
+
+        self._zip64 = False
+        offset = 0
+        while offset + 4 <= len(extra):
+            header_id, size = struct.unpack_from('<HH', extra, offset)
+            if header_id == _ZIP64_EXTRA:
+                self._zip64 = True
+                if compressed_size == 0xFFFFFFFF and size >= 16:
+                    compressed_size = struct.unpack_from('<Q', extra, offset + 12)[0]
+            offset += 4 + size
+        if method not in (STORED, DEFLATED):
+            raise ValueError(f"Método de compresión zip no soportado: {method}")
+        name = raw_name.decode('utf-8' if flags & _FLAG_UTF8 else 'cp437')
+        # Los directorios son miembros vacíos aunque su tamaño solo figure en el descriptor
+        if method == STORED and flags & _FLAG_DATA_DESCRIPTOR and not compressed_size and not name.endswith('/'):
+            self._state, self.streaming = 'unsupported', False
+            self._buffer.clear()
+            return False
+        self._flags, self._method, self._remaining = flags, method, compressed_size
+        self._expected_crc, self._crc = crc, 0
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == DEFLATED else None
+        basename = os.path.basename(name)
+        if basename and basename.endswith(self.suffixes):
+            path = os.path.join(self.directory, basename)
+            if path in self.extracted:
+                raise ValueError(f"Miembros del zip con el mismo nombre: {basename}")
+            self._file = open(path, 'wb')
+            self.extracted.append(path)
+        self._state = 'data'
+        return True
+
+    def _read_data(self) -> bool:
+        if not self._buffer:
+            return False
+        if self._method == DEFLATED:
+            data = self._decompressor.decompress(bytes(self._buffer))
+            finished = self._decompressor.eof
+            self._buffer = bytearray(self._decompressor.unused_data) if finished else bytearray()
+        else:
+            size = min(self._remaining, len(self._buffer))
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            self._remaining -= size
+            finished = self._remaining == 0
+        self._crc = zlib.crc32(data, self._crc)
+        if self._file is not None:
+            self._file.write(data)
+        if not finished:
+            return False
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._flags & _FLAG_DATA_DESCRIPTOR:
+            self._state = 'descriptor'
+        else:
+            self._check_crc()
+            self._state = 'header'
+        return True
+
+    def _read_descriptor(self) -> bool:
+        if len(self._buffer) < 4:
+            return False
+        signed = struct.unpack_from('<I', self._buffer)[0] == DATA_DESCRIPTOR
+        size = (4 if signed else 0) + 4 + (16 if self._zip64 else 8)
+        if len(self._buffer) < size:
+            return False
+        self._expected_crc = struct.unpack_from('<I', self._buffer, 4 if signed else 0)[0]
+        del self._buffer[:size]
+        self._check_crc()
+        self._state = 'header'
+        return True
+
+    def _check_crc(self):
+        if self._crc != self._expected_crc:
+            raise ValueError("CRC incorrecto en un miembro del zip")
+
+
+class DatasetBootstrap:
+    """
+    Descarga el zip de datos de ejemplo y extrae sus archivos Parquet mientras se descarga.
+
+    Los bytes se guardan en ``<directorio>.zip.part``, de modo que una descarga interrumpida se reanuda con
+    una petición HTTP Range en el siguiente intento o arranque. La extracción se hace en un directorio
+    temporal junto al destino que solo se renombra al destino si el zip está completo y su SHA-256
+    coincide, así que nunca queda un directorio de datos a medias.
+
+    :param url: URL del zip.
+    :param sha256: SHA-256 esperado del zip en hexadecimal; sin él solo se registra el calculado.
+    :param chunk_size: Tamaño de los bloques de lectura en bytes.
+    :param retries: Intentos de descarga ante errores de red.
+    :param timeout: Segundos de espera de conexión y lectura.
+    :param session: Sesión HTTP; por defecto una nueva.
+    """
+
+    def __init__(self, url: str, sha256: Optional[str] = None, chunk_size: int = CHUNK_SIZE, retries: int = 3,
+                 timeout: float = 60, session: Optional[requests.Session] = None):
+        self.url = url
+        self.sha256 = sha256.lower() if sha256 else None
+        self.chunk_size = chunk_size
+        self.retries = max(1, retries)
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def run(self, directory: str) -> List[str]:
+        """
+        Crea el directorio de datos a partir del zip, salvo que otro proceso ya lo haya creado.
+
+        :param directory: Directorio de datos a crear.
+        :return: Archivos Parquet del directorio.
+        :raises ValueError: Si el zip está corrupto o su SHA-256 no coincide.
+        """
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        part = f"{directory}.zip.part"
+        with self._lock(f"{directory}.zip.lock"):
+            if not os.path.exists(directory):
+                for attempt in range(1, self.retries + 1):
+                    try:
+                        self._download_and_extract(directory, part)
+                        break
+                    except requests.RequestException as e:
+                        if attempt == self.retries:
+                            raise
+                        logger.error(f"Descarga de {self.url} interrumpida ({e}); reintento {attempt}")
+        return sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.parquet'))
+
+    @contextmanager
+    def _lock(self, path: str):
+        # Varios procesos pueden arrancar a la vez; solo uno descarga y los demás esperan su resultado
+        with open(path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _download_and_extract(self, directory: str, part: str):
+        staging = tempfile.mkdtemp(prefix=f".{os.path.basename(directory)}.", dir=os.path.dirname(
+            os.path.abspath(directory)))
+        try:
+            digest = hashlib.sha256()
+            extractor = StreamingZipExtractor(staging)
+            try:
+                for chunk in self._chunks(part):
+                    digest.update(chunk)
+                    extractor.feed(chunk)
+                extractor.close()
+                if self.sha256 is not None and digest.hexdigest() != self.sha256:
+                    raise ValueError(f"SHA-256 de {self.url} incorrecto: {digest.hexdigest()}")
+                if not extractor.streaming:
+                    self._extract_part(part, staging)
+            except (ValueError, zipfile.BadZipFile):
+                # El archivo descargado no sirve: se descarta para que el siguiente intento empiece de cero
+                os.remove(part)
+                raise
+            logger.info(f"Datos de {self.url} verificados (sha256 {digest.hexdigest()})")
+            os.rename(staging, directory)
+            os.remove(part)
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging)
+
+    def _chunks(self, part: str) -> Iterator[bytes]:
+        """
+        Devuelve los bytes del zip desde el principio: primero los ya descargados en ``part`` y después los
+        que faltan, que se piden con Range y se añaden a ``part`` conforme llegan.
+        """
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416 and offset:
+                # El servidor no tiene más bytes a partir de offset: la descarga anterior estaba completa
+                yield from self._read_part(part)
+                return
+            response.raise_for_status()
+            if response.status_code != 206:
+                # El servidor ignoró el Range y envía el archivo completo
+                offset = 0
+            total = offset + int(response.headers.get('content-length', 0))
+            if offset:
+                yield from self._read_part(part)
+            with open(part, 'ab' if offset else 'wb') as file, tqdm(
+                    desc="Descargando archivo", total=total, initial=offset, unit='B', unit_scale=True,
+                    unit_divisor=1024) as bar:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+                    bar.update(len(chunk))
+                    yield chunk
+
+    @staticmethod
+    def _extract_part(part: str, staging: str):
+        # Zip que no se pudo extraer en streaming: se extrae del archivo descargado, ya verificado
+        with zipfile.ZipFile(part) as archive:
+            seen = set()
+            for member in archive.infolist():
+                basename = os.path.basename(member.filename)
+                if basename.endswith('.parquet'):
+                    if basename in seen:
+                        raise ValueError(f"Miembros del zip con el mismo nombre: {basename}")
+                    seen.add(basename)
+                    with archive.open(member) as source, open(os.path.join(staging, basename), 'wb') as target:
+                        shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+    def _read_part(self, part: str) -> Iterator[bytes]:
+        with open(part, 'rb') as file:
+            while chunk := file.read(self.chunk_size):
+                yield chunk
@@ -0,0 +1,73 @@
+from datetime import date
+from threading import Lock
+from typing import Callable, List, Optional, Tuple, Type, TypeVar
+import pandas as pd
+from app.domain.base import BaseModel
+from app.domain.contracts.infrastructures.i_data_frame_manager import IDataFrameManager
+from app.infrastructure.data.dimension_tables import DimensionTables
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class DeferredDataFrameManager(IDataFrameManager[T]):
+    """
+    Gestor de datos que crea el gestor real solo cuando se consulta por primera vez.
+
+    Con el dataset compartido entre procesos, únicamente el proceso que publica la instantánea llega a
+    cargar los archivos Parquet; los demás nunca crean el gestor real. Mientras no exista, los archivos
+    nuevos se leen con ``reader``, que solo lee esos archivos, en lugar de crear el gestor para ingerirlos.
+
+    :param factory: Función que crea el gestor real.
+    :param lazy: Valor de ``lazy`` del gestor que creará la función.
+    :param reader: Función que lee archivos sueltos sin crear el gestor, con la firma de ``ingest``.
+    """
+
+    def __init__(self, factory: Callable[[], IDataFrameManager[T]], lazy: bool = False,
+                 reader: Optional[Callable[[List[str], Optional[List[str]]],
+                                           Tuple[pd.DataFrame, Optional[DimensionTables]]]] = None):
+        self.factory = factory
+        self.lazy = lazy
+        self.reader = reader
+        self._manager: Optional[IDataFrameManager[T]] = None
+        self._lock = Lock()
+
+    @property
+    def manager(self) -> IDataFrameManager[T]:
+        if self._manager is None:
+            with self._lock:
+                if self._manager is None:
+                    self._manager = self.factory()
+        return self._manager
+
+    def query(self, model: Type[T]) -> List[T]:
+        return self.manager.query(model)
+
+    def query_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.manager.query_frame(columns)
+
+    def scan(self, key_column: str, key: str, start_date: date, end_date: date,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.manager.scan(key_column, key, start_date, end_date, columns)
+
+    def scan_many(self, key_column: str, keys: List[str], start_date: date, end_date: date,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.manager.scan_many(key_column, keys, start_date, end_date, columns)
+
+    def query_dimensions(self) -> Optional[DimensionTables]:
+        return self.manager.query_dimensions()
+
+    def release(self):
+        """Suelta el gestor real; si se vuelve a consultar, se crea de nuevo."""
+        with self._lock:
+            manager, self._manager = self._manager, None
+        if manager is not None:
+            manager.release()
+
+    def source_files(self) -> Optional[List[str]]:
+        return self._manager.source_files() if self._manager is not None else None
+
+    def ingest(self, paths: List[str], columns: Optional[List[str]] = None) \
+            -> Tuple[pd.DataFrame, Optional[DimensionTables]]:
+        if self._manager is None and self.reader is not None:
+            return self.reader(paths, columns)
+        return self.manager.ingest(paths, columns)
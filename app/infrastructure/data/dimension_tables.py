@@ -0,0 +1,142 @@
+from typing import Dict, Tuple, Union
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Columna anidada -> clave que la identifica
+DIMENSION_KEYS = {
+    'Tickets': 'KeyTicket',
+    'Products': 'KeyProduct',
+    'Customers': 'KeyCustomer',
+    'Employees': 'KeyEmployee',
+    'Stores': 'KeyStore',
+    'Divisions': 'KeyDivision',
+    'Time': 'KeyDate',
+    'Cedis': 'KeyCedi',
+}
+KEY_COLUMNS = ('KeyStore', 'KeyWarehouse', 'KeyCustomer', 'KeyProduct', 'KeyEmployee', 'KeyCurrency',
+               'KeyDivision', 'KeyTicket', 'KeyCedi')
+
+
+def _dimension_keys(key_column: str, values: pd.Series) -> pd.Series:
+    # KeyDate llega como date, Timestamp o datetime64 según el origen; se compara siempre normalizada
+    if key_column == 'KeyDate':
+        return pd.to_datetime(values).dt.normalize()
+    return values
+
+
+def _append_values(current: Union[np.ndarray, pa.Array], added: Union[np.ndarray, pa.Array]
+                   ) -> Union[np.ndarray, pa.Array]:
+    # Si los valores existentes son Arrow (mapeados en memoria) solo se convierten los nuevos, sin copiar
+    # los existentes a objetos de Python
+    if isinstance(current, (pa.Array, pa.ChunkedArray)):
+        if not isinstance(added, (pa.Array, pa.ChunkedArray)):
+            try:
+                added = pa.array(added, type=current.type, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Los valores nuevos no encajan en el tipo existente: se combinan como objetos
+                current = np.fromiter(current.to_pylist(), dtype=object, count=len(current))
+                return np.concatenate([current, added])
+        chunks = current.chunks if isinstance(current, pa.ChunkedArray) else [current]
+        added_chunks = added.chunks if isinstance(added, pa.ChunkedArray) else [added]
+        return pa.chunked_array(chunks + added_chunks, type=current.type)
+    if isinstance(added, (pa.Array, pa.ChunkedArray)):
+        added = np.fromiter(added.to_pylist(), dtype=object, count=len(added))
+    return np.concatenate([current, added])
+
+
+class DimensionTables:
+    """
+    Tablas de dimensión deduplicadas para las columnas anidadas de las ventas.
+
+    Cada columna anidada (Tickets, Products...) se guarda una sola vez por valor de su clave. Si una
+    clave aparece con valores distintos se conserva el primero.
+
+    :param tables: Por columna anidada, la columna clave, el índice de claves y los valores alineados
+        (arreglo numpy de objetos o arreglo Arrow, por ejemplo desde un archivo mapeado en memoria).
+    """
+
+    def __init__(self, tables: Dict[str, Tuple[str, pd.Index, Union[np.ndarray, pa.Array]]]):
+        self.tables = tables
+
+    @classmethod
+    def split(cls, frame: pd.DataFrame) -> Tuple[pd.DataFrame, 'DimensionTables']:
+        """
+        Separa las columnas anidadas en tablas de dimensión y codifica las claves como categóricas.
+
+        :param frame: DataFrame de ventas tal como se leyó.
+        :return: DataFrame de hechos sin columnas anidadas y las tablas de dimensión.
+        """
+        tables = {}
+        for column, key_column in DIMENSION_KEYS.items():
+            if column not in frame or key_column not in frame:
+                continue
+            codes, keys = pd.factorize(_dimension_keys(key_column, frame[key_column]))
+            _, first = np.unique(codes, return_index=True)
+            if len(first) and codes[first[0]] < 0:
+                first = first[1:]
+            tables[column] = (key_column, pd.Index(keys), frame[column].to_numpy()[first])
+        fact = frame.drop(columns=list(tables))
+        for key_column in KEY_COLUMNS:
+            if key_column in fact and (fact[key_column].dtype == object
+                                       or isinstance(fact[key_column].dtype, pd.ArrowDtype)):
+                fact[key_column] = fact[key_column].astype('category')
+        return fact, cls(tables)
+
+    def merge(self, other: 'DimensionTables') -> 'DimensionTables':
+        """
+        Devuelve tablas nuevas con las claves de ``other`` que aún no existían; las existentes se conservan.
+
+        :param other: Tablas de dimensión de las filas nuevas.
+        :return: Tablas combinadas.
+        """
+        tables = dict(self.tables)
+        for column, (key_column, keys, values) in other.tables.items():
+            if column not in tables:
+                tables[column] = (key_column, keys, values)
+                continue
+            _, current_keys, current_values = tables[column]
+            added = ~keys.isin(current_keys)
+            if not added.any():
+                continue
+            new_values = values.filter(pa.array(added)) if isinstance(values, (pa.Array, pa.ChunkedArray)) \
+                else values[added]
+            tables[column] = (key_column, current_keys.append(keys[added]),
+                              _append_values(current_values, new_values))
+        return DimensionTables(tables)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.tables
+
+    def lookup(self, column: str, keys: pd.Series) -> np.ndarray:
+        """
+        Obtiene los valores de una columna anidada para las claves recibidas.
+
+        :param column: Columna anidada (Tickets, Products...).
+        :param keys: Valores de la columna clave.
+        :return: Valores alineados con ``keys``; None donde la clave no existe.
+        """
+        key_column, index, values = self.tables[column]
+        positions = index.get_indexer(_dimension_keys(key_column, keys))
+        result = np.empty(len(positions), dtype=object)
+        found = positions >= 0
+        if isinstance(values, (pa.Array, pa.ChunkedArray)):
+            result[found] = values.take(positions[found]).to_pylist()
+        else:
+            result[found] = values[positions[found]]
+        return result
+
+    def rehydrate(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Añade a las filas recibidas las columnas anidadas que les falten.
+
+        :param frame: Filas a completar (normalmente una página).
+        :return: DataFrame con las columnas anidadas.
+        """
+        missing = [column for column in self.tables if column not in frame]
+        if not missing:
+            return frame
+        frame = frame.copy(deep=False)
+        for column in missing:
+            frame[column] = self.lookup(column, frame[self.tables[column][0]])
+        return frame
@@ -0,0 +1,156 @@
+import math
+import os
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+from app.infrastructure.logging_config import logger
+
+IDLE, LOADING, READY, FAILED = 'idle', 'loading', 'ready', 'failed'
+# Retry-After por defecto cuando aún no hay datos suficientes para estimar el tiempo restante
+DEFAULT_RETRY_AFTER = 5
+MAX_RETRY_AFTER = 60
+
+
+class LoadProgress:
+    """
+    Estado y avance de la carga inicial del dataset de ventas.
+
+    Mientras no se haya lanzado ninguna carga en segundo plano (``idle``) el servicio se considera listo
+    y carga los datos bajo demanda, como en las pruebas o los benchmarks. Con una carga en curso registra
+    la fase (descarga, lectura, indexado), los archivos, filas y bytes leídos, y estima el tiempo restante
+    a partir del ritmo de lectura.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.state = IDLE
+            self.phase: Optional[str] = None
+            self.error: Optional[str] = None
+            self.files_total = self.files_loaded = self.rows = self.bytes_total = self.bytes_loaded = 0
+            self._started: Optional[float] = None
+            self._finished: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in (IDLE, READY)
+
+    def start(self):
+        self.reset()
+        with self._lock:
+            self.state, self._started = LOADING, monotonic()
+
+    def set_phase(self, phase: str):
+        with self._lock:
+            self.phase = phase
+
+    def add_files(self, paths: List[str]):
+        """
+        Registra los archivos que se van a leer.
+
+        :param paths: Rutas de los archivos.
+        """
+        size = sum(os.path.getsize(path) for path in paths)
+        with self._lock:
+            self.files_total += len(paths)
+            self.bytes_total += size
+
+    def file_done(self, size: int, rows: int):
+        """
+        Registra un archivo leído.
+
+        :param size: Bytes del archivo en disco.
+        :param rows: Filas leídas.
+        """
+        with self._lock:
+            self.files_loaded += 1
+            self.bytes_loaded += size
+            self.rows += rows
+
+    def finish(self, rows: Optional[int] = None):
+        """
+        Marca la carga como terminada.
+
+        :param rows: Filas del dataset publicado, si se conocen.
+        """
+        with self._lock:
+            self.state, self.phase, self._finished = READY, None, monotonic()
+            if rows is not None:
+                self.rows = rows
+
+    def fail(self, error: BaseException):
+        with self._lock:
+            self.state, self.error, self._finished = FAILED, str(error), monotonic()
+
+    def eta_seconds(self) -> Optional[float]:
+        """
+        Estima los segundos que faltan para terminar de leer los archivos, al ritmo observado hasta ahora.
+
+        :return: Segundos estimados, o None si aún no se ha leído nada o no hay carga en curso.
+        """
+        with self._lock:
+            if self.state != LOADING or not self.bytes_loaded or self._started is None:
+                return None
+            elapsed = monotonic() - self._started
+            return elapsed / self.bytes_loaded * max(0, self.bytes_total - self.bytes_loaded)
+
+    def retry_after(self) -> int:
+        """
+        Segundos que un cliente debería esperar antes de reintentar, para la cabecera Retry-After.
+
+        :return: Segundos entre 1 y MAX_RETRY_AFTER.
+        """
+        if self.state == FAILED:
+            return MAX_RETRY_AFTER
+        eta = self.eta_seconds()
+        return DEFAULT_RETRY_AFTER if eta is None else min(MAX_RETRY_AFTER, max(1, math.ceil(eta)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado de la carga para los endpoints de salud.
+
+        :return: Estado, fase, archivos, filas, bytes, segundos transcurridos, tiempo restante estimado y error.
+        """
+        eta = self.eta_seconds()
+        with self._lock:
+            end = self._finished if self._finished is not None else monotonic()
+            return {'state': self.state, 'phase': self.phase, 'files_total': self.files_total,
+                    'files_loaded': self.files_loaded, 'rows': self.rows, 'bytes_total': self.bytes_total,
+                    'bytes_loaded': self.bytes_loaded,
+                    'elapsed_seconds': end - self._started if self._started is not None else None,
+                    'eta_seconds': eta, 'error': self.error}
+
+
+load_progress = LoadProgress()
+
+
+def start_background_load(load: Callable[[], Any], on_ready: Optional[Callable[[], None]] = None,
+                          progress: LoadProgress = load_progress) -> Thread:
+    """
+    Carga el dataset en un hilo en segundo plano para que el servidor acepte conexiones desde el arranque.
+
+    :param load: Función que carga el dataset.
+    :param on_ready: Función a ejecutar cuando la carga termina bien.
+    :param progress: Avance donde registrar el estado de la carga.
+    :return: Hilo de la carga.
+    """
+    def run():
+        try:
+            dataset = load()
+            progress.finish(len(dataset) if hasattr(dataset, '__len__') else None)
+        except Exception as e:
+            logger.error(f"Error cargando el dataset de ventas: {e}")
+            progress.fail(e)
+            return
+        logger.info(f"Dataset de ventas listo: {progress.snapshot()}")
+        if on_ready is not None:
+            on_ready()
+
+    progress.start()
+    thread = Thread(target=run, name="dataset-loader", daemon=True)
+    thread.start()
+    return thread
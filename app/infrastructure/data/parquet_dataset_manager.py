@@ -0,0 +1,120 @@
+import os
+from datetime import date, timedelta
+from typing import Type, List, TypeVar, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from app.domain.contracts.infrastructures.i_data_frame_manager import IDataFrameManager
+from app.domain.base import BaseModel
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.logging_config import logger
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class ParquetDatasetManager(IDataFrameManager[T]):
+    """
+    Gestor de datos que mantiene las ventas en disco como un dataset de pyarrow.
+
+    Las consultas por clave y periodo se empujan al escaneo: el filtro de igualdad y el rango de KeyDate
+    permiten descartar row groups completos con sus estadísticas min/max, y solo se leen las columnas
+    solicitadas.
+
+    :param data_directory: Directorio con los archivos Parquet.
+    """
+    lazy = True
+
+    def __init__(self, data_directory: str):
+        if not os.path.exists(data_directory):
+            logger.error(f"No existe el directorio de datos {data_directory}")
+            raise FileNotFoundError(f"No existe el directorio de datos {data_directory}")
+        files = [os.path.join(data_directory, f) for f in sorted(os.listdir(data_directory)) if f.endswith('.parquet')]
+        if not files:
+            logger.error(f"No se encontraron archivos Parquet en el directorio {data_directory}")
+            raise FileNotFoundError(f"No se encontraron archivos Parquet en el directorio {data_directory}")
+        self.data_directory = data_directory
+        self.files = files
+        self.dataset = ds.dataset(files, format='parquet')
+
+    def query(self, model: Type[T]) -> List[T]:
+        return model.from_dataframe(self.query_frame())
+
+    def query_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.dataset.to_table(columns=self._project(columns)).to_pandas()
+
+    def scan(self, key_column: str, key: str, start_date: date, end_date: date,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        key_date = pc.field('KeyDate')
+        expression = ((pc.field(key_column) == key)
+                      & (key_date >= self._date_scalar(start_date))
+                      & (key_date < self._date_scalar(end_date + timedelta(days=1))))
+        return self.dataset.to_table(columns=self._project(columns), filter=expression).to_pandas()
+
+    def scan_many(self, key_column: str, keys: List[str], start_date: date, end_date: date,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Escanea varias claves en una sola pasada por el dataset, con un filtro ``isin`` sobre la clave.
+
+        :param key_column: Columna clave.
+        :param keys: Claves a leer.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param columns: Columnas a devolver. Por defecto todas.
+        :return: Filas de todas las claves, sin un orden particular.
+        """
+        key_date = pc.field('KeyDate')
+        expression = (pc.field(key_column).isin(list(keys))
+                      & (key_date >= self._date_scalar(start_date))
+                      & (key_date < self._date_scalar(end_date + timedelta(days=1))))
+        return self.dataset.to_table(columns=self._project(columns), filter=expression).to_pandas()
+
+    def query_dimensions(self) -> Optional[DimensionTables]:
+        # Las filas se leen completas desde disco, no hay columnas anidadas que rehidratar
+        return None
+
+    def source_files(self) -> Optional[List[str]]:
+        return list(self.files)
+
+    def ingest(self, paths: List[str], columns: Optional[List[str]] = None) \
+            -> Tuple[pd.DataFrame, Optional[DimensionTables]]:
+        """
+        Añade archivos Parquet nuevos al dataset y devuelve sus filas.
+
+        El dataset se reemplaza por uno nuevo con todos los archivos; los escaneos en curso siguen usando
+        el anterior.
+
+        :param paths: Rutas de los archivos nuevos.
+        :param columns: Columnas a devolver. Por defecto todas.
+        :return: Filas de los archivos nuevos y None, ya que no hay tablas de dimensión.
+        """
+        self.files = self.files + list(paths)
+        self.dataset = ds.dataset(self.files, format='parquet')
+        return self.read_files(paths, columns)
+
+    @staticmethod
+    def read_files(paths: List[str], columns: Optional[List[str]] = None) \
+            -> Tuple[pd.DataFrame, Optional[DimensionTables]]:
+        """
+        Lee archivos Parquet sueltos sin crear un gestor ni tocar el dataset existente.
+
+        :param paths: Rutas de los archivos.
+        :param columns: Columnas a devolver. Por defecto todas.
+        :return: Filas de los archivos y None, ya que no hay tablas de dimensión.
+        """
+        added = ds.dataset(paths, format='parquet')
+        if columns is not None:
+            columns = [column for column in columns if column in added.schema.names]
+        return added.to_table(columns=columns).to_pandas(), None
+
+    def _project(self, columns: Optional[List[str]]) -> Optional[List[str]]:
+        if columns is None:
+            return None
+        return [column for column in columns if column in self.dataset.schema.names]
+
+    def _date_scalar(self, value: date) -> pa.Scalar:
+        # El escalar debe tener el mismo tipo que la columna para que el filtro use las estadísticas
+        date_type = self.dataset.schema.field('KeyDate').type
+        if pa.types.is_timestamp(date_type):
+            return pa.scalar(pd.Timestamp(value).to_pydatetime(), type=date_type)
+        return pa.scalar(value, type=date_type)
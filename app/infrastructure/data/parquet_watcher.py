@@ -0,0 +1,110 @@
+import os
+from threading import Event, Thread
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.infrastructure.logging_config import logger
+
+
+class ParquetWatcher:
+    """
+    Vigila un directorio y notifica los archivos Parquet nuevos.
+
+    Revisa el directorio cada ``interval`` segundos en un hilo en segundo plano. Un archivo se considera
+    nuevo cuando su tamaño y fecha de modificación no cambian entre dos revisiones seguidas, para no
+    leer archivos que aún se están copiando. Los archivos se notifican de uno en uno, para que uno dañado
+    no bloquee a los demás: si falla se reintenta en las siguientes revisiones y, tras ``max_attempts``
+    fallos, queda en cuarentena hasta que se reescriba (cambie su tamaño o fecha de modificación).
+
+    :param directory: Directorio a vigilar.
+    :param on_files: Función que recibe las rutas de los archivos nuevos.
+    :param interval: Segundos entre revisiones.
+    :param known: Archivos ya cargados, normalmente los que leyó la carga inicial. Por defecto, los que hay en
+        el directorio al crear el vigilante, lo que da por cargados los que llegaron durante la carga.
+    :param max_attempts: Fallos seguidos de un archivo antes de ponerlo en cuarentena.
+    """
+
+    def __init__(self, directory: str, on_files: Callable[[List[str]], None], interval: float,
+                 known: Optional[Iterable[str]] = None, max_attempts: int = 3):
+        self.directory = directory
+        self.on_files = on_files
+        self.interval = interval
+        self._known = set(known) if known is not None else set(self._list_files())
+        self.max_attempts = max_attempts
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        # Archivos que fallaron: firma (tamaño, fecha) con la que fallaron y número de intentos
+        self._failed: Dict[str, Tuple[Tuple[int, int], int]] = {}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def _list_files(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith('.parquet'))
+
+    @property
+    def quarantined(self) -> List[str]:
+        """Archivos en cuarentena tras fallar ``max_attempts`` veces."""
+        return sorted(path for path, (_, attempts) in self._failed.items() if attempts >= self.max_attempts)
+
+    def poll(self) -> List[str]:
+        """
+        Revisa el directorio una vez y notifica, de uno en uno, los archivos nuevos que ya están completos.
+
+        :return: Rutas notificadas correctamente.
+        """
+        ready, pending = [], {}
+        for path in self._list_files():
+            if path in self._known:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            failed_signature, attempts = self._failed.get(path, (None, 0))
+            if failed_signature == signature and attempts >= self.max_attempts:
+                continue
+            if self._pending.get(path) == signature:
+                ready.append(path)
+            else:
+                pending[path] = signature
+        if ready:
+            logger.info(f"Archivos Parquet nuevos en {self.directory}: {ready}")
+        notified = []
+        for path in ready:
+            signature = self._pending[path]
+            try:
+                self.on_files([path])
+            except Exception as e:
+                failed_signature, attempts = self._failed.get(path, (None, 0))
+                attempts = attempts + 1 if failed_signature == signature else 1
+                self._failed[path] = (signature, attempts)
+                if attempts >= self.max_attempts:
+                    logger.error(f"Archivo Parquet en cuarentena tras {attempts} fallos: {path}: {e}")
+                else:
+                    logger.warning(f"Error incorporando {path} (intento {attempts}): {e}")
+                    # Sigue estable: se reintenta en la siguiente revisión sin esperar otra
+                    pending[path] = signature
+                continue
+            self._failed.pop(path, None)
+            self._known.add(path)
+            notified.append(path)
+        self._pending = pending
+        return notified
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error incorporando archivos Parquet nuevos desde {self.directory}: {e}")
+
+    def start(self) -> 'ParquetWatcher':
+        self._thread = Thread(target=self._run, name="parquet-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,128 @@
+from datetime import date
+from typing import Dict, Hashable, Iterable, Tuple
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.sales_index import to_day_value
+
+SUMMARY_MEASURES = ('Amount',)
+
+
+class DailyPrefixSums:
+    """
+    Sumas y conteos diarios acumulados por clave para resolver totales de un rango de fechas.
+
+    Para cada clave se guardan los días con ventas en un bloque contiguo ordenado por fecha y, para cada
+    medida, la suma y el conteo acumulados desde el inicio de la tabla. El total de un rango son dos
+    búsquedas binarias dentro del bloque y una resta, así que el coste no depende del número de ventas
+    del rango. Las instancias no se modifican: ``update`` devuelve una tabla nueva.
+
+    :param column: Columna clave.
+    :param keys: Claves únicas ordenadas.
+    :param offsets: Inicio del bloque de cada clave en ``days``; tiene ``len(keys) + 1`` elementos.
+    :param days: Días con ventas (int64, ns) ordenados dentro de cada bloque.
+    :param sums: Suma acumulada por medida, con un cero inicial (``len(days) + 1`` elementos).
+    :param counts: Número acumulado de valores no nulos por medida, con un cero inicial.
+    """
+
+    def __init__(self, column: str, keys: np.ndarray, offsets: np.ndarray, days: np.ndarray,
+                 sums: Dict[str, np.ndarray], counts: Dict[str, np.ndarray]):
+        self.column = column
+        self.keys = keys
+        self.offsets = offsets
+        self.days = days
+        self.sums = sums
+        self.counts = counts
+        self._codes: Dict[Hashable, int] = {key: code for code, key in enumerate(keys)}
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame, column: str, measures: Iterable[str] = SUMMARY_MEASURES) \
+            -> 'DailyPrefixSums':
+        """
+        Calcula la tabla a partir del DataFrame de ventas.
+
+        :param frame: DataFrame de ventas con KeyDate como datetime64.
+        :param column: Columna clave.
+        :param measures: Medidas a acumular; se ignoran las que no estén en el DataFrame.
+        :return: Tabla de sumas acumuladas.
+        """
+        codes, keys = pd.factorize(frame[column], sort=True)
+        days = frame['KeyDate'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]') \
+            .astype('datetime64[ns]').view(np.int64)
+        valid = codes >= 0
+        daily = {}
+        for measure in measures:
+            if measure in frame:
+                values = frame[measure].to_numpy(dtype=np.float64)[valid]
+                present = ~np.isnan(values)
+                daily[measure] = (np.where(present, values, 0.0), present.astype(np.int64))
+        return cls._from_daily(column, np.asarray(keys, dtype=object), codes[valid].astype(np.int64),
+                               days[valid], daily)
+
+    @classmethod
+    def _from_daily(cls, column: str, keys: np.ndarray, codes: np.ndarray, days: np.ndarray,
+                    values: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> 'DailyPrefixSums':
+        # Agrupa los pares (clave, día), que pueden repetirse, y acumula sus totales en orden
+        order = np.lexsort((days, codes))
+        codes, days = codes[order], days[order]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (days[1:] != days[:-1])
+        group = np.cumsum(first) - 1
+        size = int(first.sum())
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[first], minlength=len(keys)), out=offsets[1:])
+        sums, counts = {}, {}
+        for measure, (amounts, present) in values.items():
+            sums[measure] = np.zeros(size + 1)
+            np.cumsum(np.bincount(group, weights=amounts[order], minlength=size), out=sums[measure][1:])
+            counts[measure] = np.zeros(size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(group, weights=present[order], minlength=size).astype(np.int64),
+                      out=counts[measure][1:])
+        return cls(column, keys, offsets, days[first], sums, counts)
+
+    def update(self, frame: pd.DataFrame) -> 'DailyPrefixSums':
+        """
+        Devuelve una tabla nueva que incluye las filas recibidas.
+
+        Las ventas existentes entran ya agregadas por día, de modo que solo se recorren las filas nuevas.
+
+        :param frame: DataFrame con las ventas nuevas.
+        :return: Tabla actualizada.
+        """
+        delta = DailyPrefixSums.build(frame, self.column, self.sums.keys())
+        keys = np.union1d(self.keys, delta.keys).astype(object)
+        codes = np.concatenate([np.repeat(np.searchsorted(keys, self.keys), np.diff(self.offsets)),
+                                np.repeat(np.searchsorted(keys, delta.keys), np.diff(delta.offsets))])
+        daily = {
+            measure: (np.concatenate([np.diff(self.sums[measure]), np.diff(delta.sums[measure])]),
+                      np.concatenate([np.diff(self.counts[measure]), np.diff(delta.counts[measure])]))
+            for measure in self.sums
+        }
+        return DailyPrefixSums._from_daily(self.column, keys, codes, np.concatenate([self.days, delta.days]),
+                                           daily)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def summary(self, key: Hashable, start_date: date, end_date: date, measure: str = 'Amount') \
+            -> Tuple[float, int]:
+        """
+        Obtiene la suma y el número de ventas de una clave en un rango de fechas (ambos extremos incluidos).
+
+        :param key: Clave a buscar.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param measure: Medida a sumar. Valor por defecto: Amount.
+        :return: Suma y conteo; (0.0, 0) si la clave no existe o no tiene ventas en el rango.
+        """
+        code = self._codes.get(key)
+        if code is None:
+            return 0.0, 0
+        start, end = int(self.offsets[code]), int(self.offsets[code + 1])
+        block_days = self.days[start:end]
+        left = start + int(np.searchsorted(block_days, to_day_value(start_date), side='left'))
+        right = start + int(np.searchsorted(block_days, to_day_value(end_date), side='right'))
+        if right <= left:
+            return 0.0, 0
+        sums, counts = self.sums[measure], self.counts[measure]
+        return float(sums[right] - sums[left]), int(counts[right] - counts[left])
@@ -0,0 +1,24 @@
+import numpy as np
+
+
+def top_n(values: np.ndarray, n: int, ascending: bool = False) -> np.ndarray:
+    """
+    Selecciona las posiciones de los ``n`` valores mayores (o menores) sin ordenar el arreglo completo.
+
+    Se hace una selección parcial con ``argpartition`` (lineal) y solo los ``n`` elegidos se ordenan. A
+    igual valor gana la posición menor, de modo que el resultado es estable entre llamadas.
+
+    :param values: Valores a ordenar.
+    :param n: Número de posiciones a devolver.
+    :param ascending: Si es True se devuelven los menores. Por defecto, los mayores.
+    :return: Posiciones seleccionadas, ordenadas por valor.
+    """
+    keys = values if ascending else -values
+    if n < len(keys):
+        # El umbral es el n-ésimo valor; se incluyen todos los empatados con él para desempatar por posición
+        threshold = keys[np.argpartition(keys, n - 1)[n - 1]]
+        candidates = np.flatnonzero(keys <= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    order = np.lexsort((candidates, keys[candidates]))
+    return candidates[order][:n]
@@ -0,0 +1,283 @@
+import sys
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.infrastructure.data.aggregate_table import MEASURES
+from app.infrastructure.data.dimension_tables import KEY_COLUMNS
+
+DATE_BUCKETS = {'day': 'datetime64[D]', 'month': 'datetime64[M]', 'year': 'datetime64[Y]'}
+# Orden de granularidad: un cubo por día puede agregarse a mes y a año, uno por mes solo a año
+BUCKET_LEVELS = {'day': 0, 'month': 1, 'year': 2}
+FUNCTIONS = ('sum', 'count', 'mean', 'min', 'max')
+
+
+def parse_dimension(spec: str) -> Tuple[str, Optional[str]]:
+    """
+    Interpreta una dimensión: una columna Key* o ``KeyDate:day|month|year``.
+
+    :param spec: Dimensión tal como llega en la petición.
+    :return: Columna y nivel de fecha (None para columnas clave).
+    :raises ValueError: Si la dimensión no es válida.
+    """
+    column, _, bucket = spec.partition(':')
+    if column == 'KeyDate':
+        bucket = bucket or 'day'
+        if bucket not in DATE_BUCKETS:
+            raise ValueError(f"Nivel de fecha no válido: {bucket}. Use day, month o year")
+        return column, bucket
+    if column not in KEY_COLUMNS or bucket:
+        raise ValueError(f"Dimensión no válida: {spec}")
+    return column, None
+
+
+def _with_nulls(codes: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Los nulos (código -1) forman su propio grupo, con etiqueta None al final, en lugar de descartarse: así
+    # un cubo agregado desde otro cubo da lo mismo que calculado desde las filas
+    missing = codes < 0
+    if not missing.any():
+        return codes, labels
+    return np.where(missing, len(labels), codes), np.append(labels.astype(object), None)
+
+
+def _encode(frame: pd.DataFrame, column: str, bucket: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # Devuelve códigos enteros ordenados por etiqueta (los nulos al final) y las etiquetas únicas
+    values = frame[column]
+    if bucket is not None:
+        days = values.to_numpy(dtype='datetime64[ns]').astype(DATE_BUCKETS[bucket])
+        codes, labels = pd.factorize(days, sort=True)
+        return _with_nulls(codes.astype(np.int64), np.asarray(labels).astype(DATE_BUCKETS[bucket]).astype(str))
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = np.asarray(values.cat.categories, dtype=object)
+        order = np.argsort(categories, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        codes = values.cat.codes.to_numpy().astype(np.int64)
+        return _with_nulls(np.where(codes >= 0, rank[np.maximum(codes, 0)], -1), categories[order])
+    codes, labels = pd.factorize(values, sort=True)
+    return _with_nulls(codes.astype(np.int64), np.asarray(labels, dtype=object))
+
+
+def _group(codes: List[np.ndarray], sizes: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    # Combina los códigos de cada dimensión en un único entero (base mixta) y numera los grupos en orden
+    combined = np.zeros(len(codes[0]) if codes else 0, dtype=np.int64)
+    if np.prod([max(size, 1) for size in sizes], dtype=float) < 2 ** 62:
+        for dimension_codes, size in zip(codes, sizes):
+            combined = combined * size + dimension_codes
+        keys, inverse = np.unique(combined, return_inverse=True)
+        return np.column_stack(np.unravel_index(keys, sizes)) if sizes else np.empty((1, 0), np.int64), inverse
+    stacked = np.column_stack(codes)
+    keys, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    return keys, inverse.ravel()
+
+
+class SalesCube:
+    """
+    Agregación de las medidas por una combinación de dimensiones (cubo OLAP materializado).
+
+    Para cada grupo se guardan suma, conteo, mínimo y máximo de todas las medidas, de modo que un cubo
+    puede agregarse de nuevo (roll-up) a cualquier subconjunto de sus dimensiones o a un nivel de fecha
+    más grueso sin volver a recorrer las filas. Las filas sin valor en una dimensión forman su propio grupo,
+    con etiqueta None.
+
+    :param dimensions: Dimensiones del cubo, como (columna, nivel de fecha).
+    :param labels: Etiquetas únicas ordenadas de cada dimensión.
+    :param groups: Códigos de cada grupo por dimensión, en orden de etiquetas.
+    :param stats: Por medida y estadístico (sum, count, min, max), el valor de cada grupo.
+    """
+
+    def __init__(self, dimensions: List[Tuple[str, Optional[str]]], labels: List[np.ndarray], groups: np.ndarray,
+                 stats: Dict[str, Dict[str, np.ndarray]]):
+        self.dimensions = dimensions
+        self.labels = labels
+        self.groups = groups
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes aproximados del cubo: grupos, estadísticos y etiquetas (incluido el texto de las de objetos)."""
+        size = self.groups.nbytes + sum(array.nbytes for values in self.stats.values() for array in values.values())
+        for labels in self.labels:
+            size += labels.nbytes
+            if labels.dtype == object:
+                size += sum(sys.getsizeof(label) for label in labels)
+        return size
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame, dimensions: List[Tuple[str, Optional[str]]]) -> 'SalesCube':
+        """
+        Calcula el cubo recorriendo las filas.
+
+        :param frame: Filas a agregar.
+        :param dimensions: Dimensiones del cubo.
+        :return: Cubo calculado.
+        """
+        encoded = [_encode(frame, column, bucket) for column, bucket in dimensions]
+        codes = [codes for codes, _ in encoded]
+        labels = [labels for _, labels in encoded]
+        groups, inverse = _group(codes, [len(item) for item in labels])
+        measures = {measure: frame[measure].to_numpy(dtype=np.float64) for measure in MEASURES if measure in frame}
+        return cls(dimensions, labels, groups, _reduce(inverse, len(groups), measures))
+
+    def roll_up(self, dimensions: List[Tuple[str, Optional[str]]]) -> 'SalesCube':
+        """
+        Agrega este cubo a un subconjunto de sus dimensiones o a un nivel de fecha más grueso.
+
+        :param dimensions: Dimensiones del cubo resultante; deben poder derivarse de las de este cubo.
+        :return: Cubo agregado.
+        """
+        codes, labels = [], []
+        for column, bucket in dimensions:
+            position = next(i for i, (own, own_bucket) in enumerate(self.dimensions) if own == column)
+            own_labels, own_codes = self.labels[position], self.groups[:, position]
+            if bucket is not None and bucket != self.dimensions[position][1]:
+                coarse = own_labels.astype(DATE_BUCKETS[self.dimensions[position][1]]).astype(DATE_BUCKETS[bucket])
+                mapping, own_labels = pd.factorize(coarse, sort=True)
+                # La etiqueta None del grupo de nulos pasa a NaT y vuelve a quedar como grupo propio
+                mapping, own_labels = _with_nulls(mapping.astype(np.int64),
+                                                  np.asarray(own_labels).astype(DATE_BUCKETS[bucket]).astype(str))
+                own_codes = mapping[own_codes]
+            codes.append(own_codes)
+            labels.append(own_labels)
+        groups, inverse = _group(codes, [len(item) for item in labels])
+        stats = {}
+        for measure, values in self.stats.items():
+            count = np.bincount(inverse, weights=values['count'], minlength=len(groups)).astype(np.int64)
+            stats[measure] = {
+                'sum': np.bincount(inverse, weights=values['sum'], minlength=len(groups)),
+                'count': count,
+                'min': _reduce_at(inverse, len(groups), values['min'], np.fmin),
+                'max': _reduce_at(inverse, len(groups), values['max'], np.fmax),
+            }
+        return SalesCube(dimensions, labels, groups, stats)
+
+    def can_roll_up_to(self, dimensions: List[Tuple[str, Optional[str]]]) -> bool:
+        own = dict(self.dimensions)
+        for column, bucket in dimensions:
+            if column not in own:
+                return False
+            if bucket is not None and (own[column] is None or BUCKET_LEVELS[bucket] < BUCKET_LEVELS[own[column]]):
+                # Una columna sin nivel de fecha no puede agregarse por día, mes o año
+                return False
+        return True
+
+    def rows(self, measures: Sequence[str], functions: Sequence[str], rows: slice = slice(None)) -> List[Dict]:
+        """
+        Devuelve los grupos indicados como diccionarios con las etiquetas y los valores pedidos.
+
+        :param measures: Medidas a incluir.
+        :param functions: Funciones a incluir (sum, count, mean, min, max).
+        :param rows: Rango de grupos a devolver.
+        :return: Lista de filas.
+        """
+        groups = self.groups[rows]
+        columns = {}
+        for position, (column, bucket) in enumerate(self.dimensions):
+            name = f"{column}:{bucket}" if bucket else column
+            columns[name] = self.labels[position][groups[:, position]].tolist()
+        for measure in measures:
+            values = self.stats[measure]
+            for function in functions:
+                if function == 'mean':
+                    result = np.divide(values['sum'][rows], values['count'][rows],
+                                       out=np.full(len(groups), np.nan), where=values['count'][rows] > 0)
+                else:
+                    result = values[function][rows]
+                columns[f"{measure}_{function}"] = [None if value != value else value for value in result.tolist()]
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def _reduce_at(inverse: np.ndarray, size: int, values: np.ndarray, function: np.ufunc) -> np.ndarray:
+    # Mínimo o máximo por grupo ignorando NaN; los grupos sin valores quedan en NaN
+    result = np.full(size, np.nan)
+    function.at(result, inverse, values)
+    return result
+
+
+def _reduce(inverse: np.ndarray, size: int, measures: Dict[str, np.ndarray]) -> Dict[str, Dict[str, np.ndarray]]:
+    stats = {}
+    for measure, values in measures.items():
+        present = ~np.isnan(values)
+        stats[measure] = {
+            'sum': np.bincount(inverse[present], weights=values[present], minlength=size),
+            'count': np.bincount(inverse[present], minlength=size),
+            'min': _reduce_at(inverse, size, values, np.fmin),
+            'max': _reduce_at(inverse, size, values, np.fmax),
+        }
+    return stats
+
+
+class CubeCache:
+    """
+    Cubos ya calculados de una instantánea, limitados por bytes y desalojando los usados hace más tiempo.
+
+    Un cubo pedido se obtiene, por orden de preferencia, del propio caché, agregando un cubo guardado
+    del mismo periodo que contenga sus dimensiones (roll-up) o recorriendo las filas. Los cubos que por sí
+    solos superan el presupuesto (por ejemplo, por KeyTicket y día) se devuelven sin guardarse.
+
+    :param max_bytes: Presupuesto de memoria en bytes. Por defecto, CUBE_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = settings.CUBE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._cubes: 'OrderedDict[Tuple, SalesCube]' = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, frame: pd.DataFrame, dimensions: List[Tuple[str, Optional[str]]],
+            start_date: Optional[date] = None, end_date: Optional[date] = None) -> SalesCube:
+        """
+        Obtiene el cubo de las dimensiones indicadas para el periodo.
+
+        :param frame: Filas de la instantánea.
+        :param dimensions: Dimensiones del cubo.
+        :param start_date: Fecha de inicio, opcional.
+        :param end_date: Fecha de fin, opcional.
+        :return: Cubo de ventas.
+        :raises ValueError: Si alguna dimensión no está disponible en las filas cargadas.
+        """
+        period = (start_date, end_date)
+        key = (period, tuple(dimensions))
+        with self._lock:
+            cube = self._cubes.get(key)
+            if cube is not None:
+                self._cubes.move_to_end(key)
+                return cube
+            # Se prefiere el cubo más pequeño del que se pueda derivar el pedido
+            finer = [cached for (cached_period, _), cached in self._cubes.items()
+                     if cached_period == period and cached.can_roll_up_to(dimensions)]
+        if finer:
+            cube = min(finer, key=len).roll_up(dimensions)
+        else:
+            missing = [column for column, _ in dimensions if column not in frame]
+            if missing:
+                raise ValueError(f"Dimensiones no disponibles en los datos cargados: {missing}")
+            if start_date is not None or end_date is not None:
+                dates = frame['KeyDate'].to_numpy(dtype='datetime64[ns]')
+                mask = np.ones(len(frame), dtype=bool)
+                if start_date is not None:
+                    mask &= dates >= np.datetime64(start_date, 'ns')
+                if end_date is not None:
+                    mask &= dates <= np.datetime64(end_date, 'ns')
+                frame = frame[mask]
+            cube = SalesCube.build(frame, dimensions)
+        size = cube.nbytes
+        if size > self.max_bytes:
+            return cube
+        with self._lock:
+            if key not in self._cubes:
+                self._cubes[key], self._sizes[key] = cube, size
+                self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted, _ = self._cubes.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+        return cube
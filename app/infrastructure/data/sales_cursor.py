@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import hmac
+from datetime import date
+import orjson
+
+from app.core.config import settings
+
+# Bytes de la firma HMAC-SHA256 que se añaden al cursor
+SIGNATURE_BYTES = 16
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    key = (settings.SECRET_KEY or "").encode()
+    return hmac.new(key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+class SalesCursor:
+    """
+    Posición de paginación por clave (keyset) para las consultas de ventas.
+
+    Codifica la última posición devuelta (KeyDate, KeySale), la versión del dataset y el desplazamiento
+    dentro del resultado. Con la misma versión la siguiente página se obtiene con el desplazamiento; si el
+    dataset cambió se busca por valor, de modo que la recarga no desplaza los resultados. El cursor va
+    firmado con SECRET_KEY para que el cliente no pueda fabricar posiciones arbitrarias.
+
+    :param version: Versión del dataset con la que se generó el cursor.
+    :param query: Identificador de la consulta a la que pertenece el cursor.
+    :param last_date: KeyDate (ns desde epoch) de la última venta devuelta.
+    :param last_sale: KeySale de la última venta devuelta.
+    :param offset: Posición de la siguiente venta dentro del resultado.
+    """
+
+    def __init__(self, version: int, query: str, last_date: int, last_sale: str, offset: int):
+        self.version = version
+        self.query = query
+        self.last_date = last_date
+        self.last_sale = last_sale
+        self.offset = offset
+
+    @staticmethod
+    def query_id(key_column: str, key: str, start_date: date, end_date: date) -> str:
+        return f"{key_column}|{key}|{start_date.isoformat()}|{end_date.isoformat()}"
+
+    def encode(self) -> str:
+        payload = orjson.dumps({"v": self.version, "q": self.query, "d": self.last_date, "s": self.last_sale,
+                                "o": self.offset})
+        return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+    @classmethod
+    def decode(cls, token: str, query: str) -> 'SalesCursor':
+        """
+        Decodifica un cursor y comprueba que pertenece a la consulta.
+
+        :param token: Cursor recibido.
+        :param query: Identificador de la consulta actual.
+        :return: Cursor decodificado.
+        :raises ValueError: Si el cursor no es válido, no está firmado por este servidor o es de otra consulta.
+        """
+        try:
+            encoded, signature = token.split(".")
+            payload = _b64decode(encoded)
+            if not hmac.compare_digest(_b64decode(signature), _sign(payload)):
+                raise ValueError("firma no válida")
+            fields = orjson.loads(payload)
+            cursor = cls(int(fields["v"]), str(fields["q"]), int(fields["d"]), str(fields["s"]), int(fields["o"]))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError("Cursor inválido") from e
+        if cursor.offset < 0:
+            raise ValueError("Cursor inválido")
+        if cursor.query != query:
+            raise ValueError("El cursor no corresponde a esta consulta")
+        return cursor
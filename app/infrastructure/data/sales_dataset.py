@@ -0,0 +1,166 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from app.infrastructure.data.aggregate_table import AggregateTable, MEASURES
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.data.prefix_sums import DailyPrefixSums
+from app.infrastructure.data.sales_cube import CubeCache
+from app.infrastructure.data.sales_index import KeyDateIndex
+
+INDEXED_COLUMNS = ('KeyEmployee', 'KeyProduct', 'KeyStore')
+# Columnas mínimas para construir índices y agregados cuando las filas completas permanecen en disco
+SUMMARY_COLUMNS = ('KeyDate',) + INDEXED_COLUMNS + MEASURES
+
+
+def _concat_frames(frame: pd.DataFrame, added: pd.DataFrame) -> pd.DataFrame:
+    # pd.concat convierte a object las categóricas con categorías distintas; se unen para conservarlas
+    columns = {}
+    for column in frame.columns:
+        current, new = frame[column], added[column]
+        if isinstance(current.dtype, pd.CategoricalDtype):
+            if not isinstance(new.dtype, pd.CategoricalDtype):
+                new = new.astype('category')
+            columns[column] = pd.Series(union_categoricals([current, new], ignore_order=True))
+        else:
+            columns[column] = pd.concat([current, new], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+class SalesDataset:
+    """
+    Instantánea inmutable de las ventas junto con las estructuras derivadas que se construyen al cargar.
+
+    :param frame: DataFrame de ventas con KeyDate como datetime64.
+    :param version: Versión de la instantánea.
+    :param dimensions: Tablas de dimensión con las columnas anidadas, si se separaron al cargar.
+    :param source_files: Archivos Parquet de los que se leyeron las filas, si se conocen.
+    """
+
+    def __init__(self, frame: pd.DataFrame, version: int = 1, dimensions: Optional[DimensionTables] = None,
+                 source_files: Optional[List[str]] = None):
+        self.frame = frame
+        self.version = version
+        self.dimensions = dimensions
+        self.source_files = source_files
+        self.indexes: Dict[str, KeyDateIndex] = {
+            column: KeyDateIndex.build(frame[column], frame['KeyDate'], frame.get('KeySale'))
+            for column in INDEXED_COLUMNS
+        }
+        self.aggregates: Dict[str, AggregateTable] = {
+            column: AggregateTable.build(frame, column) for column in INDEXED_COLUMNS
+        }
+        self.prefix_sums: Dict[str, DailyPrefixSums] = {
+            column: DailyPrefixSums.build(frame, column) for column in INDEXED_COLUMNS
+        }
+        self.cubes = CubeCache()
+
+    @classmethod
+    def from_parts(cls, frame: pd.DataFrame, version: int, indexes: Dict[str, KeyDateIndex],
+                   aggregates: Dict[str, AggregateTable], dimensions: Optional[DimensionTables] = None,
+                   prefix_sums: Optional[Dict[str, DailyPrefixSums]] = None,
+                   source_files: Optional[List[str]] = None) -> 'SalesDataset':
+        """
+        Reconstruye una instantánea a partir de estructuras ya calculadas, sin volver a indexar.
+
+        :param frame: DataFrame de ventas.
+        :param version: Versión de la instantánea.
+        :param indexes: Índices por columna clave.
+        :param aggregates: Tablas agregadas por columna clave.
+        :param dimensions: Tablas de dimensión, opcional.
+        :param prefix_sums: Sumas diarias acumuladas por columna clave. Si no se indican, se calculan.
+        :param source_files: Archivos Parquet de los que se leyeron las filas, si se conocen.
+        :return: Instantánea de ventas.
+        """
+        dataset = cls.__new__(cls)
+        dataset.frame, dataset.version, dataset.dimensions = frame, version, dimensions
+        dataset.source_files = source_files
+        dataset.indexes, dataset.aggregates = indexes, aggregates
+        dataset.prefix_sums = prefix_sums if prefix_sums is not None else {
+            column: DailyPrefixSums.build(frame, column) for column in indexes
+        }
+        dataset.cubes = CubeCache()
+        return dataset
+
+    def extend(self, frame: pd.DataFrame, dimensions: Optional[DimensionTables] = None,
+               files: Optional[List[str]] = None) -> 'SalesDataset':
+        """
+        Devuelve la versión siguiente de la instantánea con las filas nuevas añadidas al final.
+
+        Los índices y las tablas agregadas se amplían con las filas nuevas en lugar de recalcularse, y la
+        instantánea actual no se modifica, de modo que las peticiones en curso siguen leyéndola.
+
+        :param frame: Filas nuevas con el mismo esquema que ``self.frame``.
+        :param dimensions: Tablas de dimensión de las filas nuevas, opcional.
+        :param files: Archivos Parquet de los que se leyeron las filas nuevas, opcional.
+        :return: Instantánea nueva.
+        """
+        offset = len(self.frame)
+        indexes = {
+            column: index.extend(frame[column], frame['KeyDate'], frame.get('KeySale'), offset)
+            for column, index in self.indexes.items()
+        }
+        aggregates = {column: table.update(frame) for column, table in self.aggregates.items()}
+        prefix_sums = {column: table.update(frame) for column, table in self.prefix_sums.items()}
+        if self.dimensions is not None and dimensions is not None:
+            dimensions = self.dimensions.merge(dimensions)
+        source_files = self.source_files + list(files) if self.source_files is not None and files is not None \
+            else None
+        return SalesDataset.from_parts(_concat_frames(self.frame, frame), self.version + 1, indexes, aggregates,
+                                       dimensions if dimensions is not None else self.dimensions, prefix_sums,
+                                       source_files)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def lookup(self, column: str, key: str, start_date: date, end_date: date) -> np.ndarray:
+        """
+        Obtiene las posiciones de fila de una clave en un rango de fechas usando el índice de la columna.
+
+        :param column: Columna clave indexada.
+        :param key: Valor de la clave.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :return: Posiciones de fila ordenadas por KeyDate.
+        """
+        return self.indexes[column].lookup(key, start_date, end_date)
+
+    def summary(self, column: str, key: str, start_date: date, end_date: date, measure: str = 'Amount') \
+            -> Tuple[float, int]:
+        """
+        Obtiene la suma y el número de ventas de una clave en un rango de fechas con las sumas acumuladas.
+
+        :param column: Columna clave indexada.
+        :param key: Valor de la clave.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param measure: Medida a sumar. Valor por defecto: Amount.
+        :return: Suma y conteo.
+        """
+        return self.prefix_sums[column].summary(key, start_date, end_date, measure)
+
+    def seek(self, column: str, key: str, start_date: date, end_date: date, after_date: int,
+             after_sale: str) -> np.ndarray:
+        """
+        Obtiene las posiciones de fila de una clave en un rango de fechas posteriores a (after_date, after_sale).
+
+        :param column: Columna clave indexada.
+        :param key: Valor de la clave.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param after_date: KeyDate (ns) de la última venta devuelta.
+        :param after_sale: KeySale de la última venta devuelta.
+        :return: Posiciones de fila ordenadas por KeyDate y KeySale.
+        """
+        return self.indexes[column].seek(key, start_date, end_date, after_date, after_sale)
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """
+        Materializa las filas indicadas.
+
+        :param positions: Posiciones de fila.
+        :return: DataFrame con las filas seleccionadas.
+        """
+        return self.frame.iloc[positions]
@@ -0,0 +1,216 @@
+from datetime import date
+from typing import Dict, Hashable, Optional, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+def to_day_value(value: date) -> np.int64:
+    """Convierte una fecha al mismo entero (ns desde epoch) con el que se almacenan las fechas del índice."""
+    return np.int64(pd.Timestamp(value).normalize().value)
+
+
+def _merge_sorted_keys(current: np.ndarray, added: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Combina dos arreglos de claves únicas ordenadas sin volver a ordenar las existentes.
+
+    :param current: Claves existentes.
+    :param added: Claves nuevas.
+    :return: Claves combinadas y, para cada clave de ``current`` y de ``added``, su código en ellas.
+    """
+    if isinstance(current, pa.Array):
+        current = current.to_numpy(zero_copy_only=False)
+    current, added = current.astype(object, copy=False), added.astype(object, copy=False)
+    at = np.searchsorted(current, added)
+    found = at < len(current)
+    found[found] = current[at[found]] == added[found]
+    new_at = at[~found]
+    if not len(new_at):
+        return current, np.arange(len(current)), at
+    merged = np.insert(current, new_at, added[~found])
+    # Cada clave existente se desplaza tantas posiciones como claves nuevas se insertaron antes que ella
+    current_map = np.arange(len(current)) + np.searchsorted(new_at, np.arange(len(current)), side='right')
+    return merged, current_map, np.searchsorted(merged, added)
+
+
+def _bisect_right(values: pa.Array, target: Hashable) -> int:
+    """
+    Búsqueda binaria sobre un arreglo Arrow ordenado, convirtiendo solo los elementos visitados.
+
+    Equivale a ``bisect.bisect_right(values, target, key=...)``, cuyo argumento ``key`` no existe en Python 3.9.
+
+    :param values: Valores únicos ordenados.
+    :param target: Valor a buscar.
+    :return: Número de valores menores o iguales que ``target``.
+    """
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if target < values[mid].as_py():
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class KeyDateIndex:
+    """
+    Índice secundario de una columna clave ordenado por KeyDate.
+
+    Las posiciones de fila se agrupan en un bloque contiguo por cada clave y, dentro del bloque,
+    se ordenan por fecha (y por la columna de desempate, si existe). Un rango de fechas se resuelve con
+    dos búsquedas binarias y un slice, de modo que el coste de una consulta depende del tamaño del
+    resultado y no del de la tabla.
+
+    :param keys: Claves únicas ordenadas.
+    :param offsets: Inicio de cada bloque en ``positions``; tiene ``len(keys) + 1`` elementos.
+    :param dates: Fechas (int64, ns) ordenadas dentro de cada bloque.
+    :param positions: Posiciones de fila en el DataFrame original.
+    :param ties: Código de la columna de desempate por posición, o None.
+    :param tie_keys: Valores únicos ordenados de la columna de desempate (arreglo numpy o Arrow), o None.
+    """
+
+    def __init__(self, keys: np.ndarray, offsets: np.ndarray, dates: np.ndarray, positions: np.ndarray,
+                 ties: Optional[np.ndarray] = None, tie_keys: Optional[np.ndarray] = None):
+        self.keys = keys
+        self.offsets = offsets
+        self.dates = dates
+        self.positions = positions
+        self.ties = ties
+        self.tie_keys = tie_keys
+        self._codes: Dict[Hashable, int] = {key: code for code, key in enumerate(keys)}
+
+    @classmethod
+    def build(cls, key_column: pd.Series, date_column: pd.Series,
+              tie_column: Optional[pd.Series] = None) -> 'KeyDateIndex':
+        """
+        Construye el índice a partir de la columna clave y la columna de fechas.
+
+        :param key_column: Columna clave (KeyEmployee, KeyProduct, KeyStore...).
+        :param date_column: Columna KeyDate como datetime64.
+        :param tie_column: Columna que desempata filas con la misma fecha (KeySale), opcional.
+        :return: Índice construido.
+        """
+        codes, keys = pd.factorize(key_column, sort=True)
+        dates = date_column.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        ties, tie_keys = None, None
+        if tie_column is not None:
+            ties, tie_keys = pd.factorize(tie_column, sort=True)
+            order = np.lexsort((ties, dates, codes))
+        else:
+            order = np.lexsort((dates, codes))
+        # Las filas sin clave (código -1) quedan al inicio del orden y se descartan
+        order = order[np.searchsorted(codes[order], 0):]
+        counts = np.bincount(codes[order], minlength=len(keys))
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        if ties is not None:
+            ties, tie_keys = ties[order].astype(np.int64), np.asarray(tie_keys, dtype=object)
+        return cls(np.asarray(keys, dtype=object), offsets, dates[order], order.astype(np.int64), ties, tie_keys)
+
+    def extend(self, key_column: pd.Series, date_column: pd.Series, tie_column: Optional[pd.Series] = None,
+               offset: int = 0) -> 'KeyDateIndex':
+        """
+        Devuelve un índice nuevo que incluye filas añadidas al final del DataFrame, sin modificar este.
+
+        Solo se ordenan las filas nuevas; luego se insertan en los bloques existentes buscando su lugar con
+        búsquedas binarias, de modo que a igual (clave, fecha, desempate) las filas anteriores quedan primero.
+        El coste es lineal en el tamaño del índice (copias) más O(d log n) para las d filas nuevas.
+
+        :param key_column: Columna clave de las filas nuevas.
+        :param date_column: Columna KeyDate de las filas nuevas.
+        :param tie_column: Columna de desempate de las filas nuevas, opcional.
+        :param offset: Posición de la primera fila nueva en el DataFrame combinado.
+        :return: Índice combinado.
+        """
+        with_ties = self.ties is not None and tie_column is not None
+        delta = KeyDateIndex.build(key_column, date_column, tie_column if with_ties else None)
+        keys, key_map, delta_key_map = _merge_sorted_keys(self.keys, delta.keys)
+        counts = np.zeros(len(keys), dtype=np.int64)
+        counts[key_map] += np.diff(self.offsets)
+        counts[delta_key_map] += np.diff(delta.offsets)
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        fields = [('code', np.int64), ('date', np.int64)] + ([('tie', np.int64)] if with_ties else [])
+        current = np.empty(len(self.positions), dtype=fields)
+        added = np.empty(len(delta.positions), dtype=fields)
+        current['code'] = np.repeat(key_map, np.diff(self.offsets))
+        added['code'] = np.repeat(delta_key_map, np.diff(delta.offsets))
+        current['date'], added['date'] = self.dates, delta.dates
+        ties, tie_keys = None, None
+        if with_ties:
+            tie_keys, tie_map, delta_tie_map = _merge_sorted_keys(self.tie_keys, delta.tie_keys)
+            current['tie'] = self.ties if len(tie_keys) == len(self.tie_keys) else tie_map[self.ties]
+            added['tie'] = delta_tie_map[delta.ties]
+        # Las filas nuevas ya vienen ordenadas, así que sus puntos de inserción son no decrecientes
+        at = np.searchsorted(current, added, side='right')
+        if with_ties:
+            ties = np.insert(current['tie'], at, added['tie'])
+        return KeyDateIndex(keys, offsets, np.insert(self.dates, at, delta.dates),
+                            np.insert(self.positions, at, delta.positions + offset), ties, tie_keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._codes
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def block(self, key: Hashable) -> slice:
+        """
+        Devuelve el rango de ``positions`` que ocupa una clave.
+
+        :param key: Clave a buscar.
+        :return: Slice del bloque; vacío si la clave no existe.
+        """
+        code = self._codes.get(key)
+        if code is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[code]), int(self.offsets[code + 1]))
+
+    def lookup(self, key: Hashable, start_date: date, end_date: date) -> np.ndarray:
+        """
+        Obtiene las posiciones de fila de una clave en un rango de fechas (ambos extremos incluidos).
+
+        :param key: Clave a buscar.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :return: Posiciones de fila ordenadas por KeyDate.
+        """
+        block = self.block(key)
+        block_dates = self.dates[block]
+        left = block.start + np.searchsorted(block_dates, to_day_value(start_date), side='left')
+        right = block.start + np.searchsorted(block_dates, to_day_value(end_date), side='right')
+        return self.positions[left:right]
+
+    def seek(self, key: Hashable, start_date: date, end_date: date, after_date: int,
+             after_tie: Hashable) -> np.ndarray:
+        """
+        Igual que ``lookup`` pero empezando después de la posición (fecha, desempate) indicada.
+
+        :param key: Clave a buscar.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param after_date: Fecha (int64, ns) de la última fila ya devuelta.
+        :param after_tie: Valor de desempate de la última fila ya devuelta.
+        :return: Posiciones de fila posteriores a la indicada.
+        """
+        block = self.block(key)
+        block_dates = self.dates[block]
+        left = np.searchsorted(block_dates, to_day_value(start_date), side='left')
+        right = np.searchsorted(block_dates, to_day_value(end_date), side='right')
+        same_left = np.searchsorted(block_dates, after_date, side='left')
+        same_right = np.searchsorted(block_dates, after_date, side='right')
+        if self.ties is None:
+            resume = same_right
+        else:
+            # Códigos de desempate mayores que after_tie, exista o no en el dataset actual
+            if isinstance(self.tie_keys, pa.Array):
+                # Valores de desempate mapeados desde el directorio compartido: búsqueda binaria sin convertirlos
+                tie_code = _bisect_right(self.tie_keys, after_tie)
+            else:
+                tie_code = np.searchsorted(self.tie_keys, after_tie, side='right')
+            block_ties = self.ties[block][same_left:same_right]
+            resume = same_left + np.searchsorted(block_ties, tie_code, side='left')
+        left = max(left, resume)
+        return self.positions[block.start + left:block.start + max(left, right)]
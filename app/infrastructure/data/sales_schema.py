@@ -0,0 +1,60 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+
+from app.domain.outputs.sale_output import SaleOutput
+from app.infrastructure.logging_config import logger
+
+SALE_COLUMNS = list(SaleOutput.model_fields)
+STRING_COLUMNS = [name for name, field in SaleOutput.model_fields.items() if field.annotation is str]
+FLOAT_COLUMNS = [name for name, field in SaleOutput.model_fields.items() if field.annotation is float]
+DATE_COLUMNS = [name for name, field in SaleOutput.model_fields.items() if field.annotation is date]
+NESTED_COLUMNS = [name for name, field in SaleOutput.model_fields.items() if field.annotation is dict]
+
+
+def _is_string_array(values) -> bool:
+    # infer_dtype recorre los valores en C; evita un bucle de isinstance en Python por cada fila
+    return pd.api.types.infer_dtype(values, skipna=False) == 'string'
+
+
+def _as_strings(values: pd.Series) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        if categories.dtype == object and _is_string_array(categories):
+            return values
+        return values.cat.rename_categories(categories.astype(str))
+    if values.dtype == object and _is_string_array(values):
+        return values
+    if isinstance(values.dtype, pd.ArrowDtype) and values.dtype.kind == 'U':
+        # Texto respaldado por Arrow (instantánea mapeada en memoria): se deja sin copiar a objetos
+        return values
+    return values.astype(str)
+
+
+def enforce_sale_schema(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ajusta las columnas escalares presentes al esquema de SaleOutput una sola vez, al cargar.
+
+    Las claves quedan como texto, las medidas como float64 y las fechas como datetime64 sin hora, de modo
+    que las páginas se pueden codificar directamente a JSON sin validar cada fila con pydantic. Las filas
+    con algún valor nulo o que no se puede convertir en esas columnas se descartan (y se registra
+    cuántas), para que una fila defectuosa no impida cargar el resto del dataset.
+
+    :param frame: DataFrame de ventas.
+    :return: DataFrame con los tipos del esquema.
+    """
+    columns = [column for column in STRING_COLUMNS + FLOAT_COLUMNS + DATE_COLUMNS if column in frame]
+    frame = frame.copy(deep=False)
+    for column in columns:
+        if column in FLOAT_COLUMNS:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(np.float64, copy=False)
+        elif column in DATE_COLUMNS:
+            frame[column] = pd.to_datetime(frame[column], errors='coerce', format='ISO8601').dt.normalize()
+    invalid = frame[columns].isna().any(axis=1).to_numpy() if columns else np.zeros(len(frame), dtype=bool)
+    if invalid.any():
+        logger.warning(f"Se descartan {int(invalid.sum())} filas de ventas con valores nulos o no válidos")
+        frame = frame[~invalid].reset_index(drop=True)
+    for column in columns:
+        if column in STRING_COLUMNS:
+            frame[column] = _as_strings(frame[column])
+    return frame
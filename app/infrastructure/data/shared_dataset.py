@@ -0,0 +1,230 @@
+import fcntl
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+import orjson
+import pyarrow as pa
+
+from app.infrastructure.data.aggregate_table import AggregateTable
+from app.infrastructure.data.arrow_snapshot import arrow_string_dtype, read_dimension_table, read_snapshot, \
+    source_fingerprint, write_dimension_table, write_table
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.data.prefix_sums import DailyPrefixSums
+from app.infrastructure.data.sales_dataset import SalesDataset
+from app.infrastructure.data.sales_index import KeyDateIndex
+from app.infrastructure.logging_config import logger
+
+MANIFEST = 'manifest.json'
+LOCK = '.lock'
+INDEX_ARRAYS = ('keys', 'offsets', 'dates', 'positions', 'ties', 'tie_keys')
+
+
+def _save_array(path: str, values: np.ndarray):
+    # Los arreglos de objetos (claves de texto) se guardan como Arrow IPC en lugar de texto de ancho fijo, que
+    # ocuparía 4 bytes por carácter de la clave más larga en cada elemento
+    if values.dtype == object:
+        write_table(pa.table({'values': pa.array(values)}), os.path.splitext(path)[0] + '.arrow')
+        return
+    np.save(path, values, allow_pickle=False)
+
+
+class SharedDatasetStore:
+    """
+    Publica la instantánea de ventas en un directorio compartido para que varios procesos la usen a la vez.
+
+    El primer proceso que no encuentra una publicación válida toma un bloqueo de archivo, carga los datos,
+    construye índices y agregados y los escribe: el DataFrame como Arrow IPC y los arreglos de índices y
+    agregados como ``.npy``. El resto de procesos (por ejemplo los workers de uvicorn) los abren con
+    memory-map en modo lectura, de modo que el sistema operativo comparte una sola copia de los datos.
+
+    Una publicación es válida mientras no cambien los archivos Parquet de los que se construyó y estos
+    incluyan todos los que se esperan (por defecto, los que hay en el directorio de origen).
+
+    :param directory: Directorio compartido (idealmente en un tmpfs como /dev/shm).
+    :param source_directory: Directorio de los archivos Parquet de origen.
+    """
+
+    def __init__(self, directory: str, source_directory: str):
+        self.directory = directory
+        self.source_directory = source_directory
+
+    def source_files(self) -> List[str]:
+        if not os.path.isdir(self.source_directory):
+            return []
+        return [os.path.join(self.source_directory, f) for f in os.listdir(self.source_directory)
+                if f.endswith('.parquet')]
+
+    def fingerprint(self, files: Optional[List[str]] = None) -> str:
+        """
+        Huella de los archivos de origen.
+
+        :param files: Archivos a incluir. Por defecto, los que hay ahora en el directorio de origen.
+        :return: Huella hexadecimal, o cadena vacía si falta alguno de los archivos.
+        """
+        try:
+            return source_fingerprint(self.source_files() if files is None else files)
+        except FileNotFoundError:
+            return ''
+
+    @contextmanager
+    def _lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, LOCK), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST), 'rb') as file:
+                return orjson.loads(file.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+
+    def publish(self, dataset: SalesDataset, files: Optional[List[str]] = None) -> str:
+        """
+        Escribe la instantánea en una carpeta nueva y la activa reemplazando el manifiesto de forma atómica.
+
+        :param dataset: Instantánea a publicar.
+        :param files: Archivos Parquet de los que se construyó. Por defecto, los que hay en el directorio de
+            origen, lo que puede incluir archivos que llegaron durante la carga y no se leyeron.
+        :return: Ruta de la carpeta publicada.
+        """
+        files = self.source_files() if files is None else files
+        name = f"sales-{time.time_ns()}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(path)
+        write_table(pa.Table.from_pandas(dataset.frame, preserve_index=False), os.path.join(path, 'frame.arrow'))
+        for column, index in dataset.indexes.items():
+            for field in INDEX_ARRAYS:
+                values = getattr(index, field)
+                if values is not None:
+                    _save_array(os.path.join(path, f"index-{column}-{field}.npy"), values)
+        measures = []
+        for column, table in dataset.aggregates.items():
+            _save_array(os.path.join(path, f"aggregate-{column}-keys.npy"), table.keys)
+            measures = list(table.sums)
+            for measure in measures:
+                _save_array(os.path.join(path, f"aggregate-{column}-sums-{measure}.npy"), table.sums[measure])
+                _save_array(os.path.join(path, f"aggregate-{column}-counts-{measure}.npy"), table.counts[measure])
+        for column, table in dataset.prefix_sums.items():
+            for field in ('keys', 'offsets', 'days'):
+                _save_array(os.path.join(path, f"prefix-{column}-{field}.npy"), getattr(table, field))
+            for measure in table.sums:
+                _save_array(os.path.join(path, f"prefix-{column}-sums-{measure}.npy"), table.sums[measure])
+                _save_array(os.path.join(path, f"prefix-{column}-counts-{measure}.npy"), table.counts[measure])
+        dimensions = {}
+        if dataset.dimensions is not None:
+            for column, (key_column, keys, values) in dataset.dimensions.tables.items():
+                write_dimension_table(keys, values, os.path.join(path, f"dimension-{column}.arrow"))
+                dimensions[column] = key_column
+
+        manifest = {'fingerprint': self.fingerprint(files), 'files': sorted(os.path.basename(f) for f in files),
+                    'path': name, 'version': dataset.version,
+                    'indexes': list(dataset.indexes), 'measures': measures, 'dimensions': dimensions,
+                    'prefix_measures': {column: list(table.sums) for column, table in dataset.prefix_sums.items()}}
+        tmp_manifest = os.path.join(self.directory, f"{MANIFEST}.{os.getpid()}.tmp")
+        with open(tmp_manifest, 'wb') as file:
+            file.write(orjson.dumps(manifest))
+        os.replace(tmp_manifest, os.path.join(self.directory, MANIFEST))
+        # Los procesos que aún mapean publicaciones anteriores conservan sus datos aunque se borren los archivos
+        for stale in os.listdir(self.directory):
+            if stale.startswith('sales-') and stale != name:
+                shutil.rmtree(os.path.join(self.directory, stale), ignore_errors=True)
+        logger.info(f"Instantánea de ventas publicada en {path}")
+        return path
+
+    def attach(self, files: Optional[List[str]] = None) -> Optional[SalesDataset]:
+        """
+        Abre en modo lectura la instantánea publicada, sin copiar los datos.
+
+        :param files: Archivos que la publicación debe incluir. Por defecto, los del directorio de origen.
+        :return: Instantánea de ventas, o None si no hay una publicación válida.
+        """
+        manifest = self._read_manifest()
+        if manifest is None or 'files' not in manifest:
+            return None
+        published = [os.path.join(self.source_directory, f) for f in manifest['files']]
+        expected = {os.path.basename(f) for f in (self.source_files() if files is None else files)}
+        if not expected <= set(manifest['files']) or manifest['fingerprint'] != self.fingerprint(published):
+            return None
+        try:
+            dataset = self._open(os.path.join(self.directory, manifest['path']), manifest)
+            dataset.source_files = published
+            return dataset
+        except FileNotFoundError:
+            # Otro proceso reemplazó la publicación entre la lectura del manifiesto y la apertura
+            return None
+
+    @staticmethod
+    def _open(path: str, manifest: Dict) -> SalesDataset:
+        def load(name: str, optional: bool = False) -> Optional[Union[np.ndarray, pa.Array]]:
+            arrow_file = os.path.join(path, f"{name}.arrow")
+            if os.path.exists(arrow_file):
+                column = read_snapshot(arrow_file).column('values')
+                return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            file = os.path.join(path, f"{name}.npy")
+            if optional and not os.path.exists(file):
+                return None
+            return np.load(file, mmap_mode='r')
+
+        def load_keys(name: str) -> np.ndarray:
+            # Las claves de agregados e índices son pocas y se buscan por diccionario: se pasan a objetos
+            values = load(name)
+            if isinstance(values, pa.Array):
+                return values.to_numpy(zero_copy_only=False).astype(object, copy=False)
+            return values.astype(object)
+
+        frame = read_snapshot(os.path.join(path, 'frame.arrow')).to_pandas(split_blocks=True,
+                                                                           types_mapper=arrow_string_dtype)
+        indexes = {}
+        for column in manifest['indexes']:
+            arrays = {field: load(f"index-{column}-{field}", optional=field in ('ties', 'tie_keys'))
+                      for field in INDEX_ARRAYS}
+            arrays['keys'] = load_keys(f"index-{column}-keys")
+            indexes[column] = KeyDateIndex(**arrays)
+        aggregates = {}
+        for column in manifest['indexes']:
+            sums = {measure: load(f"aggregate-{column}-sums-{measure}") for measure in manifest['measures']}
+            counts = {measure: load(f"aggregate-{column}-counts-{measure}") for measure in manifest['measures']}
+            aggregates[column] = AggregateTable(column, load_keys(f"aggregate-{column}-keys"), sums, counts)
+        # Las publicaciones anteriores a las sumas acumuladas no las incluyen; from_parts las calcula
+        prefix_sums = {} if 'prefix_measures' in manifest else None
+        for column, measures in manifest.get('prefix_measures', {}).items():
+            prefix_sums[column] = DailyPrefixSums(
+                column, load_keys(f"prefix-{column}-keys"), load(f"prefix-{column}-offsets"),
+                load(f"prefix-{column}-days"),
+                {measure: load(f"prefix-{column}-sums-{measure}") for measure in measures},
+                {measure: load(f"prefix-{column}-counts-{measure}") for measure in measures})
+        dimensions = None
+        if manifest['dimensions']:
+            dimensions = DimensionTables({
+                column: read_dimension_table(os.path.join(path, f"dimension-{column}.arrow"), key_column)
+                for column, key_column in manifest['dimensions'].items()})
+        return SalesDataset.from_parts(frame, manifest['version'], indexes, aggregates, dimensions, prefix_sums)
+
+    def attach_or_publish(self, build: Callable[[], SalesDataset],
+                          files: Optional[List[str]] = None) -> SalesDataset:
+        """
+        Abre la instantánea publicada o, si no existe, la construye y la publica un único proceso.
+
+        :param build: Función que carga los datos y construye la instantánea.
+        :param files: Archivos que la publicación debe incluir. Por defecto, los del directorio de origen.
+        :return: Instantánea de ventas respaldada por el directorio compartido.
+        """
+        dataset = self.attach(files)
+        if dataset is not None:
+            return dataset
+        with self._lock():
+            dataset = self.attach(files)
+            if dataset is None:
+                built = build()
+                # La huella se calcula sobre los archivos que se leyeron, no sobre el directorio al publicar
+                self.publish(built, built.source_files)
+                dataset = self.attach(built.source_files if built.source_files is not None else files)
+        return dataset
@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+
+from app.core.config import settings
+from app.infrastructure.profiler import tag_thread
+
+_EXHAUSTED = object()
+
+
+class ExecutorSaturatedError(Exception):
+    """El ejecutor tiene todos sus hilos ocupados y la cola de espera llena."""
+
+
+class BoundedExecutor:
+    """
+    Pool de hilos con nombre y cola de espera acotada para sacar trabajo bloqueante del event loop.
+
+    Cuando hay ``max_workers`` tareas en ejecución y ``max_queue`` en espera, las nuevas se rechazan con
+    ExecutorSaturatedError en lugar de acumularse sin límite.
+
+    :param name: Nombre del ejecutor (prefijo de los hilos y clave de las métricas).
+    :param max_workers: Número de hilos.
+    :param max_queue: Número máximo de tareas en espera.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-executor")
+        self._lock = Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _call(self, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            with tag_thread():
+                return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Ejecuta una función bloqueante en el pool y espera su resultado sin bloquear el event loop.
+
+        :param func: Función a ejecutar.
+        :return: Resultado de la función.
+        :raises ExecutorSaturatedError: Si el pool y su cola están llenos.
+        """
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(f"El ejecutor {self.name} está saturado")
+            self._queued += 1
+        # El hilo recibe el contexto de la petición (por ejemplo la medición de tiempos por fase)
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, partial(self._call, func, *args, **kwargs))
+        future.add_done_callback(self._discard_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _discard_cancelled(self, future: Future):
+        # Una tarea cancelada antes de empezar no pasa por _call y se descuenta aquí de la cola
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def iterate(self, iterator: Iterator) -> AsyncIterator:
+        """
+        Recorre un iterador bloqueante obteniendo cada elemento en el pool.
+
+        :param iterator: Iterador síncrono.
+        :return: Iterador asíncrono con los mismos elementos.
+        """
+        while True:
+            item = await self.run(next, iterator, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            yield item
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Métricas del ejecutor: tareas en cola, en ejecución, completadas y rechazadas.
+
+        :return: Diccionario con las métricas.
+        """
+        with self._lock:
+            return {"max_workers": self.max_workers, "max_queue": self.max_queue, "queued": self._queued,
+                    "running": self._running, "completed": self._completed, "rejected": self._rejected}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# pandas: consultas y agregaciones sobre el dataset; firebase: llamadas bloqueantes al SDK de Firebase;
+# profiler: un único muestreo a la vez, sin cola
+executors: Dict[str, BoundedExecutor] = {
+    "pandas": BoundedExecutor("pandas", settings.EXECUTOR_PANDAS_WORKERS, settings.EXECUTOR_PANDAS_QUEUE),
+    "firebase": BoundedExecutor("firebase", settings.EXECUTOR_FIREBASE_WORKERS, settings.EXECUTOR_FIREBASE_QUEUE),
+    "profiler": BoundedExecutor("profiler", 1, 0),
+}
+
+
+async def run_in_executor(name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Ejecuta una función bloqueante en el ejecutor indicado.
+
+    :param name: Nombre del ejecutor (pandas o firebase).
+    :param func: Función a ejecutar.
+    :return: Resultado de la función.
+    """
+    return await executors[name].run(func, *args, **kwargs)
+
+
+def iterate_in_executor(name: str, iterator: Iterator) -> AsyncIterator:
+    """
+    Recorre un iterador bloqueante en el ejecutor indicado.
+
+    :param name: Nombre del ejecutor.
+    :param iterator: Iterador síncrono.
+    :return: Iterador asíncrono.
+    """
+    return executors[name].iterate(iterator)
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    return {name: executor.stats() for name, executor in executors.items()}
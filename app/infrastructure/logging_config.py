@@ -1,5 +1,103 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Encola los registros para que los escriba el hilo del QueueListener, sin bloquear nunca al que registra.
+
+    Si la cola está llena el registro se descarta y se cuenta, en lugar de esperar a que el disco se ponga
+    al día.
+
+    :param log_queue: Cola acotada compartida con el QueueListener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita los registros de nivel WARNING o superior: cada mensaje distinto pasa una vez por ventana y, como
+    mucho, ``max_per_window`` registros en total por ventana. Al reaparecer tras la ventana, el mensaje
+    indica cuántas repeticiones se suprimieron.
+
+    :param window: Duración de la ventana en segundos.
+    :param max_per_window: Registros permitidos por ventana entre todos los mensajes.
+    :param max_keys: Mensajes distintos que se recuerdan antes de vaciar la tabla.
+    """
+
+    def __init__(self, window: float, max_per_window: int, max_keys: int = 1000):
+        super().__init__()
+        self.window = window
+        self.max_per_window = max_per_window
+        self.max_keys = max_keys
+        self.suppressed = 0
+        self._seen: Dict[Tuple[str, int, str], Tuple[float, int]] = {}
+        self._window_started = monotonic()
+        self._window_count = 0
+        self._lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.window <= 0:
+            return True
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        now = monotonic()
+        with self._lock:
+            if now - self._window_started >= self.window:
+                self._window_started, self._window_count = now, 0
+            first_seen, repeated = self._seen.get(key, (None, 0))
+            if first_seen is not None and now - first_seen < self.window \
+                    or self._window_count >= self.max_per_window:
+                if first_seen is not None:
+                    self._seen[key] = (first_seen, repeated + 1)
+                self.suppressed += 1
+                return False
+            if len(self._seen) >= self.max_keys:
+                self._seen.clear()
+            self._seen[key] = (now, 0)
+            self._window_count += 1
+        if repeated:
+            record.msg, record.args = f"{message} ({repeated} repeticiones suprimidas)", None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return orjson.dumps({'timestamp': self.formatTime(record), 'level': record.levelname,
+                             'logger': record.name, 'message': record.getMessage()}).decode()
+
+
+def redact_token(token: Optional[str]) -> str:
+    """
+    Abrevia un token para los logs: basta con el final para correlacionar sin exponer una credencial válida.
+
+    :param token: Token JWT.
+    :return: Últimos 6 caracteres del token precedidos de "...".
+    """
+    return f"...{token[-6:]}" if token else "<sin token>"
 
 
 def setup_logging():
@@ -11,13 +109,32 @@ def setup_logging():
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
-    logging.basicConfig(level=logging.INFO,
-                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                        handlers=[
-                            logging.FileHandler(log_file),
-                            logging.StreamHandler()
-                        ])
-    return logging.getLogger(__name__)
+    formatter = JsonFormatter() if settings.LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # El disco y la consola se escriben desde el hilo del listener; quien registra solo encola
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = BoundedQueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    queue_handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMIT_WINDOW, settings.LOG_RATE_LIMIT_MAX))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    return logging.getLogger(__name__), queue_handler
+
+
+def log_stats() -> Dict[str, int]:
+    """
+    Contadores del pipeline de logs.
+
+    :return: Registros descartados por cola llena y suprimidos por el límite de frecuencia.
+    """
+    rate_limit = next(f for f in _queue_handler.filters if isinstance(f, RateLimitFilter))
+    return {'dropped': _queue_handler.dropped, 'suppressed': rate_limit.suppressed}
 
 
-logger = setup_logging()
+logger, _queue_handler = setup_logging()
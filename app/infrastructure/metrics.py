@@ -0,0 +1,152 @@
+import bisect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Límites de los buckets en segundos, desde 1 ms hasta 10 s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], bound: Optional[str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if bound is not None:
+        pairs.append(f'le="{bound}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """
+    Histograma acumulativo en formato Prometheus, con una serie por combinación de etiquetas.
+
+    :param name: Nombre de la métrica.
+    :param documentation: Descripción de la métrica.
+    :param labelnames: Nombres de las etiquetas.
+    :param buckets: Límites superiores de los buckets en segundos.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels: str):
+        """
+        Registra una observación.
+
+        :param value: Valor observado (segundos).
+        :param labels: Valores de las etiquetas, en el orden de ``labelnames``.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(tuple(labels), ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in sorted(self._series.items())]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, str(bound))} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, '+Inf')} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def render_values(name: str, documentation: str, kind: str, values: Dict[Tuple[Tuple[str, str], ...], float]) \
+        -> List[str]:
+    """
+    Genera las líneas de un contador o gauge en formato Prometheus.
+
+    :param name: Nombre de la métrica.
+    :param documentation: Descripción de la métrica.
+    :param kind: counter o gauge.
+    :param values: Valor por tupla de pares (etiqueta, valor).
+    :return: Líneas de texto.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in values.items():
+        lines.append(f"{name}{_labels([label for label, _ in labels], [v for _, v in labels])} {value}")
+    return lines
+
+
+class RequestTiming:
+    """
+    Duración acumulada de cada fase de una petición (auth, query, materialize, serialize).
+
+    Las fases pueden registrarse desde los hilos de los ejecutores, que reciben una copia del contexto de
+    la petición y por tanto el mismo objeto.
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def add(self, phase: str, seconds: float):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """
+        Valor de la cabecera Server-Timing, con las duraciones en milisegundos.
+
+        :param total: Duración total de la petición en segundos.
+        :return: Cabecera Server-Timing.
+        """
+        with self._lock:
+            phases = list(self.phases.items())
+        return ', '.join(f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in phases + [('total', total)])
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar('request_timing', default=None)
+
+
+def start_request_timing() -> RequestTiming:
+    """
+    Empieza a medir la petición actual; las fases que se registren en este contexto se acumulan en ella.
+
+    :return: Medición de la petición.
+    """
+    timing = RequestTiming()
+    _current_timing.set(timing)
+    return timing
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Mide el bloque y lo suma a la fase indicada de la petición en curso. Fuera de una petición no hace nada.
+
+    :param phase: Nombre de la fase.
+    """
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, perf_counter() - started)
+
+
+request_duration = Histogram('sales_api_request_duration_seconds', 'Duración de las peticiones HTTP.',
+                             ('route', 'method', 'status'))
+request_phase_duration = Histogram('sales_api_request_phase_seconds', 'Duración de cada fase de las peticiones.',
+                                   ('route', 'phase'))
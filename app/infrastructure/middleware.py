@@ -1,10 +1,16 @@
-from fastapi import FastAPI, Request
+from time import perf_counter
+
+from fastapi import FastAPI, HTTPException, Request
 from jose import JWTError
 from starlette.responses import JSONResponse
 
 from app.api.dependencies import oauth2_scheme
 from app.core.config import settings
+from app.infrastructure.data.load_progress import load_progress
+from app.infrastructure.executors import ExecutorSaturatedError, run_in_executor
 from app.infrastructure.logging_config import logger
+from app.infrastructure.metrics import request_duration, request_phase_duration, start_request_timing, timed
+from app.infrastructure.profiler import set_request_path
 from app.infrastructure.token import validate_token
 
 app = FastAPI()
@@ -17,10 +23,32 @@ def log_and_return_response(status_code: int, message: str):
 
 @app.middleware("http")
 async def add_sale_service_to_request(request: Request, call_next):
+    timing = start_request_timing()
+    set_request_path(request.url.path)
+    response = await _dispatch(request, call_next)
+    total = perf_counter() - timing.started
+    # La ruta se identifica por el endpoint que la atendió para no crear una serie por cada URL
+    endpoint = request.scope.get("endpoint")
+    route = endpoint.__name__ if endpoint is not None else "unmatched"
+    response.headers["Server-Timing"] = timing.server_timing(total)
+    request_duration.observe(total, route, request.method, str(response.status_code))
+    for phase, seconds in timing.phases.items():
+        request_phase_duration.observe(seconds, route, phase)
+    return response
+
+
+async def _dispatch(request: Request, call_next):
     try:
         if request.url.path.startswith("/api/v1/sales"):
+            if not load_progress.ready:
+                # Respuesta inmediata, sin autenticar ni registrar, hasta que el dataset esté cargado
+                return JSONResponse(status_code=503, content={"message": "Sales data is loading",
+                                                              "progress": load_progress.snapshot()},
+                                    headers={"Retry-After": str(load_progress.retry_after())})
             token = await oauth2_scheme(request)
-            validate_token(token)
+            # La verificación puede consultar Firebase si el usuario no está en caché
+            with timed("auth"):
+                await run_in_executor("firebase", validate_token, token)
             request.state.sale_service = settings.ml_models["sale_service"]
         if request.url.path.startswith("/api/v1/users"):
             request.state.user_service = settings.ml_models["user_service"]
@@ -35,6 +63,17 @@ async def add_sale_service_to_request(request: Request, call_next):
         return log_and_return_response(
             401, f"{request.url.path}: Authorization invalid {e}"
         )
+    except ExecutorSaturatedError as e:
+        return log_and_return_response(
+            503, f"{request.url.path}: Service busy {e}"
+        )
+    except HTTPException as e:
+        if e.status_code in (401, 403):
+            return log_and_return_response(
+                e.status_code, f"{request.url.path}: Authorization invalid {e.detail}"
+            )
+        # Cualquier otro error HTTP (404, 400, 503...) se devuelve tal cual, con el formato de FastAPI
+        return JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
     except Exception as e:
         return log_and_return_response(
             500, f"{request.url.path}: Internal server error {e}"
@@ -0,0 +1,95 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import FrameType
+from typing import Dict, Iterator, List, Optional
+
+_request_path: ContextVar[Optional[str]] = ContextVar('request_path', default=None)
+# Ruta de la petición que atiende cada hilo de los ejecutores en este momento, por identificador de hilo
+_thread_paths: Dict[int, str] = {}
+
+
+def set_request_path(path: str):
+    """
+    Asocia la ruta de la petición al contexto actual para que los hilos que la atiendan queden etiquetados.
+
+    :param path: Ruta de la petición.
+    """
+    _request_path.set(path)
+
+
+@contextmanager
+def tag_thread() -> Iterator[None]:
+    """
+    Etiqueta el hilo actual con la ruta de la petición del contexto mientras dura el bloque.
+    """
+    path = _request_path.get()
+    if path is None:
+        yield
+        return
+    ident = threading.get_ident()
+    _thread_paths[ident] = path
+    try:
+        yield
+    finally:
+        _thread_paths.pop(ident, None)
+
+
+def _frame_name(frame: FrameType) -> str:
+    # Sin espacios ni ';', que separan el recuento y los marcos en el formato colapsado
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}".replace(' ', '_').replace(';', ':')
+
+
+def _stack(thread_name: str, frame: Optional[FrameType]) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    # Los hilos de un mismo pool (pandas-executor_0, pandas-executor_1...) se agregan en una sola raíz
+    names.append(re.sub(r'_\d+$', '', thread_name))
+    return ';'.join(reversed(names))
+
+
+def sample_stacks(seconds: float, interval: float, path_prefix: Optional[str] = None) -> Counter:
+    """
+    Muestrea periódicamente las pilas de todos los hilos del proceso.
+
+    Con ``path_prefix`` solo se muestrean los hilos de los ejecutores que estén atendiendo una petición
+    cuya ruta empiece por el prefijo; el event loop, compartido por todas las peticiones, queda fuera.
+
+    :param seconds: Duración del muestreo.
+    :param interval: Segundos entre muestras.
+    :param path_prefix: Prefijo de ruta de las peticiones a muestrear.
+    :return: Número de muestras por pila colapsada.
+    """
+    stacks: Counter = Counter()
+    own = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        paths = dict(_thread_paths)
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if path_prefix is not None and not paths.get(ident, '').startswith(path_prefix):
+                continue
+            stacks[_stack(names.get(ident, str(ident)), frame)] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def collapsed(stacks: Counter) -> str:
+    """
+    Formatea las pilas en formato colapsado (una línea "marco;marco;... recuento"), compatible con
+    flamegraph.pl y speedscope.
+
+    :param stacks: Número de muestras por pila.
+    :return: Informe en texto.
+    """
+    lines: List[str] = [f"{stack} {count}" for stack, count in stacks.most_common()]
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,116 @@
+import sys
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def approximate_size(value: Any, depth: int = 0) -> int:
+    """
+    Estima los bytes que ocupa un resultado recorriendo listas, diccionarios y objetos.
+
+    :param value: Resultado a medir.
+    :param depth: Profundidad actual; a partir de 8 niveles solo se cuenta el objeto.
+    :return: Tamaño aproximado en bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    size = sys.getsizeof(value)
+    if depth >= 8:
+        return size
+    if isinstance(value, dict):
+        return size + sum(approximate_size(k, depth + 1) + approximate_size(v, depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return size + sum(approximate_size(item, depth + 1) for item in value)
+    if hasattr(value, '__dict__'):
+        return size + approximate_size(vars(value), depth + 1)
+    return size
+
+
+class ResultCache:
+    """
+    Caché LRU de resultados limitada por bytes y con deduplicación de cálculos concurrentes.
+
+    A diferencia de ``cached_property`` se comparte entre hilos: si varias peticiones piden la misma
+    clave que aún no está en caché, solo la primera calcula el resultado y las demás esperan ese cálculo.
+    Los resultados que por sí solos superan el presupuesto no se guardan. Los valores devueltos se
+    comparten entre llamadas y no deben modificarse.
+
+    :param max_bytes: Presupuesto de memoria en bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado en caché para la clave o lo calcula una sola vez.
+
+        :param key: Clave normalizada de la consulta (incluida la versión del dataset).
+        :param compute: Función que calcula el resultado.
+        :return: Resultado de la consulta.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self._misses += 1
+            else:
+                self._coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        size = approximate_size(value)
+        with self._lock:
+            del self._inflight[key]
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+                    self._evictions += 1
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contadores de la caché: aciertos, fallos, peticiones agrupadas, expulsiones, entradas y bytes.
+
+        :return: Diccionario con los contadores.
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "coalesced": self._coalesced,
+                    "evictions": self._evictions, "entries": len(self._entries), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes}
@@ -0,0 +1,24 @@
+from typing import Any, Dict, Iterable, Iterator, List
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.infrastructure.metrics import timed
+
+
+def to_ndjson(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """
+    Codifica bloques de registros como JSON delimitado por saltos de línea, un bloque de bytes por bloque.
+
+    :param chunks: Bloques de registros.
+    :return: Iterador de bloques codificados.
+    """
+    for records in chunks:
+        yield b''.join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse que registra la codificación del cuerpo como fase serialize de la petición."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
@@ -1,16 +1,166 @@
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from firebase_admin import auth
 from fastapi import HTTPException
 from app.core.config import settings
 
+UserLookup = Callable[[str], Optional[Any]]
+
+
+def firebase_user_lookup(user_id: str) -> Optional[Any]:
+    """
+    Consulta el usuario en Firebase.
+
+    :param user_id: Identificador (uid) del usuario.
+    :return: Usuario de Firebase, o None si no existe o está deshabilitado.
+    """
+    try:
+        user = auth.get_user(user_id)
+    except auth.UserNotFoundError:
+        return None
+    return None if user.disabled else user
+
+
+class StaticUserLookup:
+    """
+    Búsqueda de usuarios en memoria para pruebas y entornos sin Firebase.
+
+    :param users: Usuarios por uid.
+    """
+
+    def __init__(self, users: Optional[Dict[str, Any]] = None):
+        self.users = dict(users or {})
+        self.calls = 0
+
+    def __call__(self, user_id: str) -> Optional[Any]:
+        self.calls += 1
+        return self.users.get(user_id)
+
+
+class UserCache:
+    """
+    Caché acotada (TTL + LRU) de usuarios resueltos delante de la búsqueda remota.
+
+    Los usuarios inexistentes también se guardan, con un TTL más corto, para que un token de un usuario
+    borrado no consulte Firebase en cada petición. La búsqueda remota se hace fuera del candado.
+
+    :param lookup: Función que resuelve un uid a un usuario o None.
+    :param max_size: Número máximo de usuarios en caché.
+    :param ttl: Segundos que se conserva un usuario encontrado.
+    :param negative_ttl: Segundos que se conserva un usuario no encontrado.
+    """
+
+    def __init__(self, lookup: UserLookup, max_size: int, ttl: float, negative_ttl: float):
+        self.lookup = lookup
+        self._users = TTLCache(maxsize=max_size, ttl=ttl)
+        self._missing = TTLCache(maxsize=max_size, ttl=negative_ttl)
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, user_id: str) -> Optional[Any]:
+        """
+        Obtiene un usuario, consultando la búsqueda remota solo si no está en caché.
+
+        :param user_id: Identificador (uid) del usuario.
+        :return: Usuario, o None si no existe.
+        """
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is not None or user_id in self._missing:
+                self._hits += 1
+                return user
+            self._misses += 1
+        user = self.lookup(user_id)
+        with self._lock:
+            if user is None:
+                self._missing[user_id] = True
+            else:
+                self._users[user_id] = user
+        return user
+
+    def revoke(self, user_id: str):
+        """
+        Olvida un usuario para que la siguiente petición lo vuelva a consultar.
+
+        :param user_id: Identificador (uid) del usuario.
+        """
+        with self._lock:
+            self._users.pop(user_id, None)
+            self._missing.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._missing.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contadores de la caché: aciertos, fallos (consultas remotas) y usuarios en caché.
+
+        :return: Diccionario con los contadores.
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "users": len(self._users),
+                    "missing": len(self._missing)}
+
+
+user_cache = UserCache(firebase_user_lookup, settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL,
+                       settings.USER_CACHE_NEGATIVE_TTL)
+
+
+def set_user_lookup(lookup: UserLookup):
+    """
+    Sustituye la búsqueda de usuarios (por ejemplo por un StaticUserLookup en pruebas) y vacía la caché.
+
+    :param lookup: Nueva función de búsqueda.
+    """
+    user_cache.lookup = lookup
+    user_cache.clear()
+
+
+def revoke_user(user_id: str):
+    """
+    Revoca un usuario en caché, por ejemplo tras deshabilitarlo o borrarlo en Firebase.
+
+    :param user_id: Identificador (uid) del usuario.
+    """
+    user_cache.revoke(user_id)
+
 
 def validate_token(token: str):
+    """
+    Verifica localmente la firma y la expiración del token y resuelve el usuario desde la caché.
+
+    :param token: Token JWT.
+    :return: Usuario del token.
+    :raises HTTPException: 401 si el token no es válido o el usuario no existe.
+    """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise JWTError("Invalid token")
-        user = auth.get_user(user_id)
+        user = user_cache.get(user_id)
+        if user is None:
+            raise JWTError("User not found")
         return user
     except JWTError as e:
-        raise HTTPException(status_code=401, detail=e) from e
+        raise HTTPException(status_code=401, detail=str(e)) from e
+
+
+def validate_admin_token(token: str):
+    """
+    Verifica el token y que su usuario esté entre los administradores configurados (ADMIN_USERS).
+
+    :param token: Token JWT.
+    :return: Usuario del token.
+    :raises HTTPException: 401 si el token no es válido, 403 si el usuario no es administrador.
+    """
+    user = validate_token(token)
+    # La firma ya se verificó en validate_token
+    if jwt.get_unverified_claims(token).get("sub") not in settings.ADMIN_USERS:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return user
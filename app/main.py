@@ -2,8 +2,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.dependencies import get_sale_service, oauth2_scheme, get_user_service
-from app.api.endpoints import sales, user, health
+from app.api.dependencies import get_admin_user, get_sale_service, oauth2_scheme, get_user_service
+from app.api.endpoints import admin, sales, user, health, metrics
+from app.infrastructure.data.load_progress import load_progress, start_background_load
+from app.infrastructure.data.parquet_watcher import ParquetWatcher
 from app.infrastructure.firebase_config import initialize_firebase
 from app.infrastructure.middleware import add_sale_service_to_request
 from app.infrastructure.logging_config import logger
@@ -27,24 +29,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Sin esto el navegador oculta la cabecera de paginación al código del cliente
+    expose_headers=["X-Next-Cursor"],
 )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    watcher = None
+
+    def start_watcher():
+        nonlocal watcher
+        sale_service = settings.ml_models["sale_service"]
+        # Se parte de los archivos que leyó la carga, no del directorio al terminar, para que los que llegaron
+        # durante la carga se detecten como nuevos
+        watcher = ParquetWatcher(settings.DATA_DIRECTORY, sale_service.ingest_files, settings.DATA_WATCH_INTERVAL,
+                                 known=sale_service.get_sales_dataset().source_files).start()
+
     try:
         settings.ml_models["sale_service"] = get_sale_service()
         settings.ml_models["user_service"] = get_user_service()
-        _ = settings.ml_models["sale_service"].get_sales_dataframe()
+        # La carga sigue en segundo plano; /health/ready informa del avance y las rutas de ventas responden
+        # 503 hasta que termine
+        start_background_load(settings.ml_models["sale_service"].get_sales_dataset,
+                              start_watcher if settings.DATA_WATCH_INTERVAL > 0 else None)
         yield
     except FileNotFoundError as e:
         logger.error(f"FileNotFoundError durante ejecución : {e}")
         print(f"FileNotFoundError durante ejecución: {e}")
+        load_progress.fail(e)
         yield
     except Exception as e:
         logger.error(f"Exception durante ejecución: {e}")
         print(f"Exception durante ejecución: {e}")
+        load_progress.fail(e)
         yield
+    finally:
+        if watcher is not None:
+            watcher.stop()
 
 
 app.router.lifespan_context = lifespan
@@ -54,6 +76,8 @@ app.middleware("http")(add_sale_service_to_request)
 app.include_router(sales.router, prefix="/api/v1", tags=["sales"], dependencies=[Depends(oauth2_scheme)])
 app.include_router(user.router, prefix="/api/v1", tags=["users"], dependencies=[Depends(initialize_firebase)])
 app.include_router(health.router, prefix="", tags=["healths"])
+app.include_router(metrics.router, prefix="", tags=["metrics"])
+app.include_router(admin.router, prefix="/api/v1", tags=["admin"], dependencies=[Depends(get_admin_user)])
 
 
 # Iniciar la aplicación
@@ -1,7 +1,9 @@
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
 from datetime import date
+from threading import Lock
+from time import perf_counter
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
 from app.domain.contracts.infrastructures.i_data_frame_manager import IDataFrameManager
 from app.domain.entities.sales.sale import Sale
@@ -9,7 +11,25 @@ from app.domain.contracts.services.i_sale_service import ISaleService
 from app.domain.outputs.employee_sales_output import EmployeeSalesOutput
 from app.domain.outputs.product_sales_output import ProductSalesOutput
 from app.domain.outputs.store_sales_output import StoreSalesOutput
-from app.infrastructure.data.data_loader import cached_property
+from app.infrastructure.data.ranking import top_n
+from app.infrastructure.data.sales_cube import FUNCTIONS, parse_dimension
+from app.infrastructure.data.sales_cursor import SalesCursor
+from app.infrastructure.data.aggregate_table import MEASURES
+from app.infrastructure.data.load_progress import load_progress
+from app.infrastructure.data.sales_dataset import SalesDataset, SUMMARY_COLUMNS
+from app.infrastructure.data.shared_dataset import SharedDatasetStore
+from app.infrastructure.data.sales_index import to_day_value
+from app.infrastructure.data.sales_schema import SALE_COLUMNS, NESTED_COLUMNS, enforce_sale_schema
+from app.infrastructure.metrics import timed
+from app.infrastructure.result_cache import ResultCache
+
+T = TypeVar('T')
+
+# Límites del periodo cuando una consulta no indica fechas (el rango representable en datetime64[ns])
+MIN_DATE = pd.Timestamp.min.ceil('D').date()
+MAX_DATE = pd.Timestamp.max.floor('D').date()
+# Medidas por las que se puede ordenar un ranking; margin es Amount - CostAmount
+RANK_MEASURES = ('Amount', 'Qty', 'margin')
 
 
 class SaleService(ISaleService):
@@ -17,22 +37,139 @@ class SaleService(ISaleService):
     Servicio para gestionar las ventas.
 
     :param data_manager: Instancia de IDataFrameManager para manejar la gestión de datos.
+    :param shared_store: Directorio compartido donde se publica la instantánea para varios procesos, opcional.
+    :param result_cache: Caché de resultados compartida entre peticiones, opcional.
     """
 
-    def __init__(self, data_manager: IDataFrameManager):
+    def __init__(self, data_manager: IDataFrameManager, shared_store: Optional[SharedDatasetStore] = None,
+                 result_cache: Optional[ResultCache] = None):
         self.data_manager = data_manager
+        self.shared_store = shared_store
+        self.result_cache = result_cache
+        self._dataset: Optional[SalesDataset] = None
+        self._dataset_lock = Lock()
+        self._load_seconds: Optional[float] = None
+        self._ingest_lock = Lock()
+
+    def get_sales_dataset(self) -> SalesDataset:
+        """
+        Obtiene la instantánea de ventas con sus índices, construyéndola una sola vez.
+
+        :return: Instantánea de ventas.
+        """
+        if self._dataset is None:
+            with self._dataset_lock:
+                if self._dataset is None:
+                    started = perf_counter()
+                    self._dataset = self._build_sales_dataset()
+                    self._load_seconds = perf_counter() - started
+        return self._dataset
+
+    def dataset_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Datos de la instantánea publicada, sin provocar su carga.
+
+        :return: Versión, filas y segundos de la última carga o ingesta, o None si aún no se ha cargado.
+        """
+        dataset = self._dataset
+        if dataset is None:
+            return None
+        return {"version": dataset.version, "rows": len(dataset), "load_seconds": self._load_seconds}
+
+    def _build_sales_dataset(self) -> SalesDataset:
+        """
+        Construye la instantánea de ventas o, con un directorio compartido, la abre desde él.
+
+        :return: Instantánea de ventas.
+        """
+        def build() -> SalesDataset:
+            load_progress.set_phase('reading')
+            frame = self._load_sales_dataframe()
+            load_progress.set_phase('indexing')
+            return SalesDataset(frame, dimensions=self.data_manager.query_dimensions(),
+                                source_files=self.data_manager.source_files())
+
+        if self.shared_store is None:
+            return build()
+        dataset = self.shared_store.attach_or_publish(build)
+        if not self.data_manager.lazy:
+            # La instantánea ya se lee del directorio compartido: la copia privada con la que se construyó
+            # solo ocuparía memoria
+            self.data_manager.release()
+        return dataset
+
+    def ingest_files(self, paths: List[str]) -> SalesDataset:
+        """
+        Incorpora archivos Parquet nuevos y publica la versión siguiente de la instantánea.
+
+        Solo se leen los archivos nuevos; índices y agregados se amplían de forma incremental. La
+        instantánea nueva se publica reemplazando la referencia, así que las peticiones en curso terminan
+        con la versión anterior y ninguna consulta espera a la ingesta.
+
+        :param paths: Rutas de los archivos nuevos.
+        :return: Instantánea publicada.
+        """
+        with self._ingest_lock:
+            current = self.get_sales_dataset()
+
+            def build() -> SalesDataset:
+                columns = list(SUMMARY_COLUMNS) if self.data_manager.lazy else None
+                frame, dimensions = self.data_manager.ingest(paths, columns)
+                return current.extend(enforce_sale_schema(frame), dimensions, paths)
+
+            started = perf_counter()
+            if self.shared_store is None:
+                self._dataset = build()
+            else:
+                files = current.source_files + list(paths) if current.source_files is not None else None
+                self._dataset = self.shared_store.attach_or_publish(build, files)
+            self._load_seconds = perf_counter() - started
+            return self._dataset
+
+    def _load_sales_dataframe(self) -> pd.DataFrame:
+        """
+        Carga el DataFrame de ventas desde el gestor de datos.
+
+        Trabaja directamente sobre la vista columnar del gestor de datos y aplica el esquema de SaleOutput
+        una sola vez; KeyDate queda como datetime64 para que los filtros por fecha sean vectorizados. Si el
+        gestor es perezoso solo se cargan las columnas necesarias para índices y agregados.
+
+        :return: DataFrame con los datos de ventas.
+        """
+        columns = list(SUMMARY_COLUMNS) if self.data_manager.lazy else None
+        return enforce_sale_schema(self.data_manager.query_frame(columns))
 
-    @cached_property
     def get_sales_dataframe(self) -> pd.DataFrame:
         """
         Obtiene un DataFrame con todas las ventas.
 
         :return: DataFrame con los datos de ventas.
         """
-        sales = self.data_manager.query(Sale)
-        df = pd.DataFrame([sale.__dict__ for sale in tqdm(sales, desc="Cargando datos", unit="registros")])
-        df['KeyDate'] = pd.to_datetime(df['KeyDate']).dt.date
-        return df
+        return self.get_sales_dataset().frame
+
+    def to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Convierte las filas recibidas en diccionarios con el esquema de SaleOutput, rehidratando las
+        columnas anidadas desde las tablas de dimensión.
+
+        Los tipos ya se ajustaron al esquema al cargar, así que los valores se toman columna a columna
+        y los diccionarios se pueden codificar con orjson sin pasar por pydantic.
+
+        :param df: DataFrame con las filas a convertir.
+        :return: Lista de diccionarios.
+        """
+        dimensions = self.get_sales_dataset().dimensions
+        if dimensions is not None:
+            df = dimensions.rehydrate(df)
+        values = []
+        for column in SALE_COLUMNS:
+            if column == 'KeyDate':
+                values.append(df[column].dt.date.tolist())
+            elif column in NESTED_COLUMNS:
+                values.append([{} if value is None else value for value in df[column].tolist()])
+            else:
+                values.append(df[column].tolist())
+        return [dict(zip(SALE_COLUMNS, row)) for row in zip(*values)]
 
     def paginate(self, df: pd.DataFrame, page: int = 1, page_size: int = 10) -> pd.DataFrame:
         """
@@ -43,9 +180,257 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: DataFrame paginado.
         """
+        return df.iloc[self.page_slice(page, page_size)]
+
+    @staticmethod
+    def page_slice(page: int = 1, page_size: int = 10) -> slice:
+        """
+        Calcula el rango de filas de una página.
+
+        :param page: Número de página. Valor por defecto: 1.
+        :param page_size: Tamaño de la página. Valor por defecto: 10.
+        :return: Slice de la página.
+        """
         start = (page - 1) * page_size
-        end = start + page_size
-        return df.iloc[start:end]
+        return slice(start, start + page_size)
+
+    def _scan_sales(self, column: str, key: str, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Empuja el filtro por clave y periodo al escaneo de un gestor perezoso.
+
+        :return: DataFrame con las ventas ordenadas por fecha.
+        """
+        df = enforce_sale_schema(self.data_manager.scan(column, key, start_date, end_date, SALE_COLUMNS))
+        return df.sort_values(['KeyDate', 'KeySale'], kind='stable')
+
+    def get_sales_page(self, key_column: str, key: str, start_date: date, end_date: date, page: int = 1,
+                       page_size: int = 10, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Obtiene una página de ventas por clave y periodo, ordenadas por KeyDate y KeySale.
+
+        Sin cursor se usa la paginación por desplazamiento. Con cursor la página continúa justo después
+        de la última venta devuelta: con la misma versión del dataset se retoma por posición y, si el
+        dataset cambió, con una búsqueda por (KeyDate, KeySale) en el índice.
+
+        :param key_column: Columna clave (KeyEmployee, KeyProduct o KeyStore).
+        :param key: Valor de la clave.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param page: Número de página si no hay cursor. Valor por defecto: 1.
+        :param page_size: Tamaño de la página. Valor por defecto: 10.
+        :param cursor: Cursor devuelto por la página anterior, opcional.
+        :return: Ventas de la página como diccionarios y cursor de la siguiente (None si no hay más).
+        :raises ValueError: Si el cursor no es válido para la consulta.
+        """
+        dataset = self.get_sales_dataset()
+        query = ('sales_page', key_column, key, int(to_day_value(start_date)), int(to_day_value(end_date)), page,
+                 page_size, cursor)
+        return self._cached(dataset, query, lambda: self._get_sales_page(dataset, key_column, key, start_date,
+                                                                          end_date, page, page_size, cursor))
+
+    def _get_sales_page(self, dataset: SalesDataset, key_column: str, key: str, start_date: date, end_date: date,
+                        page: int, page_size: int, cursor: Optional[str]) \
+            -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        if not self.data_manager.lazy:
+            with timed("query"):
+                positions, offset, total = self._page_positions(dataset, key_column, key, start_date, end_date,
+                                                                page, page_size, cursor)
+            with timed("materialize"):
+                records = self.to_records(dataset.take(positions))
+            return records, self._next_cursor(dataset, key_column, key, start_date, end_date, records, offset,
+                                              page_size, total)
+
+        with timed("query"):
+            df = self._scan_sales(key_column, key, start_date, end_date)
+        return self._page_from_frame(dataset, key_column, key, start_date, end_date, df, page, page_size, cursor)
+
+    def _page_from_frame(self, dataset: SalesDataset, key_column: str, key: str, start_date: date, end_date: date,
+                         df: pd.DataFrame, page: int, page_size: int, cursor: Optional[str]) \
+            -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Pagina las ventas de una clave ya escaneadas desde disco y ordenadas por KeyDate y KeySale.
+
+        :return: Ventas de la página como diccionarios y cursor de la siguiente (None si no hay más).
+        :raises ValueError: Si el cursor no es válido para la consulta.
+        """
+        query = SalesCursor.query_id(key_column, key, start_date, end_date)
+        previous = SalesCursor.decode(cursor, query) if cursor else None
+        with timed("query"):
+            offset = (page - 1) * page_size
+            if previous is not None:
+                dates = df['KeyDate'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+                sales = df['KeySale'].to_numpy(dtype=object)
+                after = (dates > previous.last_date) | ((dates == previous.last_date) & (sales > previous.last_sale))
+                df, offset = df[after], 0
+        with timed("materialize"):
+            records = self.to_records(df.iloc[offset:offset + page_size])
+        return records, self._next_cursor(dataset, key_column, key, start_date, end_date, records, offset,
+                                          page_size, len(df))
+
+    @staticmethod
+    def _page_positions(dataset: SalesDataset, key_column: str, key: str, start_date: date, end_date: date,
+                        page: int, page_size: int, cursor: Optional[str]) -> Tuple[np.ndarray, int, int]:
+        """
+        Resuelve con el índice las posiciones de fila de una página.
+
+        Con un cursor de la misma versión del dataset se retoma por posición; si el dataset cambió, con una
+        búsqueda por (KeyDate, KeySale).
+
+        :return: Posiciones de la página, desplazamiento de la página dentro del resultado y total de filas.
+        :raises ValueError: Si el cursor no es válido para la consulta.
+        """
+        query = SalesCursor.query_id(key_column, key, start_date, end_date)
+        previous = SalesCursor.decode(cursor, query) if cursor else None
+        if previous is not None and previous.version == dataset.version:
+            positions, offset = dataset.lookup(key_column, key, start_date, end_date), previous.offset
+        elif previous is not None:
+            positions = dataset.seek(key_column, key, start_date, end_date, previous.last_date, previous.last_sale)
+            offset = 0
+        else:
+            positions, offset = dataset.lookup(key_column, key, start_date, end_date), (page - 1) * page_size
+        return positions[offset:offset + page_size], offset, len(positions)
+
+    @staticmethod
+    def _next_cursor(dataset: SalesDataset, key_column: str, key: str, start_date: date, end_date: date,
+                     records: List[Dict[str, Any]], offset: int, page_size: int, total: int) -> Optional[str]:
+        """
+        Genera el cursor de la página siguiente a partir de la última venta devuelta.
+
+        :return: Cursor codificado, o None si no hay más ventas.
+        """
+        if not records or offset + page_size >= total:
+            return None
+        last = records[-1]
+        return SalesCursor(dataset.version, SalesCursor.query_id(key_column, key, start_date, end_date),
+                           int(to_day_value(last['KeyDate'])), str(last['KeySale']), offset + page_size).encode()
+
+    def get_sales_pages(self, key_column: str, items: List[Tuple[str, Optional[date], Optional[date], Optional[str]]],
+                        page: int = 1, page_size: int = 10) -> List[Dict[str, Any]]:
+        """
+        Obtiene una página de ventas para cada una de varias claves en una sola pasada.
+
+        Cada clave se resuelve con una búsqueda en el índice y las filas de todas las páginas se
+        materializan y convierten juntas. La paginación es independiente por clave: page y page_size se
+        aplican a cada una y cada elemento puede traer el cursor de su página anterior.
+
+        :param key_column: Columna clave (KeyEmployee, KeyProduct o KeyStore).
+        :param items: Tuplas (clave, fecha de inicio, fecha de fin, cursor); sin fechas el periodo no se limita.
+        :param page: Número de página si el elemento no trae cursor. Valor por defecto: 1.
+        :param page_size: Tamaño de la página de cada clave. Valor por defecto: 10.
+        :return: Por cada elemento y en el mismo orden, un diccionario con key, sales y next_cursor.
+        :raises ValueError: Si algún cursor no es válido para su consulta.
+        """
+        dataset = self.get_sales_dataset()
+        items = [(key, start_date or MIN_DATE, end_date or MAX_DATE, cursor)
+                 for key, start_date, end_date, cursor in items]
+        if self.data_manager.lazy:
+            pages = self._get_lazy_sales_pages(dataset, key_column, items, page, page_size)
+            return [{'key': item[0], 'sales': sales, 'next_cursor': next_cursor}
+                    for item, (sales, next_cursor) in zip(items, pages)]
+
+        with timed("query"):
+            resolved = [self._page_positions(dataset, key_column, key, start_date, end_date, page, page_size,
+                                             cursor) for key, start_date, end_date, cursor in items]
+            positions = np.concatenate([item[0] for item in resolved]) if resolved else np.empty(0, dtype=np.int64)
+        with timed("materialize"):
+            records = self.to_records(dataset.take(positions))
+        results, start = [], 0
+        for (key, start_date, end_date, _), (page_positions, offset, total) in zip(items, resolved):
+            sales = records[start:start + len(page_positions)]
+            start += len(page_positions)
+            results.append({'key': key, 'sales': sales,
+                            'next_cursor': self._next_cursor(dataset, key_column, key, start_date, end_date, sales,
+                                                             offset, page_size, total)})
+        return results
+
+    def _get_lazy_sales_pages(self, dataset: SalesDataset, key_column: str,
+                              items: List[Tuple[str, date, date, Optional[str]]], page: int, page_size: int) \
+            -> List[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Resuelve las páginas de un lote con un único escaneo de disco para todas las claves.
+
+        Se leen las filas de todas las claves en el periodo que cubre el lote y se reparten por clave; cada
+        elemento aplica después su propio periodo, página y cursor.
+
+        :return: Por cada elemento, ventas de la página y cursor de la siguiente.
+        """
+        if not items:
+            return []
+        with timed("query"):
+            keys = list(dict.fromkeys(key for key, _, _, _ in items))
+            df = self.data_manager.scan_many(key_column, keys, min(item[1] for item in items),
+                                             max(item[2] for item in items), SALE_COLUMNS)
+            df = enforce_sale_schema(df).sort_values(['KeyDate', 'KeySale'], kind='stable')
+            by_key = {key: frame for key, frame in df.groupby(key_column, observed=True, sort=False)}
+        pages = []
+        for key, start_date, end_date, cursor in items:
+            frame = by_key.get(key, df.iloc[0:0])
+            dates = frame['KeyDate']
+            frame = frame[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))]
+            pages.append(self._page_from_frame(dataset, key_column, key, start_date, end_date, frame, page,
+                                               page_size, cursor))
+        return pages
+
+    def get_sales_summary(self, key_column: str, key: str, start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Obtiene la venta total, promedio y número de ventas de una clave en un periodo.
+
+        El resultado sale de las sumas diarias acumuladas de la instantánea: dos búsquedas binarias y
+        una resta, sin recorrer las ventas del periodo.
+
+        :param key_column: Columna clave (KeyEmployee, KeyProduct o KeyStore).
+        :param key: Valor de la clave.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :return: Diccionario con total_sales, avg_sales (None si no hay ventas) y count.
+        """
+        dataset = self.get_sales_dataset()
+        with timed("query"):
+            total, count = dataset.summary(key_column, key, start_date, end_date)
+        return {'total_sales': total, 'avg_sales': total / count if count else None, 'count': count}
+
+    def _cached(self, dataset: SalesDataset, query: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Resuelve una consulta desde la caché de resultados, si está configurada.
+
+        :param dataset: Instantánea sobre la que se calcula la consulta; su versión forma parte de la clave.
+        :param query: Consulta normalizada.
+        :param compute: Función que calcula el resultado.
+        :return: Resultado de la consulta.
+        """
+        if self.result_cache is None:
+            return compute()
+        return self.result_cache.get_or_compute(query + (dataset.version,), compute)
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Contadores de la caché de resultados.
+
+        :return: Aciertos, fallos, expulsiones y uso de memoria, o None si la caché está deshabilitada.
+        """
+        return self.result_cache.stats() if self.result_cache is not None else None
+
+    def _iter_sales_by_key(self, column: str, key: str, start_date: date, end_date: date, chunk_size: int) \
+            -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre todas las ventas de una clave en un periodo por bloques, sin materializar el resultado completo.
+
+        :param column: Columna clave (KeyEmployee, KeyProduct o KeyStore).
+        :param key: Valor de la clave.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param chunk_size: Número de ventas por bloque.
+        :return: Iterador de bloques de ventas como diccionarios.
+        """
+        if self.data_manager.lazy:
+            df = self._scan_sales(column, key, start_date, end_date)
+            for start in range(0, len(df), chunk_size):
+                yield self.to_records(df.iloc[start:start + chunk_size])
+            return
+        dataset = self.get_sales_dataset()
+        positions = dataset.lookup(column, key, start_date, end_date)
+        for start in range(0, len(positions), chunk_size):
+            yield self.to_records(dataset.take(positions[start:start + chunk_size]))
 
     def get_sales_by_employee(self, key_employee: str, start_date: date, end_date: date, page: int = 1, page_size: int = 10) \
             -> List[Sale]:
@@ -59,10 +444,8 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: Lista de ventas.
         """
-        df = self.get_sales_dataframe()
-        filtered_df = df[(df['KeyEmployee'] == key_employee) & (df['KeyDate'] >= start_date) & (df['KeyDate'] <= end_date)]
-        paginated_df = self.paginate(filtered_df, page, page_size)
-        return [Sale(**item) for item in paginated_df.to_dict(orient='records')]
+        records, _ = self.get_sales_page('KeyEmployee', key_employee, start_date, end_date, page, page_size)
+        return [Sale(**record) for record in records]
 
     def get_sales_by_product(self, key_product: str, start_date: date, end_date: date, page: int = 1, page_size: int = 10) \
             -> List[Sale]:
@@ -76,10 +459,8 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: Lista de ventas.
         """
-        df = self.get_sales_dataframe()
-        filtered_df = df[(df['KeyProduct'] == key_product) & (df['KeyDate'] >= start_date) & (df['KeyDate'] <= end_date)]
-        paginated_df = self.paginate(filtered_df, page, page_size)
-        return [Sale(**item) for item in paginated_df.to_dict(orient='records')]
+        records, _ = self.get_sales_page('KeyProduct', key_product, start_date, end_date, page, page_size)
+        return [Sale(**record) for record in records]
 
     def get_sales_by_store(self, key_store: str, start_date: date, end_date: date, page: int = 1, page_size: int = 10) \
             -> List[Sale]:
@@ -93,10 +474,47 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: Lista de ventas.
         """
-        df = self.get_sales_dataframe()
-        filtered_df = df[(df['KeyStore'] == key_store) & (df['KeyDate'] >= start_date) & (df['KeyDate'] <= end_date)]
-        paginated_df = self.paginate(filtered_df, page, page_size)
-        return [Sale(**item) for item in paginated_df.to_dict(orient='records')]
+        records, _ = self.get_sales_page('KeyStore', key_store, start_date, end_date, page, page_size)
+        return [Sale(**record) for record in records]
+
+    def stream_sales_by_employee(self, key_employee: str, start_date: date, end_date: date, chunk_size: int = 1000) \
+            -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre por bloques todas las ventas de un empleado en un periodo de tiempo.
+
+        :param key_employee: Clave del empleado.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param chunk_size: Número de ventas por bloque. Valor por defecto: 1000.
+        :return: Iterador de bloques de ventas.
+        """
+        return self._iter_sales_by_key('KeyEmployee', key_employee, start_date, end_date, chunk_size)
+
+    def stream_sales_by_product(self, key_product: str, start_date: date, end_date: date, chunk_size: int = 1000) \
+            -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre por bloques todas las ventas de un producto en un periodo de tiempo.
+
+        :param key_product: Clave del producto.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param chunk_size: Número de ventas por bloque. Valor por defecto: 1000.
+        :return: Iterador de bloques de ventas.
+        """
+        return self._iter_sales_by_key('KeyProduct', key_product, start_date, end_date, chunk_size)
+
+    def stream_sales_by_store(self, key_store: str, start_date: date, end_date: date, chunk_size: int = 1000) \
+            -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre por bloques todas las ventas de una tienda en un periodo de tiempo.
+
+        :param key_store: Clave de la tienda.
+        :param start_date: Fecha de inicio.
+        :param end_date: Fecha de fin.
+        :param chunk_size: Número de ventas por bloque. Valor por defecto: 1000.
+        :return: Iterador de bloques de ventas.
+        """
+        return self._iter_sales_by_key('KeyStore', key_store, start_date, end_date, chunk_size)
 
     def get_total_avg_sales_by_store(self, page: int = 1, page_size: int = 10) -> List[StoreSalesOutput]:
         """
@@ -106,11 +524,7 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: Lista de ventas totales y promedio por tienda.
         """
-        df = self.get_sales_dataframe()
-        result = df.groupby("KeyStore").agg(total_sales=pd.NamedAgg(column="Amount", aggfunc="sum"),
-                                            avg_sales=pd.NamedAgg(column="Amount", aggfunc="mean")).reset_index()
-        paginated_result = self.paginate(result, page, page_size).to_dict(orient="records")
-        return [StoreSalesOutput(**item) for item in paginated_result]
+        return self._get_total_avg_sales('KeyStore', StoreSalesOutput, page, page_size)
 
     def get_total_avg_sales_by_product(self, page: int = 1, page_size: int = 10) -> List[ProductSalesOutput]:
         """
@@ -120,11 +534,7 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: Lista de ventas totales y promedio por producto.
         """
-        df = self.get_sales_dataframe()
-        result = df.groupby("KeyProduct").agg(total_sales=pd.NamedAgg(column="Amount", aggfunc="sum"),
-                                              avg_sales=pd.NamedAgg(column="Amount", aggfunc="mean")).reset_index()
-        paginated_result = self.paginate(result, page, page_size).to_dict(orient="records")
-        return [ProductSalesOutput(**item) for item in paginated_result]
+        return self._get_total_avg_sales('KeyProduct', ProductSalesOutput, page, page_size)
 
     def get_total_avg_sales_by_employee(self, page: int = 1, page_size: int = 10) -> List[EmployeeSalesOutput]:
         """
@@ -134,8 +544,141 @@ class SaleService(ISaleService):
         :param page_size: Tamaño de la página. Valor por defecto: 10.
         :return: Lista de ventas totales y promedio por empleado.
         """
-        df = self.get_sales_dataframe()
-        result = df.groupby("KeyEmployee").agg(total_sales=pd.NamedAgg(column="Amount", aggfunc="sum"),
-                                               avg_sales=pd.NamedAgg(column="Amount", aggfunc="mean")).reset_index()
-        paginated_result = self.paginate(result, page, page_size).to_dict(orient="records")
-        return [EmployeeSalesOutput(**item) for item in paginated_result]
+        return self._get_total_avg_sales('KeyEmployee', EmployeeSalesOutput, page, page_size)
+
+    def _get_total_avg_sales(self, column: str, output: Type[T], page: int, page_size: int) -> List[T]:
+        """
+        Obtiene una página de la tabla agregada de una columna clave con el modelo de salida indicado.
+
+        :param column: Columna clave agregada.
+        :param output: Modelo de salida (StoreSalesOutput, ProductSalesOutput o EmployeeSalesOutput).
+        :param page: Número de página.
+        :param page_size: Tamaño de la página.
+        :return: Lista de ventas totales y promedio.
+        """
+        dataset = self.get_sales_dataset()
+
+        def compute() -> List[T]:
+            with timed("query"):
+                table = dataset.aggregates[column]
+                paginated_result = table.page('Amount', self.page_slice(page, page_size)).to_dict(orient="records")
+            with timed("materialize"):
+                return [output(**item) for item in paginated_result]
+
+        return self._cached(dataset, ('total_avg', column, page, page_size), compute)
+
+    def get_sales_cube(self, dimensions: List[str], measures: List[str], functions: List[str],
+                       start_date: Optional[date] = None, end_date: Optional[date] = None, page: int = 1,
+                       page_size: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Agrega las ventas por una combinación de dimensiones y devuelve una página de grupos.
+
+        Los grupos se calculan sobre claves codificadas como enteros y el cubo queda guardado en la
+        instantánea: una consulta posterior con un subconjunto de esas dimensiones, o con un nivel de fecha
+        más grueso, se obtiene agregando el cubo guardado sin recorrer de nuevo las filas.
+
+        :param dimensions: Columnas Key* o ``KeyDate:day|month|year``.
+        :param measures: Medidas a agregar (Amount, Qty, CostAmount, DiscAmount).
+        :param functions: Funciones de agregación (sum, count, mean, min, max).
+        :param start_date: Fecha de inicio, opcional.
+        :param end_date: Fecha de fin, opcional.
+        :param page: Número de página. Valor por defecto: 1.
+        :param page_size: Tamaño de la página. Valor por defecto: 100.
+        :return: Grupos de la página ordenados por dimensiones y número total de grupos.
+        :raises ValueError: Si alguna dimensión, medida o función no es válida.
+        """
+        parsed = [parse_dimension(spec) for spec in dimensions]
+        if not parsed:
+            raise ValueError("Se requiere al menos una dimensión")
+        if len({column for column, _ in parsed}) != len(parsed):
+            raise ValueError("Las dimensiones no pueden repetirse")
+        invalid = [measure for measure in measures if measure not in MEASURES] + \
+                  [function for function in functions if function not in FUNCTIONS]
+        if invalid or not measures or not functions:
+            raise ValueError(f"Medidas o funciones no válidas: {invalid}. Medidas: {list(MEASURES)}; "
+                             f"funciones: {list(FUNCTIONS)}")
+        if start_date is not None and end_date is not None and start_date > end_date:
+            raise ValueError("La fecha de inicio no puede ser posterior a la fecha de fin")
+
+        dataset = self.get_sales_dataset()
+
+        def compute() -> Tuple[List[Dict[str, Any]], int]:
+            with timed("query"):
+                cube = dataset.cubes.get(dataset.frame, parsed, start_date, end_date)
+            with timed("materialize"):
+                return cube.rows(measures, functions, self.page_slice(page, page_size)), len(cube)
+
+        query = ('cube', tuple(parsed), tuple(measures), tuple(functions), start_date, end_date, page, page_size)
+        return self._cached(dataset, query, compute)
+
+    def get_top_sales(self, column: str, measure: str = 'Amount', n: int = 20, ascending: bool = False,
+                      start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      filter_column: Optional[str] = None, filter_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene las claves con mayor (o menor) total de una medida, opcionalmente en un periodo y dentro de
+        otra dimensión (por ejemplo los productos más vendidos de una tienda).
+
+        Sin periodo ni filtro se usan las tablas agregadas de la instantánea; en otro caso, el cubo del
+        periodo por la columna y la dimensión del filtro. Los n primeros se eligen con una selección
+        parcial, sin ordenar todas las claves.
+
+        :param column: Columna clave a ordenar (KeyStore, KeyProduct, KeyEmployee...) o ``KeyDate:day|month|year``.
+        :param measure: Amount, Qty o margin (Amount - CostAmount). Valor por defecto: Amount.
+        :param n: Número de claves a devolver. Valor por defecto: 20.
+        :param ascending: Si es True se devuelven las de menor total.
+        :param start_date: Fecha de inicio, opcional.
+        :param end_date: Fecha de fin, opcional.
+        :param filter_column: Columna Key* o ``KeyDate:day|month|year`` por la que filtrar, opcional.
+        :param filter_key: Valor de la columna de filtro (para fechas, con el formato del nivel: 2023-01-05,
+            2023-01 o 2023); obligatorio si se indica filter_column.
+        :return: Lista de diccionarios con key, value y count, ordenada por value.
+        :raises ValueError: Si la columna, la medida o el filtro no son válidos.
+        """
+        if measure not in RANK_MEASURES:
+            raise ValueError(f"Medida no válida: {measure}. Use una de {list(RANK_MEASURES)}")
+        dimension = parse_dimension(column)
+        filter_dimension = None
+        if filter_column is not None:
+            filter_dimension = parse_dimension(filter_column)
+            if filter_dimension[0] == dimension[0] or filter_key is None:
+                raise ValueError("El filtro requiere una columna distinta de la ordenada y un valor")
+
+        dataset = self.get_sales_dataset()
+
+        def compute() -> List[Dict[str, Any]]:
+            with timed("query"):
+                keys, sums, counts = self._rank_totals(dataset, dimension, start_date, end_date, filter_dimension,
+                                                       filter_key)
+                values = sums['Amount'] - sums['CostAmount'] if measure == 'margin' else sums[measure]
+                selected = top_n(values, n, ascending)
+            with timed("materialize"):
+                return [{'key': keys[i], 'value': float(values[i]), 'count': int(counts[i])} for i in selected]
+
+        query = ('top', dimension, measure, n, ascending, start_date, end_date, filter_dimension, filter_key)
+        return self._cached(dataset, query, compute)
+
+    @staticmethod
+    def _rank_totals(dataset: SalesDataset, dimension: Tuple[str, Optional[str]], start_date: Optional[date],
+                     end_date: Optional[date], filter_dimension: Optional[Tuple[str, Optional[str]]],
+                     filter_key: Optional[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+        """
+        Totales por clave de las medidas de ranking.
+
+        :param dimension: Dimensión ordenada, como la devuelve parse_dimension.
+        :param filter_dimension: Dimensión del filtro, opcional.
+        :return: Claves, suma por medida y número de ventas por clave.
+        """
+        column, bucket = dimension
+        if start_date is None and end_date is None and filter_dimension is None and bucket is None \
+                and column in dataset.aggregates:
+            table = dataset.aggregates[column]
+            return table.keys, table.sums, table.counts['Amount']
+        dimensions = [dimension] if filter_dimension is None else [filter_dimension, dimension]
+        cube = dataset.cubes.get(dataset.frame, dimensions, start_date, end_date)
+        rows = slice(None)
+        if filter_dimension is not None:
+            matches = np.flatnonzero(cube.labels[0] == filter_key)
+            rows = cube.groups[:, 0] == (matches[0] if len(matches) else -1)
+        keys = cube.labels[-1][cube.groups[rows, -1]]
+        sums = {measure: values['sum'][rows] for measure, values in cube.stats.items()}
+        return keys, sums, cube.stats['Amount']['count'][rows]
@@ -9,7 +9,8 @@ from app.domain.inputs.user_login_input import UserLogin
 from app.domain.inputs.user_register_input import UserRegistration
 from fastapi import HTTPException
 from app.core.config import settings
-from app.infrastructure.logging_config import logger
+from app.infrastructure.logging_config import logger, redact_token
+from app.infrastructure.token import user_cache
 
 
 class UserService(IUserService):
@@ -43,16 +44,19 @@ class UserService(IUserService):
             payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
             user_id: str = payload.get("sub")
             if user_id is None:
-                logger.error(f"{token} Invalid token")
+                logger.error(f"{redact_token(token)} Invalid token")
+                raise HTTPException(status_code=401, detail="Invalid token")
+            user = user_cache.get(user_id)
+            if user is None:
+                logger.error(f"{redact_token(token)} User not found")
                 raise HTTPException(status_code=401, detail="Invalid token")
-            user = auth.get_user(user_id)
             return {"uid": user.uid, "email": user.email, "display_name": user.display_name}
         except ExpiredSignatureError:
-            logger.error(f"{token} Token has expired")
+            logger.error(f"{redact_token(token)} Token has expired")
             raise HTTPException(status_code=401, detail="Token has expired")
         except JWTError:
-            logger.error(f"{token} Invalid token")
+            logger.error(f"{redact_token(token)} Invalid token")
             raise HTTPException(status_code=401, detail="Invalid token")
         except Exception:
-            logger.error(f"{token} Invalid token")
+            logger.error(f"{redact_token(token)} Invalid token")
             raise HTTPException(status_code=401, detail="Invalid token")
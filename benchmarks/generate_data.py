@@ -0,0 +1,180 @@
+"""
+Generador de ventas sintéticas en Parquet para los benchmarks.
+
+Uso:
+    python -m benchmarks.generate_data --rows 1M --output data/bench-1m
+"""
+import argparse
+import os
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Cardinalidad de cada clave; no depende del número de filas para que los tamaños sean comparables
+CARDINALITIES = {
+    'KeyStore': 300,
+    'KeyWarehouse': 40,
+    'KeyCustomer': 200_000,
+    'KeyProduct': 30_000,
+    'KeyEmployee': 5_000,
+    'KeyCurrency': 3,
+    'KeyDivision': 12,
+    'KeyCedi': 25,
+}
+# Exponente de la distribución de Zipf: pocas claves concentran la mayoría de las ventas
+SKEW = 1.2
+DAYS = 3 * 365
+START_DATE = np.datetime64('2021-01-01')
+LINES_PER_TICKET = 4
+
+
+def parse_rows(value: str) -> int:
+    """
+    Interpreta un número de filas con sufijo opcional K o M (por ejemplo 1M, 10M, 500K).
+
+    :param value: Número de filas.
+    :return: Número de filas como entero.
+    """
+    value = value.strip().upper()
+    multiplier = {'K': 1_000, 'M': 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip('KM')) * multiplier)
+
+
+def _skewed_codes(rng: np.random.Generator, cardinality: int, size: int, permutation: np.ndarray) -> np.ndarray:
+    # Los rangos de Zipf se permutan para que las claves frecuentes no sean siempre las primeras
+    ranks = (rng.zipf(SKEW, size) - 1) % cardinality
+    return permutation[ranks]
+
+
+def _vocabularies(rng: np.random.Generator) -> Tuple[Dict[str, pa.Array], Dict[str, np.ndarray], np.ndarray]:
+    vocabularies = {column: pa.array([f"{column[3:].upper()}{i:06d}" for i in range(cardinality)])
+                    for column, cardinality in CARDINALITIES.items()}
+    permutations = {column: rng.permutation(cardinality) for column, cardinality in CARDINALITIES.items()}
+    prices = np.round(rng.lognormal(3.0, 1.0, CARDINALITIES['KeyProduct']), 2)
+    return vocabularies, permutations, prices
+
+
+def _dimensions(rng: np.random.Generator, vocabularies: Dict[str, pa.Array]) -> Dict[str, pa.StructArray]:
+    # Un valor anidado por clave, igual para todas sus ventas, como en los datos reales
+    def struct(**fields) -> pa.StructArray:
+        return pa.StructArray.from_arrays(list(fields.values()), list(fields))
+
+    def choice(options, size: int) -> pa.Array:
+        return pa.array(np.asarray(options)[rng.integers(0, len(options), size)])
+
+    cities = ['Bogota', 'Medellin', 'Cali', 'Barranquilla', 'Cartagena', 'Bucaramanga']
+    return {
+        'Stores': struct(KeyStore=vocabularies['KeyStore'], Name=pc.binary_join_element_wise(
+            'Tienda ', vocabularies['KeyStore'], ''), City=choice(cities, CARDINALITIES['KeyStore'])),
+        'Products': struct(KeyProduct=vocabularies['KeyProduct'],
+                           Category=choice([f'CAT{i:02d}' for i in range(40)], CARDINALITIES['KeyProduct']),
+                           Brand=choice([f'BRAND{i:03d}' for i in range(400)], CARDINALITIES['KeyProduct'])),
+        'Customers': struct(KeyCustomer=vocabularies['KeyCustomer'],
+                            Segment=choice(['retail', 'wholesale', 'online'], CARDINALITIES['KeyCustomer']),
+                            City=choice(cities, CARDINALITIES['KeyCustomer'])),
+        'Employees': struct(KeyEmployee=vocabularies['KeyEmployee'],
+                            Role=choice(['cashier', 'seller', 'manager'], CARDINALITIES['KeyEmployee'])),
+        'Divisions': struct(KeyDivision=vocabularies['KeyDivision'],
+                            Name=pc.binary_join_element_wise('Division ', vocabularies['KeyDivision'], '')),
+        'Cedis': struct(KeyCedi=vocabularies['KeyCedi'], City=choice(cities, CARDINALITIES['KeyCedi'])),
+    }
+
+
+def generate_chunks(rows: int, rows_per_file: int = 1_000_000, seed: int = 42) -> Iterator[pa.Table]:
+    """
+    Genera las ventas en tablas Arrow de ``rows_per_file`` filas, de forma reproducible para una semilla.
+
+    Las claves siguen una distribución sesgada (Zipf), cada ticket agrupa varias líneas del mismo día,
+    tienda, cliente y empleado, y las columnas anidadas son estructuras con el mismo valor por clave.
+
+    :param rows: Número total de filas.
+    :param rows_per_file: Filas por tabla (y por archivo).
+    :param seed: Semilla del generador aleatorio.
+    :return: Iterador de tablas Arrow con el esquema de SaleOutput.
+    """
+    rng = np.random.default_rng(seed)
+    vocabularies, permutations, prices = _vocabularies(rng)
+    dimensions = _dimensions(rng, vocabularies)
+    for start in range(0, rows, rows_per_file):
+        size = min(rows_per_file, rows - start)
+        sale_ids = np.arange(start, start + size)
+        tickets = sale_ids // LINES_PER_TICKET
+        # Los atributos del ticket se toman de su primera línea para que todas sus líneas coincidan
+        first_line = np.searchsorted(tickets, tickets)
+        codes = {column: _skewed_codes(rng, cardinality, size, permutations[column])
+                 for column, cardinality in CARDINALITIES.items()}
+        for column in ('KeyStore', 'KeyCustomer', 'KeyEmployee', 'KeyCurrency', 'KeyWarehouse', 'KeyCedi'):
+            codes[column] = codes[column][first_line]
+        days = np.sort(rng.integers(0, DAYS, size))[first_line]
+
+        qty = np.minimum(rng.zipf(2.0, size), 20).astype(np.float64)
+        gross = qty * prices[codes['KeyProduct']]
+        discount = np.round(gross * np.where(rng.random(size) < 0.2, rng.uniform(0.05, 0.3, size), 0.0), 2)
+        amount = np.round(gross - discount, 2)
+        cost = np.round(amount * rng.uniform(0.5, 0.9, size), 2)
+
+        key_sale = pc.binary_join_element_wise('SALE', pa.array(sale_ids).cast(pa.string()), '')
+        key_ticket = pc.binary_join_element_wise('TICKET', pa.array(tickets).cast(pa.string()), '')
+        key_date = pa.array((START_DATE + days).astype('datetime64[D]'), type=pa.date32())
+        columns = {'KeySale': key_sale, 'KeyDate': key_date}
+        for column in ('KeyStore', 'KeyWarehouse', 'KeyCustomer', 'KeyProduct', 'KeyEmployee', 'KeyCurrency',
+                       'KeyDivision'):
+            columns[column] = vocabularies[column].take(pa.array(codes[column]))
+        columns['KeyTicket'] = key_ticket
+        columns['KeyCedi'] = vocabularies['KeyCedi'].take(pa.array(codes['KeyCedi']))
+        columns['TicketId'] = pc.binary_join_element_wise('T-', pa.array(tickets).cast(pa.string()), '')
+        columns.update(Qty=pa.array(qty), Amount=pa.array(amount), CostAmount=pa.array(cost),
+                       DiscAmount=pa.array(discount))
+        columns['Tickets'] = pa.StructArray.from_arrays(
+            [key_ticket, columns['TicketId'], pa.array(np.full(size, LINES_PER_TICKET, dtype=np.int64))],
+            ['KeyTicket', 'TicketId', 'Lines'])
+        for nested, key_column in (('Products', 'KeyProduct'), ('Customers', 'KeyCustomer'),
+                                   ('Employees', 'KeyEmployee'), ('Stores', 'KeyStore'),
+                                   ('Divisions', 'KeyDivision')):
+            columns[nested] = dimensions[nested].take(pa.array(codes[key_column]))
+        date_values = (START_DATE + days).astype('datetime64[D]')
+        columns['Time'] = pa.StructArray.from_arrays(
+            [key_date, pa.array(date_values.astype('datetime64[M]').astype(str)),
+             pa.array(date_values.astype('datetime64[Y]').astype(int) + 1970)],
+            ['KeyDate', 'Month', 'Year'])
+        columns['Cedis'] = dimensions['Cedis'].take(pa.array(codes['KeyCedi']))
+        yield pa.table(columns)
+
+
+def write_dataset(output: str, rows: int, rows_per_file: int = 1_000_000, seed: int = 42) -> Dict[str, int]:
+    """
+    Escribe las ventas sintéticas como archivos Parquet numerados en un directorio.
+
+    :param output: Directorio de salida; se crea si no existe.
+    :param rows: Número total de filas.
+    :param rows_per_file: Filas por archivo.
+    :param seed: Semilla del generador aleatorio.
+    :return: Número de filas, archivos y bytes escritos.
+    """
+    os.makedirs(output, exist_ok=True)
+    files, size = 0, 0
+    for number, table in enumerate(generate_chunks(rows, rows_per_file, seed)):
+        path = os.path.join(output, f"sales-{number:04d}.parquet")
+        pq.write_table(table, path, row_group_size=256 * 1024)
+        files += 1
+        size += os.path.getsize(path)
+    return {'rows': rows, 'files': files, 'bytes': size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera ventas sintéticas en Parquet para los benchmarks")
+    parser.add_argument('--rows', default='1M', help="Número de filas, por ejemplo 1M, 10M o 50M")
+    parser.add_argument('--output', required=True, help="Directorio de salida")
+    parser.add_argument('--rows-per-file', default='1M', help="Filas por archivo Parquet")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+    summary = write_dataset(args.output, parse_rows(args.rows), parse_rows(args.rows_per_file), args.seed)
+    print(f"{summary['rows']} filas en {summary['files']} archivos ({summary['bytes'] / 1024 ** 2:.1f} MB) "
+          f"en {args.output}")
+
+
+if __name__ == '__main__':
+    main()
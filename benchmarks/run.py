@@ -0,0 +1,248 @@
+"""
+Benchmark de carga y latencia de los endpoints de ventas.
+
+Uso:
+    python -m benchmarks.run --data data/bench-1m --output benchmarks/results/1m.json
+    python -m benchmarks.run --data data/bench-1m --baseline benchmarks/results/1m.json
+
+Mide el tiempo de carga del dataset, el pico de memoria (RSS) del proceso y los percentiles de latencia
+de cada endpoint, y escribe el resultado en JSON. Termina con código 1 si algún endpoint respondió con
+error y, con ``--baseline``, si alguna métrica empeora más que la tolerancia respecto a un resultado anterior.
+"""
+import argparse
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow
+
+from app.core.config import settings
+
+# Métricas comparadas con la línea base: menor es mejor en todas
+COMPARED_METRICS = ('p50_ms', 'p99_ms')
+
+
+def peak_rss_mb() -> float:
+    # En Linux ru_maxrss está en KB y en macOS en bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """
+    Resume una lista de latencias en segundos.
+
+    :param samples: Latencias en segundos.
+    :return: Percentiles 50, 90 y 99, media y máximo en milisegundos; None si no hay muestras.
+    """
+    if not samples:
+        return dict.fromkeys(('p50_ms', 'p90_ms', 'p99_ms', 'mean_ms', 'max_ms'))
+    values = np.asarray(samples) * 1000
+    return {'p50_ms': float(np.percentile(values, 50)), 'p90_ms': float(np.percentile(values, 90)),
+            'p99_ms': float(np.percentile(values, 99)), 'mean_ms': float(values.mean()),
+            'max_ms': float(values.max())}
+
+
+def create_sale_service(data: str, backend: str):
+    """
+    Crea el servicio de ventas sobre el directorio de datos con el mismo cableado que la aplicación.
+
+    :param data: Directorio con los archivos Parquet.
+    :param backend: memory (DataFrameManager) o lazy (ParquetDatasetManager).
+    :return: Servicio de ventas.
+    """
+    from cachetools import TTLCache
+    from app.infrastructure.data.data_frame_manager import DataFrameManager
+    from app.infrastructure.data.data_loader import DataLoader
+    from app.infrastructure.data.parquet_dataset_manager import ParquetDatasetManager
+    from app.services.sale_service import SaleService
+
+    if backend == 'lazy':
+        return SaleService(ParquetDatasetManager(data))
+    return SaleService(DataFrameManager(DataLoader(TTLCache(maxsize=settings.MAX_SIZE_CACHE,
+                                                            ttl=settings.TTL_CACHE)), data))
+
+
+def endpoint_cases(dataset, start: str, end: str) -> List[Tuple[str, str, str, Callable[[int], Any]]]:
+    """
+    Peticiones del benchmark. Las claves se reparten entre las más frecuentes y claves al azar del dataset.
+
+    :return: Lista de (nombre, método, ruta, función que construye el cuerpo para la iteración i).
+    """
+    rng = np.random.default_rng(0)
+
+    def keys(column: str) -> np.ndarray:
+        table = dataset.aggregates[column]
+        hot = table.keys[np.argsort(-table.counts['Amount'], kind='stable')[:20]]
+        return np.concatenate([hot, rng.choice(table.keys, 20)])
+
+    stores, products, employees = keys('KeyStore'), keys('KeyProduct'), keys('KeyEmployee')
+    period = {'StartDate': start, 'EndDate': end}
+    return [
+        ('sales_by_employee', 'POST', '/api/v1/sales/employee?page_size=100',
+         lambda i: {'KeyEmployee': employees[i % len(employees)], **period}),
+        ('sales_by_product', 'POST', '/api/v1/sales/product?page_size=100',
+         lambda i: {'KeyProduct': products[i % len(products)], **period}),
+        ('sales_by_store', 'POST', '/api/v1/sales/store?page_size=100',
+         lambda i: {'KeyStore': stores[i % len(stores)], **period}),
+        ('sales_by_store_batch', 'POST', '/api/v1/sales/store/batch?page_size=20',
+         lambda i: {'items': [{'KeyStore': key, **period} for key in np.roll(stores, i)[:20]]}),
+        ('summary_by_product', 'POST', '/api/v1/sales/product/summary',
+         lambda i: {'KeyProduct': products[i % len(products)], **period}),
+        ('total_avg_by_product', 'GET', '/api/v1/sales/product/total_avg?page_size=100', lambda i: None),
+        ('top_products', 'GET', f'/api/v1/sales/product/top?n=20&StartDate={start}&EndDate={end}', lambda i: None),
+        ('cube_store_month', 'POST', '/api/v1/sales/cube?page_size=100',
+         lambda i: {'dimensions': ['KeyStore', 'KeyDate:month'], 'measures': ['Amount', 'Qty'],
+                    'functions': ['sum', 'mean'], **period}),
+    ]
+
+
+def run(data: str, backend: str, requests: int, warmup: int) -> Dict[str, Any]:
+    """
+    Carga el dataset y mide la latencia de cada endpoint con el cliente de pruebas de FastAPI.
+
+    :param data: Directorio con los archivos Parquet.
+    :param backend: memory o lazy.
+    :param requests: Peticiones medidas por endpoint.
+    :param warmup: Peticiones de calentamiento por endpoint, no medidas.
+    :return: Resultado del benchmark.
+    """
+    from fastapi.testclient import TestClient
+    from jose import jwt
+    from app.infrastructure.token import StaticUserLookup, set_user_lookup
+    from app.main import app
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    sale_service = create_sale_service(data, backend)
+    dataset = sale_service.get_sales_dataset()
+    load_seconds = time.perf_counter() - started
+    load = {'seconds': load_seconds, 'rows': len(dataset), 'peak_rss_mb': peak_rss_mb(),
+            'rss_growth_mb': peak_rss_mb() - rss_before}
+
+    dates = dataset.frame['KeyDate']
+    end = dates.max()
+    start = max(dates.min(), end - pd.Timedelta(days=90))
+    cases = endpoint_cases(dataset, start.isoformat(), end.isoformat())
+
+    # La autenticación se resuelve en local: token firmado con la clave de la aplicación y usuario en memoria
+    settings.ml_models['sale_service'] = sale_service
+    set_user_lookup(StaticUserLookup({'benchmark': {'uid': 'benchmark'}}))
+    token = jwt.encode({'sub': 'benchmark', 'exp': datetime.now(timezone.utc) + timedelta(hours=2)},
+                       settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    client = TestClient(app, headers={'Authorization': f'Bearer {token}'})
+
+    endpoints = {}
+    for name, method, path, body in cases:
+        samples, errors = [], 0
+        for i in range(warmup + requests):
+            payload = body(i)
+            request_started = time.perf_counter()
+            response = client.request(method, path, content=orjson.dumps(payload) if payload is not None else None,
+                                      headers={'Content-Type': 'application/json'})
+            elapsed = time.perf_counter() - request_started
+            if response.status_code != 200:
+                errors += 1
+            # Las respuestas con error (401, 422, 503...) suelen ser más rápidas y falsearían los percentiles
+            elif i >= warmup:
+                samples.append(elapsed)
+        endpoints[name] = {**percentiles(samples), 'requests': requests, 'errors': errors}
+        if samples:
+            print(f"{name:24s} p50 {endpoints[name]['p50_ms']:8.2f} ms  p99 {endpoints[name]['p99_ms']:8.2f} ms"
+                  f"  errores {errors}")
+        else:
+            print(f"{name:24s} sin respuestas correctas  errores {errors}")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(), 'commit': git_commit(), 'data': data,
+            'backend': backend, 'python': platform.python_version(), 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'pyarrow': pyarrow.__version__,
+        },
+        'load': load,
+        'endpoints': endpoints,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def endpoint_errors(result: Dict[str, Any]) -> List[str]:
+    """
+    Endpoints que respondieron con algún código distinto de 200.
+
+    :param result: Resultado del benchmark.
+    :return: Descripción de cada endpoint con errores.
+    """
+    return [f"{name}: {metrics['errors']} respuestas con error" for name, metrics in result['endpoints'].items()
+            if metrics.get('errors', 0) > 0]
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compara un resultado con la línea base.
+
+    :param result: Resultado actual.
+    :param baseline: Resultado de referencia.
+    :param tolerance: Empeoramiento relativo permitido (0.2 = 20 %).
+    :return: Descripción de cada endpoint con errores y de cada métrica que empeoró más que la tolerancia.
+    """
+    pairs = [('load.seconds', result['load']['seconds'], baseline['load']['seconds']),
+             ('peak_rss_mb', result['peak_rss_mb'], baseline['peak_rss_mb'])]
+    for name, metrics in result['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if previous is None:
+            continue
+        pairs.extend((f'{name}.{metric}', metrics[metric], previous[metric]) for metric in COMPARED_METRICS)
+    return endpoint_errors(result) + [
+        f"{name}: {current:.2f} frente a {previous:.2f} (+{(current / previous - 1) * 100:.0f} %)"
+        for name, current, previous in pairs
+        if current is not None and previous and current > previous * (1 + tolerance)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga y latencia de los endpoints de ventas")
+    parser.add_argument('--data', required=True, help="Directorio con los archivos Parquet")
+    parser.add_argument('--backend', choices=('memory', 'lazy'), default='memory')
+    parser.add_argument('--requests', type=int, default=200, help="Peticiones medidas por endpoint")
+    parser.add_argument('--warmup', type=int, default=20, help="Peticiones de calentamiento por endpoint")
+    parser.add_argument('--output', help="Archivo JSON donde guardar el resultado")
+    parser.add_argument('--baseline', help="Resultado JSON anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Empeoramiento relativo permitido")
+    args = parser.parse_args()
+
+    result = run(args.data, args.backend, args.requests, args.warmup)
+    print(f"carga {result['load']['seconds']:.2f} s, {result['load']['rows']} filas, "
+          f"pico RSS {result['peak_rss_mb']:.0f} MB")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'wb') as file:
+            file.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    if args.baseline:
+        with open(args.baseline, 'rb') as file:
+            regressions = compare(result, orjson.loads(file.read()), args.tolerance)
+    else:
+        regressions = endpoint_errors(result)
+    for regression in regressions:
+        print(f"REGRESIÓN {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
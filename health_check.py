@@ -4,28 +4,33 @@ import sys
 from dotenv import load_dotenv
 import time
 
-def health_check(url, intentos=3):
-    time.sleep(100)
-    for intento in range(intentos):
+def health_check(url, tiempo_maximo=900, intervalo=10):
+    # Consulta /health/ready hasta que el dataset termine de cargar, en lugar de esperar un tiempo fijo
+    limite = time.monotonic() + tiempo_maximo
+    while time.monotonic() < limite:
+        espera = intervalo
         try:
-            respuesta = requests.get(url)
+            respuesta = requests.get(url, timeout=10)
             if respuesta.status_code == 200:
                 print(f"¡Verificación de servidor activo Link {url}!")
                 return True
-            else:
-                print(f"Fallo en la verificación de salud con el código de estado: {respuesta.status_code}")
+            progreso = respuesta.json()
+            if progreso.get("state") == "failed":
+                print(f"La carga de datos falló: {progreso.get('error')}")
+                return False
+            print(f"Servidor cargando datos ({progreso.get('phase')}): {progreso.get('files_loaded')}/"
+                  f"{progreso.get('files_total')} archivos, {progreso.get('rows')} filas, "
+                  f"ETA {progreso.get('eta_seconds')} s")
+            espera = min(intervalo, int(respuesta.headers.get("Retry-After", intervalo)))
         except Exception as e:
             print(f"Fallo en la verificación de salud con excepción: {e}")
+        time.sleep(espera)
 
-        if intento < intentos - 1:
-            print(f"Reintentando... ({intento + 1}/{intentos})")
-            time.sleep(30)  # Esperar 5 segundos antes de reintentar
-
-    print("Fallo en la verificación de salud después de varios intentos")
+    print("Fallo en la verificación de salud: el servidor no estuvo listo a tiempo")
     return False
 
 if __name__ == "__main__":
     load_dotenv()
-    url = os.getenv("URL_HEALTH") + "/health"
+    url = os.getenv("URL_HEALTH") + "/health/ready"
     if not health_check(url):
         sys.exit(1)
@@ -57,6 +57,9 @@ class MockDataLoader(IDataLoader):
     def load_parquet_files(self, directory: str) -> pd.DataFrame:
         return generate_mock_sales_data()
 
+    def read_files(self, paths):
+        return generate_mock_sales_data(), None
+
 def create_mock_sale_service() -> ISaleService:
     data_loader: IDataLoader = MockDataLoader()
     data_manager: IDataFrameManager = DataFrameManager(data_loader, "")
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.aggregate_table import AggregateTable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestAggregateTable(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'KeyStore': ['store2', 'store1', 'store1'],
+            'Amount': [200.0, 100.0, 150.0],
+            'Qty': [2.0, 1.0, np.nan],
+        })
+        self.table = AggregateTable.build(self.df, 'KeyStore')
+
+    def test_build_matches_groupby(self):
+        expected = self.df.groupby('KeyStore')['Amount'].agg(['sum', 'mean'])
+        page = self.table.page('Amount')
+        self.assertEqual(list(page['KeyStore']), list(expected.index))
+        self.assertEqual(list(page['total_sales']), list(expected['sum']))
+        self.assertEqual(list(page['avg_sales']), list(expected['mean']))
+
+    def test_report_other_measures(self):
+        report = self.table.report('Qty')
+        self.assertEqual(list(report['sum']), [1.0, 2.0])
+        self.assertEqual(list(report['count']), [1, 1])
+        self.assertNotIn('CostAmount', self.table.sums)
+
+    def test_update_is_incremental(self):
+        new_rows = pd.DataFrame({'KeyStore': ['store3', 'store1'], 'Amount': [50.0, 50.0], 'Qty': [1.0, 1.0]})
+        updated = self.table.update(new_rows)
+        expected = AggregateTable.build(pd.concat([self.df, new_rows], ignore_index=True), 'KeyStore')
+        self.assertEqual(list(updated.keys), ['store1', 'store2', 'store3'])
+        for measure in ('Amount', 'Qty'):
+            np.testing.assert_allclose(updated.sums[measure], expected.sums[measure])
+            np.testing.assert_array_equal(updated.counts[measure], expected.counts[measure])
+        self.assertEqual(list(self.table.keys), ['store1', 'store2'])
+
+    def test_page_slice(self):
+        page = self.table.page('Amount', slice(1, 2))
+        self.assertEqual(list(page['KeyStore']), ['store2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,6 +74,15 @@ class TestDataFrameManager(unittest.TestCase):
         self.assertEqual(sales[0].KeySale, 'sale1')
         self.assertEqual(sales[1].KeySale, 'sale2')
 
+    def test_query_frame(self):
+        # La vista columnar devuelve el DataFrame cargado sin construir objetos Sale
+        df_manager: IDataFrameManager = DataFrameManager(self.data_loader, self.test_dir)
+
+        frame = df_manager.query_frame()
+        self.assertIsInstance(frame, pd.DataFrame)
+        self.assertEqual(len(frame), 2)
+        self.assertEqual(list(frame['KeySale']), ['sale1', 'sale2'])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
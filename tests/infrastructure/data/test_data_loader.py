@@ -1,6 +1,8 @@
 import sys
+import tempfile
 import unittest
 import os
+from unittest.mock import patch
 import pandas as pd
 from cachetools import TTLCache
 from pandas.testing import assert_frame_equal
@@ -42,6 +44,64 @@ class TestDataLoader(unittest.TestCase):
         expected_df = pd.concat([self.df1, self.df2], ignore_index=True)
         assert_frame_equal(combined_df, expected_df)
 
+    def test_load_parquet_files_sequential_mode(self):
+        # El modo secuencial debe producir el mismo resultado que el paralelo
+        data_loader = DataLoader(TTLCache(maxsize=1, ttl=360), mode='sequential')
+        combined_df = data_loader.load_parquet_files(self.test_dir)
+        expected_df = pd.concat([self.df1, self.df2], ignore_index=True)
+        assert_frame_equal(combined_df, expected_df)
+
+    def test_load_parquet_files_reject_threshold(self):
+        # Probar que se rechaza la carga, en ambos modos, si el tamaño estimado supera el umbral configurado
+        for mode in ('parallel', 'sequential'):
+            data_loader = DataLoader(TTLCache(maxsize=1, ttl=360), mode=mode, reject_above_mb=0.0001)
+            with patch('app.infrastructure.data.data_loader.pq.read_table', side_effect=AssertionError), \
+                    patch('app.infrastructure.data.data_loader.pd.read_parquet', side_effect=AssertionError):
+                with self.assertRaises(MemoryError):
+                    data_loader.load_parquet_files(self.test_dir)
+
+    def test_load_parquet_files_from_snapshot(self):
+        # La primera carga escribe la instantánea Arrow y la siguiente la mapea sin leer los Parquet
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            first_loader = DataLoader(TTLCache(maxsize=1, ttl=360), snapshot_directory=snapshot_dir)
+            expected_df = first_loader.load_parquet_files(self.test_dir)
+            snapshots = os.listdir(snapshot_dir)
+            self.assertEqual(len(snapshots), 1)
+            self.assertIn('frame.arrow', os.listdir(os.path.join(snapshot_dir, snapshots[0])))
+
+            second_loader = DataLoader(TTLCache(maxsize=1, ttl=360), snapshot_directory=snapshot_dir)
+            with patch('app.infrastructure.data.data_loader.pq.read_table', side_effect=AssertionError):
+                combined_df = second_loader.load_parquet_files(self.test_dir)
+            assert_frame_equal(combined_df, expected_df)
+
+    def test_snapshot_keeps_strings_in_arrow(self):
+        # El texto de la instantánea queda respaldado por el archivo mapeado en lugar de copiarse a objetos
+        with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as snapshot_dir:
+            pd.DataFrame({'TicketId': ['t1', 't2'], 'Amount': [1.0, 2.0]}).to_parquet(
+                os.path.join(data_dir, 'sales.parquet'))
+            DataLoader(TTLCache(maxsize=1, ttl=360), snapshot_directory=snapshot_dir).load_parquet_files(data_dir)
+            loader = DataLoader(TTLCache(maxsize=1, ttl=360), snapshot_directory=snapshot_dir)
+            df = loader.load_parquet_files(data_dir)
+            self.assertIsInstance(df['TicketId'].dtype, pd.ArrowDtype)
+            self.assertEqual(df['TicketId'].tolist(), ['t1', 't2'])
+
+    def test_snapshot_stores_prepared_fact_and_dimensions(self):
+        # El siguiente arranque no vuelve a aplicar el esquema ni a separar las columnas anidadas
+        with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as snapshot_dir:
+            pd.DataFrame({'KeyStore': ['store1', 'store2', 'store1'], 'Amount': ['1.5', '2', 'x'],
+                          'Stores': [{'name': 'Tienda 1'}, {'name': 'Tienda 2'}, {'name': 'Tienda 1'}]}).to_parquet(
+                os.path.join(data_dir, 'sales.parquet'))
+            DataLoader(TTLCache(maxsize=1, ttl=360), snapshot_directory=snapshot_dir).load_parquet_files(data_dir)
+            loader = DataLoader(TTLCache(maxsize=1, ttl=360), snapshot_directory=snapshot_dir)
+            with patch('app.infrastructure.data.data_loader.DimensionTables.split', side_effect=AssertionError), \
+                    patch('app.infrastructure.data.data_loader.enforce_sale_schema', side_effect=AssertionError):
+                df = loader.load_parquet_files(data_dir)
+            self.assertEqual(list(df.columns), ['KeyStore', 'Amount'])
+            self.assertIsInstance(df['KeyStore'].dtype, pd.CategoricalDtype)
+            self.assertEqual(df['Amount'].tolist(), [1.5, 2.0])
+            self.assertEqual(list(loader.get_dimensions().lookup('Stores', df['KeyStore'])),
+                             [{'name': 'Tienda 1'}, {'name': 'Tienda 2'}])
+
     def test_load_parquet_files_no_directory(self):
         # Probar que se lanza una excepción si el directorio no existe
         with self.assertRaises(FileNotFoundError):
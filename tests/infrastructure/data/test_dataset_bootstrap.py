@@ -0,0 +1,173 @@
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from app.infrastructure.data.dataset_bootstrap import DatasetBootstrap, StreamingZipExtractor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class _Unseekable(io.RawIOBase):
+    # zipfile escribe descriptores de datos cuando la salida no admite seek
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def build_zip(frames, descriptors: bool = False, stored: bool = True, names=None) -> bytes:
+    output = _Unseekable() if descriptors else io.BytesIO()
+    names = names or [f'data/sales{index}.parquet' for index in range(len(frames))]
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('data/', b'')
+        archive.writestr('data/README.txt', b'ventas de ejemplo')
+        for index, (frame, name) in enumerate(zip(frames, names)):
+            buffer = io.BytesIO()
+            frame.to_parquet(buffer)
+            compression = zipfile.ZIP_STORED if stored and index % 2 else zipfile.ZIP_DEFLATED
+            archive.writestr(zipfile.ZipInfo(name), buffer.getvalue(), compression)
+    return (output.buffer if descriptors else output).getvalue()
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    # Sirve server.payload admitiendo Range; con server.cut_after corta la primera respuesta a mitad
+    def do_GET(self):
+        payload, server = self.server.payload, self.server
+        server.ranges.append(self.headers.get('Range'))
+        start = int(self.headers['Range'][6:-1]) if self.headers.get('Range') else 0
+        if start >= len(payload):
+            self.send_response(416)
+            self.end_headers()
+            return
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(payload) - 1}/{len(payload)}')
+        self.send_header('Content-Length', str(len(payload) - start))
+        self.end_headers()
+        end = len(payload)
+        if server.cut_after:
+            end, server.cut_after = server.cut_after, None
+        self.wfile.write(payload[start:end])
+
+    def log_message(self, *args):
+        pass
+
+
+class TestStreamingZipExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.frames = [pd.DataFrame({'A': [i, i + 1], 'B': ['x', 'y']}) for i in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_extracts_parquet_members_fed_in_small_chunks(self):
+        for descriptors in (False, True):
+            payload = build_zip(self.frames, descriptors, stored=not descriptors)
+            extractor = StreamingZipExtractor(self.directory)
+            for offset in range(0, len(payload), 7):
+                extractor.feed(payload[offset:offset + 7])
+
+            self.assertEqual([os.path.basename(path) for path in extractor.close()],
+                             ['sales0.parquet', 'sales1.parquet', 'sales2.parquet'])
+            pd.testing.assert_frame_equal(pd.read_parquet(os.path.join(self.directory, 'sales1.parquet')),
+                                          self.frames[1])
+
+    def test_same_name_in_different_folders_is_rejected(self):
+        payload = build_zip(self.frames[:2], names=['2023/sales.parquet', '2024/sales.parquet'])
+        extractor = StreamingZipExtractor(self.directory)
+        with self.assertRaises(ValueError):
+            extractor.feed(payload)
+
+    def test_truncated_zip_is_rejected(self):
+        payload = build_zip(self.frames)
+        extractor = StreamingZipExtractor(self.directory)
+        extractor.feed(payload[:len(payload) // 2])
+        with self.assertRaises(ValueError):
+            extractor.close()
+
+
+class TestDatasetBootstrap(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.directory = os.path.join(self.root, 'data')
+        self.frames = [pd.DataFrame({'A': [i], 'B': ['x']}) for i in range(4)]
+        self.payload = build_zip(self.frames)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+        self.server.payload, self.server.cut_after, self.server.ranges = self.payload, None, []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/data.zip'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root)
+
+    def test_download_extracts_and_renames_atomically(self):
+        sha256 = hashlib.sha256(self.payload).hexdigest()
+
+        files = DatasetBootstrap(self.url, sha256, chunk_size=64).run(self.directory)
+
+        self.assertEqual([os.path.basename(path) for path in files], [f'sales{i}.parquet' for i in range(4)])
+        self.assertEqual(sorted(os.listdir(self.root)), ['data', 'data.zip.lock'])
+
+    def test_interrupted_download_resumes_with_range(self):
+        self.server.cut_after = len(self.payload) // 2
+
+        bootstrap = DatasetBootstrap(self.url, hashlib.sha256(self.payload).hexdigest(), chunk_size=256)
+        files = bootstrap.run(self.directory)
+
+        resumed_at = len(self.payload) // 2 // 256 * 256
+        self.assertEqual(self.server.ranges, [None, f'bytes={resumed_at}-'])
+        pd.testing.assert_frame_equal(pd.read_parquet(files[3]), self.frames[3])
+
+    def test_unstreamable_zip_is_extracted_after_download(self):
+        # Miembros sin comprimir con descriptor de datos: su tamaño no se conoce hasta el final
+        self.server.payload = build_zip(self.frames, descriptors=True)
+
+        files = DatasetBootstrap(self.url).run(self.directory)
+
+        self.assertEqual(len(files), 4)
+        pd.testing.assert_frame_equal(pd.read_parquet(files[1]), self.frames[1])
+
+    def test_unstreamable_zip_with_same_name_is_rejected(self):
+        self.server.payload = build_zip(self.frames[:2], descriptors=True,
+                                        names=['2023/sales.parquet', '2024/sales.parquet'])
+
+        with self.assertRaises(ValueError):
+            DatasetBootstrap(self.url).run(self.directory)
+
+        self.assertEqual(os.listdir(self.root), ['data.zip.lock'])
+
+    def test_checksum_mismatch_leaves_no_directory(self):
+        with self.assertRaises(ValueError):
+            DatasetBootstrap(self.url, '0' * 64).run(self.directory)
+
+        self.assertEqual(os.listdir(self.root), ['data.zip.lock'])
+
+    def test_existing_directory_skips_download(self):
+        os.makedirs(self.directory)
+        self.frames[0].to_parquet(os.path.join(self.directory, 'local.parquet'))
+
+        DatasetBootstrap(self.url).run(self.directory)
+
+        self.assertEqual(self.server.ranges, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from app.infrastructure.data.deferred_data_frame_manager import DeferredDataFrameManager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestDeferredDataFrameManager(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = MagicMock()
+        self.factory = MagicMock(return_value=self.manager)
+        self.reader = MagicMock(return_value=(pd.DataFrame({'KeySale': ['sale1']}), None))
+        self.deferred = DeferredDataFrameManager(self.factory, reader=self.reader)
+
+    def test_ingest_reads_only_new_files_without_creating_manager(self):
+        frame, _ = self.deferred.ingest(['new.parquet'], ['KeySale'])
+        self.assertEqual(list(frame['KeySale']), ['sale1'])
+        self.reader.assert_called_once_with(['new.parquet'], ['KeySale'])
+        self.factory.assert_not_called()
+
+    def test_ingest_uses_manager_once_created(self):
+        self.deferred.query_frame()
+        self.deferred.ingest(['new.parquet'])
+        self.manager.ingest.assert_called_once_with(['new.parquet'], None)
+        self.reader.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
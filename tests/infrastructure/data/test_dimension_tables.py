@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+
+from app.infrastructure.data.dimension_tables import DimensionTables
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestDimensionTables(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'KeySale': ['sale1', 'sale2', 'sale3'],
+            'KeyDate': [date(2023, 1, 1), date(2023, 1, 2), date(2023, 1, 1)],
+            'KeyStore': ['store1', 'store2', 'store1'],
+            'Amount': [100.0, 200.0, 150.0],
+            'Stores': [{'name': 'Tienda 1'}, {'name': 'Tienda 2'}, {'name': 'Tienda 1'}],
+            'Time': [{'day': 1}, {'day': 2}, {'day': 1}],
+        })
+        self.fact, self.dimensions = DimensionTables.split(self.df)
+
+    def test_split_removes_nested_columns_and_encodes_keys(self):
+        self.assertEqual(list(self.fact.columns), ['KeySale', 'KeyDate', 'KeyStore', 'Amount'])
+        self.assertIsInstance(self.fact['KeyStore'].dtype, pd.CategoricalDtype)
+        self.assertIn('Stores', self.dimensions)
+        self.assertEqual(len(self.dimensions.tables['Stores'][1]), 2)
+        self.assertIn('Stores', self.df)
+
+    def test_rehydrate_page(self):
+        page = self.fact.iloc[[2, 1]]
+        page = page.assign(KeyDate=pd.to_datetime(page['KeyDate']))
+        rehydrated = self.dimensions.rehydrate(page)
+        self.assertEqual(list(rehydrated['Stores']), [{'name': 'Tienda 1'}, {'name': 'Tienda 2'}])
+        self.assertEqual(list(rehydrated['Time']), [{'day': 1}, {'day': 2}])
+
+    def test_lookup_unknown_key(self):
+        values = self.dimensions.lookup('Stores', pd.Series(['store9']))
+        self.assertIsNone(values[0])
+
+    def test_merge_keeps_arrow_values_and_adds_new_keys(self):
+        key_column, keys, values = self.dimensions.tables['Stores']
+        arrow = DimensionTables({'Stores': (key_column, keys, pa.array(list(values)))})
+        added = pd.DataFrame({'KeyStore': ['store1', 'store3'],
+                              'Stores': [{'name': 'Otra'}, {'name': 'Tienda 3'}]})
+        _, other = DimensionTables.split(added)
+        merged = arrow.merge(other)
+        self.assertIsInstance(merged.tables['Stores'][2], pa.ChunkedArray)
+        self.assertEqual(list(merged.lookup('Stores', pd.Series(['store1', 'store3']))),
+                         [{'name': 'Tienda 1'}, {'name': 'Tienda 3'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
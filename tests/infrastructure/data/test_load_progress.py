@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import unittest
+from threading import Event
+
+from fastapi.testclient import TestClient
+
+from app.infrastructure.data.load_progress import LoadProgress, load_progress, start_background_load
+from app.main import app
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestLoadProgress(unittest.TestCase):
+
+    def test_progress_and_eta(self):
+        progress = LoadProgress()
+        self.assertTrue(progress.ready)
+        progress.start()
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name in ('a.parquet', 'b.parquet'):
+                paths.append(os.path.join(directory, name))
+                with open(paths[-1], 'wb') as file:
+                    file.write(b'x' * 100)
+            progress.add_files(paths)
+        progress.file_done(100, 10)
+
+        snapshot = progress.snapshot()
+        self.assertFalse(progress.ready)
+        self.assertEqual((snapshot['files_loaded'], snapshot['files_total']), (1, 2))
+        self.assertEqual((snapshot['bytes_loaded'], snapshot['bytes_total'], snapshot['rows']), (100, 200, 10))
+        self.assertIsNotNone(snapshot['eta_seconds'])
+        self.assertGreaterEqual(progress.retry_after(), 1)
+
+    def test_background_load_reports_failure(self):
+        progress = LoadProgress()
+
+        def load():
+            raise FileNotFoundError("sin datos")
+
+        start_background_load(load, progress=progress).join()
+
+        self.assertEqual(progress.state, 'failed')
+        self.assertEqual(progress.snapshot()['error'], "sin datos")
+
+    def test_background_load_runs_on_ready(self):
+        progress, ready = LoadProgress(), Event()
+
+        start_background_load(lambda: [1, 2, 3], ready.set, progress).join()
+
+        self.assertTrue(progress.ready)
+        self.assertEqual(progress.rows, 3)
+        self.assertTrue(ready.is_set())
+
+
+class TestReadiness(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        load_progress.reset()
+
+    def test_sales_routes_fail_fast_until_ready(self):
+        load_progress.start()
+
+        response = self.client.post("/api/v1/sales/store", json={"KeyStore": "store1"})
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+        self.assertEqual(self.client.get("/health/ready").status_code, 503)
+        self.assertEqual(self.client.get("/health/live").status_code, 200)
+
+        load_progress.finish(rows=3)
+        ready = self.client.get("/health/ready")
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(ready.json()['rows'], 3)
+
+    def test_failed_load_fails_liveness(self):
+        load_progress.start()
+        load_progress.fail(FileNotFoundError("sin datos"))
+
+        self.assertEqual(self.client.get("/health/live").status_code, 503)
+        self.assertEqual(self.client.get("/health/ready").json()['error'], "sin datos")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.infrastructure.data.parquet_dataset_manager import ParquetDatasetManager
+from app.services.sale_service import SaleService
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+def generate_sales_data():
+    keys = ['sale1', 'sale2', 'sale3', 'sale4']
+    return pd.DataFrame({
+        'KeySale': keys,
+        'KeyDate': [date(2023, 1, 1), date(2023, 1, 2), date(2023, 1, 3), date(2023, 2, 1)],
+        'KeyStore': ['store1', 'store2', 'store1', 'store1'],
+        'KeyWarehouse': ['warehouse1'] * 4,
+        'KeyCustomer': ['customer1'] * 4,
+        'KeyProduct': ['product1', 'product2', 'product1', 'product2'],
+        'KeyEmployee': ['employee1', 'employee2', 'employee1', 'employee1'],
+        'KeyCurrency': ['currency1'] * 4,
+        'KeyDivision': ['division1'] * 4,
+        'KeyTicket': ['ticket1', 'ticket2', 'ticket3', 'ticket4'],
+        'KeyCedi': ['cedi1'] * 4,
+        'TicketId': ['ticketid1', 'ticketid2', 'ticketid3', 'ticketid4'],
+        'Qty': [1.0, 2.0, 1.0, 3.0],
+        'Amount': [100.0, 200.0, 150.0, 50.0],
+        'CostAmount': [50.0, 150.0, 75.0, 25.0],
+        'DiscAmount': [5.0, 10.0, 7.5, 0.0],
+        'Tickets': [{'example_key': key} for key in keys],
+        'Products': [{'example_key': key} for key in keys],
+        'Customers': [{'example_key': key} for key in keys],
+        'Employees': [{'example_key': key} for key in keys],
+        'Stores': [{'example_key': key} for key in keys],
+        'Divisions': [{'example_key': key} for key in keys],
+        'Time': [{'example_key': key} for key in keys],
+        'Cedis': [{'example_key': key} for key in keys],
+    })
+
+
+class TestParquetDatasetManager(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        # Varios row groups para que el filtro pueda descartarlos por estadísticas
+        generate_sales_data().to_parquet(os.path.join(self.test_dir.name, 'test1.parquet'), row_group_size=2)
+        self.manager = ParquetDatasetManager(self.test_dir.name)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_scan_pushes_down_key_and_date_range(self):
+        df = self.manager.scan('KeyStore', 'store1', date(2023, 1, 1), date(2023, 1, 31), ['KeySale', 'Amount'])
+        self.assertEqual(list(df.columns), ['KeySale', 'Amount'])
+        self.assertEqual(list(df['KeySale']), ['sale1', 'sale3'])
+
+    def test_query_frame_projection(self):
+        df = self.manager.query_frame(['KeyStore', 'Amount', 'NotAColumn'])
+        self.assertEqual(list(df.columns), ['KeyStore', 'Amount'])
+        self.assertEqual(len(df), 4)
+
+    def test_missing_directory(self):
+        with self.assertRaises(FileNotFoundError):
+            ParquetDatasetManager(os.path.join(self.test_dir.name, 'missing'))
+
+    def test_sale_service_with_lazy_backend(self):
+        sale_service = SaleService(self.manager)
+        sales = sale_service.get_sales_by_employee('employee1', date(2023, 1, 1), date(2023, 2, 1))
+        self.assertEqual([sale.KeySale for sale in sales], ['sale1', 'sale3', 'sale4'])
+        self.assertEqual(sales[0].KeyDate, date(2023, 1, 1))
+        self.assertEqual(sales[0].Tickets, {'example_key': 'sale1'})
+
+        result = sale_service.get_total_avg_sales_by_store()
+        self.assertEqual(result[0].KeyStore, 'store1')
+        self.assertAlmostEqual(result[0].total_sales, 300.0)
+
+    def test_lazy_batch_scans_once(self):
+        sale_service = SaleService(self.manager)
+        items = [('store1', date(2023, 1, 1), date(2023, 1, 31), None), ('store2', None, None, None),
+                 ('store9', None, None, None)]
+        expected = [sale_service.get_sales_page('KeyStore', key, start or date(2023, 1, 1),
+                                                end or date(2023, 12, 31), page_size=1)
+                    for key, start, end, _ in items]
+        with patch.object(self.manager, 'scan', side_effect=AssertionError):
+            results = sale_service.get_sales_pages('KeyStore', items, page_size=1)
+        self.assertEqual([[sale['KeySale'] for sale in result['sales']] for result in results],
+                         [['sale1'], ['sale2'], []])
+        self.assertEqual([result['sales'] for result in results], [sales for sales, _ in expected])
+        self.assertIsNotNone(results[0]['next_cursor'])
+        self.assertIsNone(results[1]['next_cursor'])
+
+
+if __name__ == '__main__':
+    unittest.main()
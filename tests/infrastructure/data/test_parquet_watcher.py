@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app.infrastructure.data.parquet_watcher import ParquetWatcher
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestParquetWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.write('initial.parquet')
+        self.notified = []
+        self.watcher = ParquetWatcher(self.test_dir.name, self.notified.extend, interval=60)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write(self, name: str) -> str:
+        path = os.path.join(self.test_dir.name, name)
+        pd.DataFrame({'KeySale': ['sale1']}).to_parquet(path)
+        return path
+
+    def test_poll_notifies_new_files_once_stable(self):
+        path = self.write('added.parquet')
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [path])
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.notified, [path])
+
+    def test_known_files_come_from_the_load(self):
+        initial = os.path.join(self.test_dir.name, 'initial.parquet')
+        during_load = self.write('during_load.parquet')
+        watcher = ParquetWatcher(self.test_dir.name, self.notified.extend, interval=60, known=[initial])
+        watcher.poll()
+        self.assertEqual(watcher.poll(), [during_load])
+
+    def test_failed_file_is_retried_without_blocking_others(self):
+        bad = os.path.join(self.test_dir.name, 'bad.parquet')
+
+        def notify(paths):
+            if bad in paths:
+                raise RuntimeError("fallo")
+            self.notified.extend(paths)
+
+        self.watcher.on_files = notify
+        self.write('bad.parquet')
+        good = self.write('good.parquet')
+        self.watcher.poll()
+        self.assertEqual(self.watcher.poll(), [good])
+        self.watcher.on_files = self.notified.extend
+        self.assertEqual(self.watcher.poll(), [bad])
+        self.assertEqual(self.notified, [good, bad])
+
+    def test_file_is_quarantined_until_rewritten(self):
+        attempts = []
+
+        def fail(paths):
+            attempts.extend(paths)
+            raise RuntimeError("fallo")
+
+        self.watcher.on_files = fail
+        path = self.write('added.parquet')
+        for _ in range(6):
+            self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(len(attempts), self.watcher.max_attempts)
+        self.assertEqual(self.watcher.quarantined, [path])
+
+        self.watcher.on_files = self.notified.extend
+        pd.DataFrame({'KeySale': ['sale1', 'sale2']}).to_parquet(path)
+        self.watcher.poll()
+        self.assertEqual(self.watcher.poll(), [path])
+        self.assertEqual(self.watcher.quarantined, [])
+
+if __name__ == '__main__':
+    unittest.main()
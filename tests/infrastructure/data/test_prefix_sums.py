@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.prefix_sums import DailyPrefixSums
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestDailyPrefixSums(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        rows = 300
+        self.df = pd.DataFrame({
+            'KeyDate': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 60, rows), unit='D'),
+            'KeyStore': rng.choice(['store1', 'store2', 'store3'], rows).astype(object),
+            'Amount': rng.integers(1, 100, rows).astype(float),
+        })
+        self.df.loc[5, 'Amount'] = np.nan
+        self.df.loc[6, 'KeyStore'] = None
+
+    def expected(self, frame: pd.DataFrame, key: str, start: str, end: str):
+        rows = frame[(frame['KeyStore'] == key) & (frame['KeyDate'] >= start) & (frame['KeyDate'] <= end)]
+        return float(rows['Amount'].sum()), int(rows['Amount'].count())
+
+    def test_summary_matches_scan(self):
+        table = DailyPrefixSums.build(self.df, 'KeyStore')
+        for key in ('store1', 'store2', 'store3'):
+            for start, end in (('2023-01-01', '2023-03-01'), ('2023-01-10', '2023-01-10'), ('2023-02-05', '2023-02-20')):
+                self.assertEqual(table.summary(key, date.fromisoformat(start), date.fromisoformat(end)),
+                                 self.expected(self.df, key, start, end))
+
+    def test_summary_of_empty_range_and_unknown_key(self):
+        table = DailyPrefixSums.build(self.df, 'KeyStore')
+        self.assertEqual(table.summary('store1', date(2024, 1, 1), date(2024, 2, 1)), (0.0, 0))
+        self.assertEqual(table.summary('store9', date(2023, 1, 1), date(2023, 3, 1)), (0.0, 0))
+
+    def test_update_matches_full_build(self):
+        table = DailyPrefixSums.build(self.df.iloc[:200], 'KeyStore')
+        added = self.df.iloc[200:].copy()
+        added.loc[added.index[0], 'KeyStore'] = 'store4'
+        updated = table.update(added)
+        full = DailyPrefixSums.build(pd.concat([self.df.iloc[:200], added]), 'KeyStore')
+        self.assertEqual(list(updated.keys), list(full.keys))
+        np.testing.assert_array_equal(updated.days, full.days)
+        np.testing.assert_array_equal(updated.counts['Amount'], full.counts['Amount'])
+        np.testing.assert_allclose(updated.sums['Amount'], full.sums['Amount'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+from app.infrastructure.data.ranking import top_n
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestTopN(unittest.TestCase):
+
+    def test_matches_full_sort(self):
+        values = np.random.default_rng(5).integers(0, 50, 1000).astype(float)
+        expected = np.lexsort((np.arange(len(values)), -values))[:25]
+        np.testing.assert_array_equal(top_n(values, 25), expected)
+        expected = np.lexsort((np.arange(len(values)), values))[:25]
+        np.testing.assert_array_equal(top_n(values, 25, ascending=True), expected)
+
+    def test_n_larger_than_values(self):
+        np.testing.assert_array_equal(top_n(np.array([1.0, 3.0, 2.0]), 10), [1, 2, 0])
+        self.assertEqual(len(top_n(np.array([]), 5)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
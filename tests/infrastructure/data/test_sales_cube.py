@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.sales_cube import CubeCache, SalesCube, parse_dimension
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestSalesCube(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        rows = 200
+        self.df = pd.DataFrame({
+            'KeyDate': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 120, rows), unit='D'),
+            'KeyStore': pd.Categorical(rng.choice(['store3', 'store1', 'store2'], rows)),
+            'KeyProduct': rng.choice(['product2', 'product1'], rows).astype(object),
+            'Amount': rng.uniform(1, 100, rows),
+            'Qty': rng.integers(1, 5, rows).astype(float),
+            'CostAmount': rng.uniform(1, 50, rows),
+            'DiscAmount': np.zeros(rows),
+        })
+        self.df.loc[3, 'Amount'] = np.nan
+
+    def expected(self, frame: pd.DataFrame, by: list) -> pd.DataFrame:
+        return frame.groupby(by, observed=True)['Amount'].agg(['sum', 'count', 'mean', 'min', 'max']).reset_index()
+
+    def test_build_matches_groupby(self):
+        cube = SalesCube.build(self.df, [parse_dimension('KeyStore'), parse_dimension('KeyProduct')])
+        rows = pd.DataFrame(cube.rows(['Amount'], ['sum', 'count', 'mean', 'min', 'max']))
+        expected = self.expected(self.df, ['KeyStore', 'KeyProduct'])
+        self.assertEqual(rows['KeyStore'].tolist(), expected['KeyStore'].astype(str).tolist())
+        self.assertEqual(rows['KeyProduct'].tolist(), expected['KeyProduct'].tolist())
+        for function in ('sum', 'count', 'mean', 'min', 'max'):
+            np.testing.assert_allclose(rows[f'Amount_{function}'], expected[function])
+
+    def test_roll_up_matches_direct_build(self):
+        fine = SalesCube.build(self.df, [parse_dimension('KeyDate:day'), parse_dimension('KeyStore')])
+        rolled = fine.roll_up([parse_dimension('KeyDate:month')])
+        direct = SalesCube.build(self.df, [parse_dimension('KeyDate:month')])
+        pd.testing.assert_frame_equal(pd.DataFrame(rolled.rows(['Amount', 'Qty'], ['sum', 'count', 'min', 'max'])),
+                                      pd.DataFrame(direct.rows(['Amount', 'Qty'], ['sum', 'count', 'min', 'max'])))
+        self.assertEqual([row['KeyDate:month'] for row in direct.rows(['Qty'], ['sum'])],
+                         ['2023-01', '2023-02', '2023-03', '2023-04'])
+
+    def test_null_dimension_is_its_own_group(self):
+        df = self.df.copy()
+        df['KeyProduct'] = df['KeyProduct'].where(df.index % 5 != 0, None)
+        df.loc[[1, 2], 'KeyDate'] = pd.NaT
+        fine = SalesCube.build(df, [parse_dimension('KeyDate:day'), parse_dimension('KeyStore'),
+                                    parse_dimension('KeyProduct')])
+        for dims in (['KeyStore'], ['KeyProduct'], ['KeyDate:month']):
+            dimensions = [parse_dimension(spec) for spec in dims]
+            rolled = pd.DataFrame(fine.roll_up(dimensions).rows(['Amount'], ['sum', 'count']))
+            direct = pd.DataFrame(SalesCube.build(df, dimensions).rows(['Amount'], ['sum', 'count']))
+            pd.testing.assert_frame_equal(rolled, direct)
+        rows = SalesCube.build(df, [parse_dimension('KeyProduct')]).rows(['Amount'], ['count'])
+        self.assertEqual(rows[-1]['KeyProduct'], None)
+        self.assertEqual(sum(row['Amount_count'] for row in rows), df['Amount'].count())
+
+    def test_cache_reuses_finer_cube_for_same_period(self):
+        cache = CubeCache()
+        dims = [parse_dimension('KeyStore'), parse_dimension('KeyProduct')]
+        cache.get(self.df, dims, date(2023, 2, 1), None)
+        empty = self.df.iloc[0:0]
+        # Sin filas, el cubo solo puede salir del cubo guardado del mismo periodo
+        cube = cache.get(empty, [parse_dimension('KeyStore')], date(2023, 2, 1), None)
+        expected = self.expected(self.df[self.df['KeyDate'] >= '2023-02-01'], ['KeyStore'])
+        np.testing.assert_allclose([row['Amount_sum'] for row in cube.rows(['Amount'], ['sum'])], expected['sum'])
+        self.assertEqual(len(cache.get(empty, [parse_dimension('KeyStore')], None, None)), 0)
+
+    def test_cache_is_bounded_by_bytes(self):
+        dims = [parse_dimension('KeyStore')]
+        size = SalesCube.build(self.df, dims).nbytes
+        cache = CubeCache(max_bytes=size)
+        cache.get(self.df, dims, date(2023, 1, 1), None)
+        cache.get(self.df, dims, date(2023, 2, 1), None)
+        self.assertEqual(len(cache._cubes), 1)
+        self.assertLessEqual(cache._bytes, size)
+        small = CubeCache(max_bytes=size - 1)
+        self.assertEqual(len(small.get(self.df, dims)), 3)
+        self.assertEqual(len(small._cubes), 0)
+
+    def test_key_dimension_cannot_roll_up_to_date_bucket(self):
+        cube = SalesCube.build(self.df, [('KeyStore', None), ('KeyDate', 'day')])
+        self.assertTrue(cube.can_roll_up_to([parse_dimension('KeyDate:month')]))
+        self.assertFalse(SalesCube.build(self.df, [('KeyStore', None), ('KeyDate', None)])
+                         .can_roll_up_to([parse_dimension('KeyDate:month')]))
+
+    def test_invalid_dimension(self):
+        with self.assertRaises(ValueError):
+            parse_dimension('Amount')
+        with self.assertRaises(ValueError):
+            parse_dimension('KeyDate:week')
+        with self.assertRaises(ValueError):
+            CubeCache().get(self.df, [parse_dimension('KeyEmployee')])
+
+
+if __name__ == '__main__':
+    unittest.main()
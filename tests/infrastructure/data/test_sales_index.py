@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+
+from app.infrastructure.data.sales_index import KeyDateIndex
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestKeyDateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'KeyStore': ['store2', 'store1', 'store1', 'store2', 'store1', None],
+            'KeyDate': pd.to_datetime(['2023-01-03', '2023-01-05', '2023-01-01', '2023-01-01', '2023-01-03',
+                                       '2023-01-02']),
+        })
+        self.index = KeyDateIndex.build(self.df['KeyStore'], self.df['KeyDate'])
+
+    def test_build_groups_keys_in_blocks_sorted_by_date(self):
+        self.assertEqual(list(self.index.keys), ['store1', 'store2'])
+        self.assertEqual(list(self.index.offsets), [0, 3, 5])
+        self.assertEqual(list(self.index.positions), [2, 4, 1, 3, 0])
+
+    def test_lookup_date_range(self):
+        positions = self.index.lookup('store1', date(2023, 1, 2), date(2023, 1, 5))
+        self.assertEqual(list(positions), [4, 1])
+
+    def test_lookup_unknown_key(self):
+        positions = self.index.lookup('store9', date(2023, 1, 1), date(2023, 1, 5))
+        self.assertEqual(len(positions), 0)
+        self.assertNotIn('store9', self.index)
+
+    def test_extend_matches_full_build(self):
+        added = pd.DataFrame({
+            'KeyStore': ['store3', 'store1'],
+            'KeyDate': pd.to_datetime(['2023-01-02', '2023-01-01']),
+        })
+        extended = self.index.extend(added['KeyStore'], added['KeyDate'], offset=len(self.df))
+        full = KeyDateIndex.build(pd.concat([self.df, added], ignore_index=True)['KeyStore'],
+                                  pd.concat([self.df, added], ignore_index=True)['KeyDate'])
+        self.assertEqual(list(extended.keys), list(full.keys))
+        self.assertEqual(list(extended.offsets), list(full.offsets))
+        self.assertEqual(list(extended.positions), list(full.positions))
+        self.assertEqual(list(self.index.positions), [2, 4, 1, 3, 0])
+
+    def test_extend_with_ties_matches_full_build(self):
+        df = self.df.assign(KeySale=['s5', 's3', 's1', 's4', 's2', 's0'])
+        added = pd.DataFrame({
+            'KeyStore': ['store1', 'store2', 'store1'],
+            'KeyDate': pd.to_datetime(['2023-01-03', '2023-01-01', '2023-01-03']),
+            'KeySale': ['s25', 's9', 's1b'],
+        })
+        index = KeyDateIndex.build(df['KeyStore'], df['KeyDate'], df['KeySale'])
+        extended = index.extend(added['KeyStore'], added['KeyDate'], added['KeySale'], offset=len(df))
+        combined = pd.concat([df, added], ignore_index=True)
+        full = KeyDateIndex.build(combined['KeyStore'], combined['KeyDate'], combined['KeySale'])
+        self.assertEqual(list(extended.positions), list(full.positions))
+        self.assertEqual(list(extended.tie_keys), list(full.tie_keys))
+        self.assertEqual(list(extended.ties), list(full.ties))
+
+    def test_seek_with_arrow_tie_keys_matches_numpy(self):
+        df = self.df.assign(KeySale=['s5', 's3', 's1', 's4', 's2', 's0'])
+        index = KeyDateIndex.build(df['KeyStore'], df['KeyDate'], df['KeySale'])
+        # Así quedan los valores de desempate al abrir el índice desde el directorio compartido
+        mapped = KeyDateIndex(index.keys, index.offsets, index.dates, index.positions, index.ties,
+                              pa.array(list(index.tie_keys)))
+        after_date = pd.Timestamp('2023-01-03').value
+        for after_tie in ('s0', 's2', 's25', 's9'):
+            self.assertEqual(list(mapped.seek('store1', date(2023, 1, 1), date(2023, 1, 5), after_date, after_tie)),
+                             list(index.seek('store1', date(2023, 1, 1), date(2023, 1, 5), after_date, after_tie)))
+        self.assertEqual(list(mapped.seek('store1', date(2023, 1, 1), date(2023, 1, 5), after_date, 's2')), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.sales_schema import enforce_sale_schema
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestSalesSchema(unittest.TestCase):
+
+    def test_enforce_sale_schema_casts_columns(self):
+        df = pd.DataFrame({
+            'KeySale': [1, 2],
+            'KeyStore': pd.Categorical([10, 20]),
+            'KeyDate': ['2023-01-01 10:30:00', '2023-01-02 00:00:00'],
+            'Qty': [1, 2],
+        })
+        result = enforce_sale_schema(df)
+        self.assertEqual(result['KeySale'].tolist(), ['1', '2'])
+        self.assertEqual(result['KeyStore'].tolist(), ['10', '20'])
+        self.assertEqual(result['Qty'].dtype, np.float64)
+        self.assertEqual(result['KeyDate'].tolist(), [pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-02')])
+        self.assertEqual(df['Qty'].dtype, np.int64)
+
+    def test_enforce_sale_schema_drops_invalid_rows(self):
+        df = pd.DataFrame({
+            'KeyEmployee': ['employee1', None, 'employee3', 'employee4'],
+            'Qty': [1, 2, 'x', 4],
+            'KeyDate': ['2023-01-01', '2023-01-02', '2023-01-03', 'no es fecha'],
+        })
+        result = enforce_sale_schema(df)
+        self.assertEqual(result['KeyEmployee'].tolist(), ['employee1'])
+        self.assertEqual(result.index.tolist(), [0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from app.infrastructure.data.deferred_data_frame_manager import DeferredDataFrameManager
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.data.sales_dataset import SalesDataset
+from app.infrastructure.data.sales_schema import enforce_sale_schema
+from app.infrastructure.data.shared_dataset import SharedDatasetStore
+from app.services.sale_service import SaleService
+from tests.services.test_sale_service import InMemoryDataFrameManager, generate_sales_data
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+
+class TestSharedDatasetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.source_dir = tempfile.TemporaryDirectory()
+        self.shared_dir = tempfile.TemporaryDirectory()
+        self.df = generate_sales_data()
+        self.df.to_parquet(os.path.join(self.source_dir.name, 'sales.parquet'))
+        self.store = SharedDatasetStore(self.shared_dir.name, self.source_dir.name)
+        self.builds = 0
+
+    def tearDown(self):
+        self.source_dir.cleanup()
+        self.shared_dir.cleanup()
+
+    def build(self) -> SalesDataset:
+        self.builds += 1
+        fact, dimensions = DimensionTables.split(self.df)
+        return SalesDataset(enforce_sale_schema(fact), dimensions=dimensions)
+
+    def test_attach_or_publish_builds_once(self):
+        first = self.store.attach_or_publish(self.build)
+        second = self.store.attach_or_publish(self.build)
+        self.assertEqual(self.builds, 1)
+        self.assertIsInstance(second.indexes['KeyStore'].positions, np.memmap)
+        self.assertIsInstance(second.indexes['KeyStore'].tie_keys, pa.Array)
+        self.assertEqual(list(second.indexes['KeyStore'].keys), list(first.indexes['KeyStore'].keys))
+        self.assertEqual(second.frame['KeySale'].tolist(), self.df['KeySale'].tolist())
+        np.testing.assert_array_equal(first.lookup('KeyStore', 'store1', date(2023, 1, 1), date(2023, 1, 31)),
+                                      second.lookup('KeyStore', 'store1', date(2023, 1, 1), date(2023, 1, 31)))
+        pd.testing.assert_frame_equal(first.aggregates['KeyProduct'].page(), second.aggregates['KeyProduct'].page())
+        self.assertEqual(second.dimensions.lookup('Tickets', pd.Series(['ticket3']))[0], {'example_key': 3})
+        self.assertIsInstance(second.prefix_sums['KeyStore'].sums['Amount'], np.memmap)
+        self.assertEqual(first.summary('KeyStore', 'store1', date(2023, 1, 2), date(2023, 1, 3)),
+                         second.summary('KeyStore', 'store1', date(2023, 1, 2), date(2023, 1, 3)))
+
+    def test_attach_ignores_stale_publication(self):
+        self.store.attach_or_publish(self.build)
+        self.df.iloc[:3].to_parquet(os.path.join(self.source_dir.name, 'more.parquet'))
+        self.assertIsNone(self.store.attach())
+
+    def test_publication_fingerprints_files_read(self):
+        sales = os.path.join(self.source_dir.name, 'sales.parquet')
+        more = os.path.join(self.source_dir.name, 'more.parquet')
+
+        def build() -> SalesDataset:
+            # Un archivo llega durante la carga, después de listar los que se leen
+            self.df.iloc[:3].to_parquet(more)
+            dataset = self.build()
+            dataset.source_files = [sales]
+            return dataset
+
+        dataset = self.store.attach_or_publish(build, [sales])
+        self.assertEqual(dataset.source_files, [sales])
+        self.assertEqual(self.store.fingerprint([sales]), self.store._read_manifest()['fingerprint'])
+        self.assertIsNone(self.store.attach())
+        self.assertIsNotNone(self.store.attach([sales]))
+
+    def test_sale_service_reads_shared_dataset(self):
+        self.store.attach_or_publish(self.build)
+        private = SaleService(InMemoryDataFrameManager(self.df))
+        shared = SaleService(InMemoryDataFrameManager(pd.DataFrame()), self.store)
+        args = ('KeyEmployee', 'employee1', date(2023, 1, 1), date(2023, 1, 31))
+        sales, cursor = shared.get_sales_page(*args, page_size=3)
+        next_sales, _ = shared.get_sales_page(*args, page_size=3, cursor=cursor)
+        expected = private.get_sales_page(*args, page_size=6)[0]
+        columns = ('KeySale', 'KeyDate', 'KeyStore', 'Amount')
+        self.assertEqual([[sale[c] for c in columns] for sale in sales + next_sales],
+                         [[sale[c] for c in columns] for sale in expected])
+        self.assertEqual(sales[0]['Tickets'], {'example_key': 0})
+
+    def test_publishing_service_releases_its_private_copy(self):
+        data_manager = DeferredDataFrameManager(lambda: InMemoryDataFrameManager(self.df))
+        service = SaleService(data_manager, self.store)
+        dataset = service.get_sales_dataset()
+        self.assertIsNone(data_manager._manager)
+        self.assertIsInstance(dataset.indexes['KeyStore'].positions, np.memmap)
+        self.assertEqual(len(dataset), len(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
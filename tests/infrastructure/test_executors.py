@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+import threading
+import unittest
+
+from app.infrastructure.executors import BoundedExecutor, ExecutorSaturatedError
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+class TestBoundedExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_run_returns_result_off_the_event_loop(self):
+        async def run():
+            return await self.executor.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(asyncio.run(run()).startswith("test-executor"))
+        self.assertEqual(self.executor.stats()["completed"], 1)
+
+    def test_run_rejects_when_saturated(self):
+        release = threading.Event()
+
+        async def run():
+            running = asyncio.ensure_future(self.executor.run(release.wait))
+            queued = asyncio.ensure_future(self.executor.run(lambda: None))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(ExecutorSaturatedError):
+                await self.executor.run(lambda: None)
+            stats = self.executor.stats()
+            release.set()
+            await asyncio.gather(running, queued)
+            return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual((stats["running"], stats["queued"], stats["rejected"]), (1, 1, 1))
+        self.assertEqual(self.executor.stats()["completed"], 2)
+
+    def test_iterate(self):
+        async def run():
+            return [item async for item in self.executor.iterate(iter([1, 2, 3]))]
+
+        self.assertEqual(asyncio.run(run()), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
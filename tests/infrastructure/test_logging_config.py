@@ -0,0 +1,63 @@
+import logging
+import os
+import queue
+import sys
+import unittest
+
+import orjson
+
+from app.infrastructure.logging_config import BoundedQueueHandler, JsonFormatter, RateLimitFilter, redact_token
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def make_record(message: str, level: int = logging.ERROR) -> logging.LogRecord:
+    return logging.LogRecord('app', level, __file__, 1, message, None, None)
+
+
+class TestLoggingPipeline(unittest.TestCase):
+
+    def test_full_queue_drops_records_without_blocking(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2))
+        for i in range(5):
+            handler.handle(make_record(f"error {i}"))
+
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+    def test_rate_limit_deduplicates_repeated_errors(self):
+        rate_limit = RateLimitFilter(window=60, max_per_window=100)
+
+        passed = [rate_limit.filter(make_record("/api/v1/sales/store: Authorization invalid")) for _ in range(50)]
+
+        self.assertEqual(passed.count(True), 1)
+        self.assertEqual(rate_limit.suppressed, 49)
+        self.assertTrue(rate_limit.filter(make_record("info", logging.INFO)))
+
+    def test_rate_limit_caps_distinct_errors_per_window(self):
+        rate_limit = RateLimitFilter(window=60, max_per_window=3)
+
+        passed = [rate_limit.filter(make_record(f"error {i}")) for i in range(10)]
+
+        self.assertEqual(passed.count(True), 3)
+
+    def test_reappearing_error_reports_suppressed_repetitions(self):
+        rate_limit = RateLimitFilter(window=0.01, max_per_window=100)
+        rate_limit.filter(make_record("boom"))
+        rate_limit.filter(make_record("boom"))
+        rate_limit._seen[('app', logging.ERROR, 'boom')] = (0.0, 1)
+
+        record = make_record("boom")
+        self.assertTrue(rate_limit.filter(record))
+        self.assertEqual(record.getMessage(), "boom (1 repeticiones suprimidas)")
+
+    def test_json_formatter_and_token_redaction(self):
+        line = orjson.loads(JsonFormatter().format(make_record(f"{redact_token('header.payload.signature')} x")))
+
+        self.assertEqual(line['level'], 'ERROR')
+        self.assertEqual(line['message'], '...nature x')
+        self.assertNotIn('payload', line['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+from app.infrastructure.executors import BoundedExecutor
+from app.infrastructure.metrics import Histogram, render_values, start_request_timing, timed
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_render_accumulates_buckets_per_label_set(self):
+        histogram = Histogram('latency_seconds', 'Latencia.', ('route',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, 'sales')
+        histogram.observe(0.5, 'sales')
+        histogram.observe(2.0, 'sales')
+
+        lines = histogram.render()
+
+        self.assertIn('# TYPE latency_seconds histogram', lines)
+        self.assertIn('latency_seconds_bucket{route="sales",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{route="sales",le="1.0"} 2', lines)
+        self.assertIn('latency_seconds_bucket{route="sales",le="+Inf"} 3', lines)
+        self.assertIn('latency_seconds_count{route="sales"} 3', lines)
+        self.assertIn('latency_seconds_sum{route="sales"} 2.55', lines)
+
+    def test_render_values_escapes_labels(self):
+        lines = render_values('queued', 'En cola.', 'gauge', {(('executor', 'a"b'),): 2})
+        self.assertEqual(lines[-1], 'queued{executor="a\\"b"} 2')
+
+
+class TestRequestTiming(unittest.TestCase):
+
+    def test_timed_is_a_noop_outside_a_request(self):
+        async def run():
+            with timed('query'):
+                return 1
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+    def test_phases_recorded_in_executor_threads_reach_the_request(self):
+        executor = BoundedExecutor("metrics", max_workers=1, max_queue=1)
+
+        def query():
+            with timed('query'):
+                time.sleep(0.01)
+
+        async def run():
+            timing = start_request_timing()
+            await executor.run(query)
+            with timed('serialize'):
+                pass
+            return timing
+
+        try:
+            timing = asyncio.run(run())
+        finally:
+            executor.shutdown()
+        self.assertGreaterEqual(timing.phases['query'], 0.01)
+        header = timing.server_timing(0.02)
+        self.assertTrue(header.startswith('query;dur='))
+        self.assertIn('serialize;dur=', header)
+        self.assertTrue(header.endswith('total;dur=20.00'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import asyncio
+import os
+import sys
+import unittest
+
+import orjson
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.infrastructure.middleware import _dispatch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def dispatch(error: HTTPException):
+    async def call_next(request):
+        raise error
+
+    request = Request({'type': 'http', 'method': 'GET', 'path': '/other', 'query_string': b'', 'headers': []})
+    return asyncio.run(_dispatch(request, call_next))
+
+
+class TestDispatch(unittest.TestCase):
+
+    def test_auth_failures_are_reported_as_invalid_authorization(self):
+        for status_code in (401, 403):
+            response = dispatch(HTTPException(status_code=status_code, detail="Invalid token"))
+            self.assertEqual(response.status_code, status_code)
+            self.assertEqual(orjson.loads(response.body), {"message": "/other: Authorization invalid Invalid token"})
+
+    def test_other_http_errors_pass_through_unchanged(self):
+        response = dispatch(HTTPException(status_code=404, detail="No encontrado", headers={"X-Reason": "missing"}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(orjson.loads(response.body), {"detail": "No encontrado"})
+        self.assertEqual(response.headers["X-Reason"], "missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
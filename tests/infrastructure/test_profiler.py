@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import unittest
+
+from app.infrastructure.profiler import collapsed, sample_stacks, set_request_path, tag_thread
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def busy_store_query(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def busy_total_avg(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def serve(path: str, work, stop: threading.Event):
+    set_request_path(path)
+    with tag_thread():
+        work(stop)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.stop = threading.Event()
+        self.threads = [
+            threading.Thread(target=serve, args=('/api/v1/sales/store', busy_store_query, self.stop),
+                             name='pandas-executor_0'),
+            threading.Thread(target=serve, args=('/api/v1/sales/store/total_avg', busy_total_avg, self.stop),
+                             name='pandas-executor_1'),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def tearDown(self):
+        self.stop.set()
+        for thread in self.threads:
+            thread.join()
+
+    def test_samples_only_threads_serving_the_path_prefix(self):
+        report = collapsed(sample_stacks(0.2, 0.005, '/api/v1/sales/store/total'))
+
+        self.assertIn('busy_total_avg', report)
+        self.assertNotIn('busy_store_query', report)
+
+    def test_collapsed_stacks_aggregate_pool_threads(self):
+        report = collapsed(sample_stacks(0.2, 0.005, '/api/v1/sales/'))
+
+        lines = report.splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('pandas-executor;'))
+            self.assertGreater(int(count), 0)
+        self.assertIn('test_profiler.py:busy_store_query', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+from app.infrastructure.result_cache import ResultCache, approximate_size
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = ResultCache(max_bytes=1024 * 1024)
+        self.assertEqual(cache.get_or_compute(('q', 1), lambda: [1, 2]), [1, 2])
+        self.assertEqual(cache.get_or_compute(('q', 1), lambda: [3]), [1, 2])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        value = 'x' * 1000
+        cache = ResultCache(max_bytes=approximate_size(value) * 2)
+        cache.get_or_compute('a', lambda: value)
+        cache.get_or_compute('b', lambda: value)
+        cache.get_or_compute('a', lambda: value)
+        cache.get_or_compute('c', lambda: value)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.get_or_compute('a', lambda: 'recomputed'), value)
+        self.assertEqual(cache.get_or_compute('b', lambda: 'recomputed'), 'recomputed')
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+
+    def test_concurrent_misses_compute_once(self):
+        cache = ResultCache(max_bytes=1024 * 1024)
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(cache.stats()['coalesced'], 4)
+
+    def test_errors_are_not_cached(self):
+        cache = ResultCache(max_bytes=1024 * 1024)
+
+        def fail():
+            raise ValueError('fallo')
+
+        with self.assertRaises(ValueError):
+            cache.get_or_compute('k', fail)
+        self.assertEqual(cache.get_or_compute('k', lambda: 'ok'), 'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.config import settings
+from app.infrastructure import token
+from app.infrastructure.token import StaticUserLookup, UserCache, revoke_user, set_user_lookup, validate_admin_token, \
+    validate_token
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+
+def create_token(user_id: str, minutes: int = 5, secret: str = settings.SECRET_KEY) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    return jwt.encode({"sub": user_id, "exp": expire}, secret, algorithm=settings.ALGORITHM)
+
+
+class TestUserCache(unittest.TestCase):
+
+    def setUp(self):
+        self.lookup = StaticUserLookup({'user1': SimpleNamespace(uid='user1')})
+        self.cache = UserCache(self.lookup, max_size=10, ttl=60, negative_ttl=60)
+
+    def test_get_queries_lookup_once(self):
+        self.assertEqual(self.cache.get('user1').uid, 'user1')
+        self.assertEqual(self.cache.get('user1').uid, 'user1')
+        self.assertEqual(self.lookup.calls, 1)
+
+    def test_missing_users_are_cached(self):
+        self.assertIsNone(self.cache.get('ghost'))
+        self.assertIsNone(self.cache.get('ghost'))
+        self.assertEqual(self.lookup.calls, 1)
+
+    def test_revoke_forces_new_lookup(self):
+        self.cache.get('user1')
+        del self.lookup.users['user1']
+        self.cache.revoke('user1')
+        self.assertIsNone(self.cache.get('user1'))
+        self.assertEqual(self.lookup.calls, 2)
+
+
+class TestValidateToken(unittest.TestCase):
+
+    def setUp(self):
+        self.original_lookup = token.user_cache.lookup
+        self.lookup = StaticUserLookup({'user1': SimpleNamespace(uid='user1')})
+        set_user_lookup(self.lookup)
+
+    def tearDown(self):
+        set_user_lookup(self.original_lookup)
+
+    def test_validate_token_resolves_user_from_cache(self):
+        self.assertEqual(validate_token(create_token('user1')).uid, 'user1')
+        self.assertEqual(validate_token(create_token('user1')).uid, 'user1')
+        self.assertEqual(self.lookup.calls, 1)
+
+    def test_validate_token_rejects_invalid_tokens(self):
+        for invalid in (create_token('user1', minutes=-1), create_token('user1', secret='other'),
+                        create_token('ghost')):
+            with self.assertRaises(HTTPException) as context:
+                validate_token(invalid)
+            self.assertEqual(context.exception.status_code, 401)
+
+    def test_revoke_user(self):
+        validate_token(create_token('user1'))
+        del self.lookup.users['user1']
+        revoke_user('user1')
+        with self.assertRaises(HTTPException):
+            validate_token(create_token('user1'))
+
+    def test_validate_admin_token_requires_admin_user(self):
+        self.lookup.users['admin1'] = SimpleNamespace(uid='admin1')
+        with patch.object(settings, 'ADMIN_USERS', frozenset({'admin1'})):
+            self.assertEqual(validate_admin_token(create_token('admin1')).uid, 'admin1')
+            with self.assertRaises(HTTPException) as context:
+                validate_admin_token(create_token('user1'))
+        self.assertEqual(context.exception.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,16 +5,77 @@ import tempfile
 import warnings
 
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
 from cachetools import TTLCache
+from app.domain.contracts.infrastructures.i_data_frame_manager import IDataFrameManager
 from app.domain.contracts.services.i_sale_service import ISaleService
 from app.domain.entities.sales.sale import Sale
+from app.domain.outputs.sale_output import SaleOutput
 from app.infrastructure.data.data_loader import DataLoader
 from app.infrastructure.data.data_frame_manager import DataFrameManager
+from app.infrastructure.data.sales_cursor import SalesCursor
+from app.infrastructure.result_cache import ResultCache
 from app.services.sale_service import SaleService
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
+
+class InMemoryDataFrameManager(IDataFrameManager):
+    """Gestor de datos en memoria que evita el singleton de DataFrameManager en las pruebas."""
+
+    def __init__(self, dataframe: pd.DataFrame):
+        self.dataframe = dataframe
+
+    def query(self, model):
+        return model.from_dataframe(self.dataframe)
+
+    def query_frame(self, columns=None):
+        return self.dataframe if columns is None else self.dataframe[columns]
+
+    def scan(self, key_column, key, start_date, end_date, columns=None):
+        df = self.dataframe
+        key_dates = pd.to_datetime(df['KeyDate'])
+        mask = ((df[key_column] == key) & (key_dates >= pd.Timestamp(start_date))
+                & (key_dates < pd.Timestamp(end_date) + pd.Timedelta(days=1)))
+        return df.loc[mask, columns if columns is not None else df.columns]
+
+    def query_dimensions(self):
+        return None
+
+    def ingest(self, paths, columns=None):
+        frame = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+        return (frame if columns is None else frame[columns]), None
+
+
+def generate_sales_data(rows: int = 7) -> pd.DataFrame:
+    return pd.DataFrame({
+        'KeySale': [f'sale{i}' for i in range(rows)],
+        'KeyDate': [pd.Timestamp('2023-01-01') + pd.Timedelta(days=i // 2) for i in range(rows)],
+        'KeyStore': ['store1' if i % 3 else 'store2' for i in range(rows)],
+        'KeyWarehouse': ['warehouse1'] * rows,
+        'KeyCustomer': ['customer1'] * rows,
+        'KeyProduct': ['product1' if i % 2 else 'product2' for i in range(rows)],
+        'KeyEmployee': ['employee1'] * rows,
+        'KeyCurrency': ['currency1'] * rows,
+        'KeyDivision': ['division1'] * rows,
+        'KeyTicket': [f'ticket{i}' for i in range(rows)],
+        'KeyCedi': ['cedi1'] * rows,
+        'TicketId': [f'ticketid{i}' for i in range(rows)],
+        'Qty': [1.0] * rows,
+        'Amount': [float(100 * (i + 1)) for i in range(rows)],
+        'CostAmount': [float(50 * (i + 1)) for i in range(rows)],
+        'DiscAmount': [0.0] * rows,
+        'Tickets': [{'example_key': i} for i in range(rows)],
+        'Products': [{'example_key': i} for i in range(rows)],
+        'Customers': [{'example_key': i} for i in range(rows)],
+        'Employees': [{'example_key': i} for i in range(rows)],
+        'Stores': [{'example_key': i} for i in range(rows)],
+        'Divisions': [{'example_key': i} for i in range(rows)],
+        'Time': [{'example_key': i} for i in range(rows)],
+        'Cedis': [{'example_key': i} for i in range(rows)],
+    })
+
+
 class TestSaleService(unittest.TestCase):
 
     def setUp(self):
@@ -74,6 +135,14 @@ class TestSaleService(unittest.TestCase):
         self.assertEqual(len(sales), 1)
         self.assertEqual(sales[0].KeySale, 'sale1')
 
+    def test_stream_sales_by_employee(self):
+        chunks = list(self.sale_service.stream_sales_by_employee('employee1', datetime(2023, 1, 1).date(),
+                                                                 datetime(2023, 1, 3).date(), chunk_size=1))
+        records = [record for chunk in chunks for record in chunk]
+        self.assertTrue(all(len(chunk) == 1 for chunk in chunks))
+        self.assertEqual(records[0]['KeySale'], 'sale1')
+        self.assertTrue(all(record['KeyEmployee'] == 'employee1' for record in records))
+
     def test_get_total_avg_sales_by_store(self):
         result = self.sale_service.get_total_avg_sales_by_store()
         self.assertEqual(len(result), 2)
@@ -95,5 +164,204 @@ class TestSaleService(unittest.TestCase):
         self.assertAlmostEqual(result[0].total_sales, 100.0)
         self.assertAlmostEqual(result[0].avg_sales, 100.0)
 
+
+class TestSaleServicePagination(unittest.TestCase):
+
+    def setUp(self):
+        # Se desordenan las filas para comprobar que la paginación sigue el orden (KeyDate, KeySale)
+        self.df = generate_sales_data().iloc[[3, 0, 6, 1, 5, 2, 4]].reset_index(drop=True)
+        self.sale_service = SaleService(InMemoryDataFrameManager(self.df))
+        self.start_date, self.end_date = datetime(2023, 1, 1).date(), datetime(2023, 1, 31).date()
+
+    def _collect(self, page_size: int, bump_version: bool = False):
+        keys, cursor = [], None
+        while True:
+            sales, cursor = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date,
+                                                             self.end_date, page_size=page_size, cursor=cursor)
+            keys.extend(sale['KeySale'] for sale in sales)
+            if bump_version:
+                self.sale_service.get_sales_dataset().version += 1
+            if cursor is None:
+                return keys
+
+    def test_cursor_walks_all_rows_in_order(self):
+        self.assertEqual(self._collect(page_size=3), [f'sale{i}' for i in range(7)])
+
+    def test_cursor_resumes_by_value_after_reload(self):
+        self.assertEqual(self._collect(page_size=2, bump_version=True), [f'sale{i}' for i in range(7)])
+
+    def test_offset_page_returns_next_cursor(self):
+        sales, cursor = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date,
+                                                         self.end_date, page=2, page_size=3)
+        self.assertEqual([sale['KeySale'] for sale in sales], ['sale3', 'sale4', 'sale5'])
+        self.assertIsNotNone(cursor)
+        sales, cursor = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date,
+                                                         self.end_date, page_size=3, cursor=cursor)
+        self.assertEqual([sale['KeySale'] for sale in sales], ['sale6'])
+        self.assertIsNone(cursor)
+
+    def test_last_offset_page_has_no_cursor(self):
+        sales, cursor = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date,
+                                                         self.end_date, page=3, page_size=3)
+        self.assertEqual([sale['KeySale'] for sale in sales], ['sale6'])
+        self.assertIsNone(cursor)
+
+    def test_page_records_follow_sale_output_schema(self):
+        sales, _ = self.sale_service.get_sales_page('KeyStore', 'store1', self.start_date, self.end_date)
+        self.assertEqual(list(sales[0]), list(SaleOutput.model_fields))
+        self.assertEqual(SaleOutput(**sales[0]).model_dump(), sales[0])
+        self.assertIsInstance(sales[0]['KeyDate'], date)
+
+    def test_cursor_from_another_query_is_rejected(self):
+        _, cursor = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date, self.end_date,
+                                                     page_size=2)
+        with self.assertRaises(ValueError):
+            self.sale_service.get_sales_page('KeyStore', 'store1', self.start_date, self.end_date, cursor=cursor)
+        with self.assertRaises(ValueError):
+            self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date, self.end_date,
+                                             cursor='not-a-cursor')
+
+    def test_tampered_or_negative_cursor_is_rejected(self):
+        query = SalesCursor.query_id('KeyEmployee', 'employee1', self.start_date, self.end_date)
+        _, cursor = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date, self.end_date,
+                                                     page_size=2)
+        payload, signature = cursor.split('.')
+        forged = SalesCursor(1, query, 0, 'sale0', 5).encode().split('.')[0]
+        negative = SalesCursor(1, query, 0, 'sale0', -3).encode()
+        for token in (f"{forged}.{signature}", payload, negative):
+            with self.assertRaises(ValueError):
+                self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date, self.end_date,
+                                                 cursor=token)
+
+    def test_batch_pages_each_key_independently(self):
+        items = [('store1', self.start_date, self.end_date, None), ('store2', None, None, None),
+                 ('store9', None, None, None)]
+        results = self.sale_service.get_sales_pages('KeyStore', items, page_size=2)
+        self.assertEqual([result['key'] for result in results], ['store1', 'store2', 'store9'])
+        for result in results[:2]:
+            single, cursor = self.sale_service.get_sales_page('KeyStore', result['key'], self.start_date,
+                                                              self.end_date, page_size=2)
+            self.assertEqual(result['sales'], single)
+        self.assertEqual((results[2]['sales'], results[2]['next_cursor']), ([], None))
+
+        items = [(result['key'], start, end, result['next_cursor'])
+                 for result, (_, start, end, _) in zip(results[:2], items)]
+        results = self.sale_service.get_sales_pages('KeyStore', items, page_size=2)
+        self.assertEqual([sale['KeySale'] for sale in results[0]['sales']], ['sale4', 'sale5'])
+        self.assertEqual([sale['KeySale'] for sale in results[1]['sales']], ['sale6'])
+        self.assertIsNone(results[1]['next_cursor'])
+
+
+class TestSaleServiceIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        df = generate_sales_data()
+        self.sale_service = SaleService(InMemoryDataFrameManager(df.iloc[:5].reset_index(drop=True)))
+        self.added_path = os.path.join(self.test_dir.name, 'added.parquet')
+        df.iloc[5:].to_parquet(self.added_path)
+        self.start_date, self.end_date = datetime(2023, 1, 1).date(), datetime(2023, 1, 31).date()
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_ingest_files_publishes_new_version(self):
+        previous = self.sale_service.get_sales_dataset()
+        current = self.sale_service.ingest_files([self.added_path])
+        self.assertIsNot(previous, current)
+        self.assertEqual((previous.version, len(previous)), (1, 5))
+        self.assertEqual((current.version, len(current)), (2, 7))
+        sales, _ = self.sale_service.get_sales_page('KeyEmployee', 'employee1', self.start_date, self.end_date,
+                                                    page_size=10)
+        self.assertEqual([sale['KeySale'] for sale in sales], [f'sale{i}' for i in range(7)])
+        totals = self.sale_service.get_total_avg_sales_by_store()
+        self.assertEqual({item.KeyStore: item.total_sales for item in totals}, {'store1': 1600.0, 'store2': 1200.0})
+        self.assertEqual(self.sale_service.get_sales_summary('KeyStore', 'store2', self.start_date, self.end_date),
+                         {'total_sales': 1200.0, 'avg_sales': 400.0, 'count': 3})
+
+    def test_result_cache_is_keyed_by_dataset_version(self):
+        self.sale_service.result_cache = ResultCache(max_bytes=1024 * 1024)
+        args = ('KeyEmployee', 'employee1', self.start_date, self.end_date)
+        self.assertEqual(len(self.sale_service.get_sales_page(*args)[0]), 5)
+        self.assertEqual(len(self.sale_service.get_sales_page(*args)[0]), 5)
+        self.sale_service.ingest_files([self.added_path])
+        self.assertEqual(len(self.sale_service.get_sales_page(*args)[0]), 7)
+        stats = self.sale_service.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+
+class TestSaleServiceSummary(unittest.TestCase):
+
+    def setUp(self):
+        self.sale_service = SaleService(InMemoryDataFrameManager(generate_sales_data()))
+
+    def test_get_sales_summary(self):
+        summary = self.sale_service.get_sales_summary('KeyProduct', 'product1', date(2023, 1, 2), date(2023, 1, 3))
+        self.assertEqual(summary, {'total_sales': 1000.0, 'avg_sales': 500.0, 'count': 2})
+        summary = self.sale_service.get_sales_summary('KeyProduct', 'product1', date(2024, 1, 1), date(2024, 1, 2))
+        self.assertEqual(summary, {'total_sales': 0.0, 'avg_sales': None, 'count': 0})
+
+    def test_get_top_sales(self):
+        top = self.sale_service.get_top_sales('KeyStore')
+        self.assertEqual(top, [{'key': 'store1', 'value': 1600.0, 'count': 4},
+                               {'key': 'store2', 'value': 1200.0, 'count': 3}])
+        top = self.sale_service.get_top_sales('KeyStore', 'margin', n=1, ascending=True)
+        self.assertEqual(top, [{'key': 'store2', 'value': 600.0, 'count': 3}])
+
+    def test_get_top_sales_within_another_dimension_and_period(self):
+        top = self.sale_service.get_top_sales('KeyProduct', filter_column='KeyStore', filter_key='store2')
+        self.assertEqual([(item['key'], item['value']) for item in top], [('product2', 800.0), ('product1', 400.0)])
+        top = self.sale_service.get_top_sales('KeyProduct', n=1, start_date=date(2023, 1, 2),
+                                              end_date=date(2023, 1, 31), filter_column='KeyStore',
+                                              filter_key='store2')
+        self.assertEqual(top, [{'key': 'product2', 'value': 700.0, 'count': 1}])
+        self.assertEqual(self.sale_service.get_top_sales('KeyProduct', filter_column='KeyStore',
+                                                         filter_key='store9'), [])
+        with self.assertRaises(ValueError):
+            self.sale_service.get_top_sales('KeyProduct', measure='DiscAmount')
+
+    def test_get_top_sales_by_date_bucket_then_cube(self):
+        top = self.sale_service.get_top_sales('KeyStore', filter_column='KeyDate', filter_key='2023-01-02')
+        self.assertEqual([(item['key'], item['value']) for item in top], [('store2', 400.0), ('store1', 300.0)])
+        top = self.sale_service.get_top_sales('KeyDate:month', filter_column='KeyStore', filter_key='store2')
+        self.assertEqual(top, [{'key': '2023-01', 'value': 1200.0, 'count': 3}])
+        with self.assertRaises(ValueError):
+            self.sale_service.get_top_sales('KeyDate:month', filter_column='KeyDate:year', filter_key='2023')
+        # El cubo del ranking no debe usarse para agregar por mes una fecha sin nivel
+        rows, _ = self.sale_service.get_sales_cube(['KeyStore', 'KeyDate:month'], ['Amount'], ['sum'])
+        self.assertEqual(rows, [{'KeyStore': 'store1', 'KeyDate:month': '2023-01', 'Amount_sum': 1600.0},
+                                {'KeyStore': 'store2', 'KeyDate:month': '2023-01', 'Amount_sum': 1200.0}])
+
+
+class TestSaleServiceCube(unittest.TestCase):
+
+    def setUp(self):
+        self.sale_service = SaleService(InMemoryDataFrameManager(generate_sales_data()))
+
+    def test_cube_groups_by_several_dimensions_with_paging(self):
+        rows, total = self.sale_service.get_sales_cube(['KeyStore', 'KeyProduct'], ['Amount'], ['sum', 'count'],
+                                                       page=1, page_size=3)
+        self.assertEqual(total, 4)
+        self.assertEqual(rows[0], {'KeyStore': 'store1', 'KeyProduct': 'product1', 'Amount_sum': 800.0,
+                                   'Amount_count': 2})
+        rows, _ = self.sale_service.get_sales_cube(['KeyStore', 'KeyProduct'], ['Amount'], ['sum'], page=2,
+                                                   page_size=3)
+        self.assertEqual(rows, [{'KeyStore': 'store2', 'KeyProduct': 'product2', 'Amount_sum': 800.0}])
+
+    def test_cube_rolls_up_date_buckets_within_period(self):
+        rows, total = self.sale_service.get_sales_cube(['KeyDate:month'], ['Amount', 'Qty'], ['sum'],
+                                                       date(2023, 1, 2), date(2023, 1, 31))
+        self.assertEqual(total, 1)
+        self.assertEqual(rows, [{'KeyDate:month': '2023-01', 'Amount_sum': 2500.0, 'Qty_sum': 5.0}])
+
+    def test_cube_rejects_unknown_measures_and_functions(self):
+        with self.assertRaises(ValueError):
+            self.sale_service.get_sales_cube(['KeyStore'], ['Tickets'], ['sum'])
+        with self.assertRaises(ValueError):
+            self.sale_service.get_sales_cube(['KeyStore'], ['Amount'], ['median'])
+        with self.assertRaises(ValueError):
+            self.sale_service.get_sales_cube(['KeyStore', 'KeyStore'], ['Amount'], ['sum'])
+
+
 if __name__ == '__main__':
     unittest.main()
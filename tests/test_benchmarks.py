@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+from app.infrastructure.data.dimension_tables import DimensionTables
+from app.infrastructure.data.sales_schema import SALE_COLUMNS, enforce_sale_schema
+from benchmarks.generate_data import parse_rows, write_dataset
+from benchmarks.run import compare
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class TestGenerateData(unittest.TestCase):
+
+    def test_parse_rows(self):
+        self.assertEqual([parse_rows('1M'), parse_rows('50m'), parse_rows('500K'), parse_rows('1234')],
+                         [1_000_000, 50_000_000, 500_000, 1234])
+
+    def test_write_dataset_follows_sale_schema(self):
+        with tempfile.TemporaryDirectory() as directory:
+            summary = write_dataset(directory, 2500, rows_per_file=1000, seed=1)
+            self.assertEqual((summary['rows'], summary['files']), (2500, 3))
+            df = pd.read_parquet(directory)
+        self.assertEqual(list(df.columns), SALE_COLUMNS)
+        enforce_sale_schema(df)
+        self.assertEqual(df['KeySale'].nunique(), 2500)
+        # Todas las líneas de un ticket comparten tienda y fecha, y cada clave tiene un único valor anidado
+        self.assertTrue((df.groupby('KeyTicket')[['KeyStore', 'KeyDate']].nunique() == 1).all().all())
+        fact, dimensions = DimensionTables.split(df)
+        self.assertEqual(len(dimensions.tables['Stores'][1]), df['KeyStore'].nunique())
+
+    def test_compare_reports_regressions_over_tolerance(self):
+        baseline = {'load': {'seconds': 10.0}, 'peak_rss_mb': 100.0,
+                    'endpoints': {'sales_by_store': {'p50_ms': 10.0, 'p99_ms': 20.0}}}
+        result = {'load': {'seconds': 11.0}, 'peak_rss_mb': 150.0,
+                  'endpoints': {'sales_by_store': {'p50_ms': 10.0, 'p99_ms': 30.0}, 'new': {'p50_ms': 1, 'p99_ms': 1}}}
+        regressions = compare(result, baseline, tolerance=0.2)
+        self.assertEqual([regression.split(':')[0] for regression in regressions],
+                         ['peak_rss_mb', 'sales_by_store.p99_ms'])
+
+    def test_compare_fails_on_endpoint_errors(self):
+        baseline = {'load': {'seconds': 10.0}, 'peak_rss_mb': 100.0,
+                    'endpoints': {'sales_by_store': {'p50_ms': 10.0, 'p99_ms': 20.0}}}
+        result = {'load': {'seconds': 10.0}, 'peak_rss_mb': 100.0,
+                  'endpoints': {'sales_by_store': {'p50_ms': None, 'p99_ms': None, 'errors': 200}}}
+        self.assertEqual(compare(result, baseline, tolerance=0.2), ['sales_by_store: 200 respuestas con error'])
+
+
+if __name__ == '__main__':
+    unittest.main()